@@ -1,19 +1,55 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, List, Optional, Type
 
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.prompts import BasePromptTemplate
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+
+from app.core.config import config
+from app.core.timing import record, timed
 from app.services.llm import LLMClient
 
 ProgressCB = Callable[[float], Any]
+StreamCB = Callable[[str], Any]
 
 
 class BaseAgent(ABC):
     """Base class for agents.
     - Holds an LLM client created via LLMClient.get_llm()
     - Provides a safe progress() helper to avoid repeating None checks.
+    - Builds the output parser and schema-partialled prompt once per instance; the composed chain is
+      cached and only rebuilt when `self.llm` is swapped (e.g. fake LLM in tests).
+    - Provides _invoke_chain() which streams raw tokens to stream_cb (if given) and parses once at the end;
+      the LLM call and the parse are timed separately on the job timer.
     """
 
-    def __init__(self, *, model_name: Optional[str] = None, temperature: float = 0.2, timeout_s: int = 30):
+    def __init__(
+        self,
+        *,
+        model_name: Optional[str] = None,
+        temperature: float = 0.2,
+        timeout_s: int = 30,
+        prompt: Optional[BasePromptTemplate] = None,
+        output_model: Optional[Type[BaseModel]] = None,
+    ):
         self.llm = LLMClient.get_llm(model_name=model_name, temperature=temperature, timeout_s=timeout_s)
+        self._parser: Optional[PydanticOutputParser] = None
+        self._prompt: Optional[BasePromptTemplate] = None
+        if prompt is not None and output_model is not None:
+            self._parser = PydanticOutputParser(pydantic_object=output_model)
+            # get_format_instructions() serializes the JSON schema; do it once, not per run
+            self._prompt = prompt.partial(schema=self._parser.get_format_instructions())
+        self._chain_llm: Optional[Runnable] = None
+        self._llm_chain: Optional[Runnable] = None
+
+    def _chain(self) -> Runnable:
+        """prompt | llm, rebuilt only if self.llm changed (the parser runs separately on the completion)."""
+        if self._chain_llm is not self.llm:
+            self._llm_chain = self._prompt | self.llm
+            self._chain_llm = self.llm
+        return self._llm_chain
 
     @staticmethod
     def _progress(cb: Optional[ProgressCB], value: float) -> None:
@@ -24,7 +60,60 @@ class BaseAgent(ABC):
                 # progress is best-effort; never break the agent
                 pass
 
+    @staticmethod
+    def _emit(cb: Optional[StreamCB], text: str) -> None:
+        if cb is not None:
+            try:
+                cb(text)
+            except Exception:
+                # streaming is best-effort; never break the agent
+                pass
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        # AIMessageChunk (content str | list of parts) or plain str from fake/test LLMs
+        content = getattr(chunk, "content", chunk)
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            return "".join(p.get("text", "") if isinstance(p, dict) else str(p) for p in content)
+        return ""
+
+    async def _invoke_chain(self, inputs: Dict[str, Any], stream_cb: Optional[StreamCB] = None):
+        """
+        prompt | llm | parser.
+        With stream_cb (and LLM_STREAMING on), tokens are forwarded as they arrive via astream();
+        the PydanticOutputParser still runs once on the full completion.
+        """
+        chain = self._chain()
+        if stream_cb is None or not config.LLM_STREAMING:
+            with timed("llm", streamed=False):
+                completion = self._chunk_text(await chain.ainvoke(inputs))
+        else:
+            parts: List[str] = []
+            started = time.perf_counter()
+            with timed("llm", streamed=True):
+                async for chunk in chain.astream(inputs):
+                    text = self._chunk_text(chunk)
+                    if text:
+                        if not parts:
+                            record("llm_first_token", time.perf_counter() - started)
+                        parts.append(text)
+                        self._emit(stream_cb, text)
+            completion = "".join(parts)
+
+        with timed("parse"):
+            return self._parser.parse(completion)
+
     @abstractmethod
-    async def run(self, task: str, *, job_id: str, request_id: str, progress_cb: Optional[ProgressCB] = None):
+    async def run(
+        self,
+        task: str,
+        *,
+        job_id: str,
+        request_id: str,
+        progress_cb: Optional[ProgressCB] = None,
+        stream_cb: Optional[StreamCB] = None,
+    ):
         """Execute the agent-specific workflow and return a Pydantic model output."""
         ...
@@ -1,7 +1,5 @@
 import re
 
-from langchain_core.output_parsers import PydanticOutputParser
-
 from app.agents.base import BaseAgent
 from app.agents.code.prompts import CODE_PROMPT
 from app.core.config import config
@@ -15,7 +13,13 @@ class CodeAgent(BaseAgent):
 
     def __init__(self):
         # Code models benefit from low temperature
-        super().__init__(model_name=config.LLM_MODEL_CODE, temperature=0.2, timeout_s=45)
+        super().__init__(
+            model_name=config.LLM_MODEL_CODE,
+            temperature=0.2,
+            timeout_s=45,
+            prompt=CODE_PROMPT,
+            output_model=CodeOutput,
+        )
 
     def _sanitize_text(self, s: str) -> str:
         # remove ASCII control chars to keep JSON/Mongo/jq happy
@@ -27,15 +31,11 @@ class CodeAgent(BaseAgent):
         m = re.match(r"^```[a-zA-Z0-9_-]*\n(.*)\n```$", s.strip(), flags=re.DOTALL)
         return m.group(1) if m else s
 
-    async def run(self, task: str, *, job_id: str, request_id: str, progress_cb=None) -> CodeOutput:
+    async def run(self, task: str, *, job_id: str, request_id: str, progress_cb=None, stream_cb=None) -> CodeOutput:
         self._progress(progress_cb, 0.30)
 
-        parser = PydanticOutputParser(pydantic_object=CodeOutput)
-        prompt = CODE_PROMPT.partial(schema=parser.get_format_instructions())
-        chain = prompt | self.llm | parser
-
         self._progress(progress_cb, 0.70)
-        output: CodeOutput = await chain.ainvoke({"task": self._sanitize_text(self._strip_md_code_fence(task))})
+        output: CodeOutput = await self._invoke_chain({"task": self._sanitize_text(self._strip_md_code_fence(task))}, stream_cb=stream_cb)
 
         # ---- post-process / guardrails ----
         output.code = self._strip_md_code_fence(self._sanitize_text(output.code))
@@ -1,41 +1,69 @@
-from typing import List
+import logging
+from typing import List, Optional
 
-from langchain_core.output_parsers import PydanticOutputParser
+import httpx
 
 from app.agents.base import BaseAgent
 from app.agents.content.prompts import CONTENT_PROMPT
 from app.core.config import config
 from app.schemas.agent_content import ContentOutput, Source
+from app.services.domain_matcher import compile_rules
+from app.services.host_guard import HostUnavailable
+from app.services.page_cache import PageCache
 from app.services.search_factory import make_search_provider
 from app.services.web import WebClient
 
+logger = logging.getLogger(__name__)
+
+
+class SourcesUnavailable(Exception):
+    """Not enough sources because the pages could not be fetched (network errors, open circuits)."""
+
+    code = "sources_unavailable"
+
 
 class ContentAgent(BaseAgent):
     """Produce a sourced answer (≥2 sources), using only provided links."""
 
     def __init__(self, web: WebClient = None):
-        super().__init__(model_name=config.LLM_MODEL_CONTENT, temperature=0.35, timeout_s=60)
+        super().__init__(
+            model_name=config.LLM_MODEL_CONTENT,
+            temperature=0.35,
+            timeout_s=60,
+            prompt=CONTENT_PROMPT,
+            output_model=ContentOutput,
+        )
         provider = make_search_provider()
-        whitelist = [d.strip() for d in (config.WEB_WHITELIST or "").split(",") if d.strip()]
         self.web = WebClient(
             search_provider=provider,
-            whitelist=whitelist,
+            matcher=compile_rules(config.WEB_WHITELIST or ""),
             timeout_s=config.WEB_TIMEOUT_S,
             user_agent=config.WEB_USER_AGENT,
+            page_cache=PageCache() if config.WEB_PAGE_CACHE_ENABLED else None,
         )
 
     async def _gather_sources(self, query: str, min_sources: int = 2, limit: int = 5) -> List[Source]:
         hits = await self.web.search(query, limit=limit)  # [{title, url}]
         sources: List[Source] = []
-        for h in hits:
+        last_error: Optional[Exception] = None
+        # only whitelisted hosts, healthy ones first; a failing or circuit-open host is skipped instead of failing the job
+        for h in self.web.prefer_healthy(self.web.allowed_hits(hits)):
             # Optionally fetch page to validate title/url (and stay within whitelist)
-            page = await self.web.fetch(h["url"])  # {title, url, snippet?}
+            try:
+                page = await self.web.fetch(h["url"])  # {title, url, snippet?}
+            except (httpx.HTTPError, HostUnavailable) as e:
+                logger.info("source skipped: %s (%s)", h["url"], e)
+                last_error = e
+                continue
             sources.append(Source(title=page["title"], url=page["url"]))
             if len(sources) >= min_sources:
                 break
+        if len(sources) < min_sources and last_error is not None:
+            # not a Celery retry: the job is already failed by then, so say why instead of "insufficient_sources"
+            raise SourcesUnavailable(f"sources_unavailable: {last_error}") from last_error
         return sources
 
-    async def run(self, task: str, *, job_id: str, request_id: str, progress_cb=None) -> ContentOutput:
+    async def run(self, task: str, *, job_id: str, request_id: str, progress_cb=None, stream_cb=None) -> ContentOutput:
         # 1) gather sources (≥2)
         self._progress(progress_cb, 0.20)
         srcs = await self._gather_sources(task, min_sources=2, limit=5)
@@ -44,13 +72,9 @@ class ContentAgent(BaseAgent):
 
         sources_block = "\n".join(f"- {s.title} — {s.url}" for s in srcs)
 
-        # 2) LC chain: prompt | llm | parser
-        parser = PydanticOutputParser(pydantic_object=ContentOutput)
-        prompt = CONTENT_PROMPT.partial(schema=parser.get_format_instructions())
-        chain = prompt | self.llm | parser
-
+        # 2) LC chain: prompt | llm | parser (prebuilt; streamed to stream_cb when given)
         self._progress(progress_cb, 0.80)
-        output: ContentOutput = await chain.ainvoke({"task": task, "sources_block": sources_block})
+        output: ContentOutput = await self._invoke_chain({"task": task, "sources_block": sources_block}, stream_cb=stream_cb)
 
         # 3) Optional guardrail: ensure output.sources ⊆ gathered sources
         allowed = {str(s.url): s for s in srcs}
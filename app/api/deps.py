@@ -1,13 +1,14 @@
 from typing import Optional
 
 import jwt
-from fastapi import Depends
+from fastapi import Depends, Header
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import config
 from app.core.error_codes import ErrorCode
 from app.core.exceptions import ExceptionBase
+from app.core.security import verify_api_key
 from app.db.postgres.session import get_db
 from app.schemas.auth import ActorSchema
 from app.services.auth import AuthService
@@ -44,3 +45,9 @@ class ActorProvider:
 
 
 require_authenticated_user = ActorProvider()
+
+
+def require_api_key(api_key: Optional[str] = Header(default=None, alias="X-API-Key")) -> None:
+    """Admin endpoints: X-API-Key must match config.API_KEY."""
+    if not verify_api_key(api_key):
+        raise ExceptionBase(ErrorCode.UNAUTHORIZED_ACCESS)
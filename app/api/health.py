@@ -1,12 +1,11 @@
 import logging
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Request
+from fastapi.responses import ORJSONResponse
 
-# from app.db.mongodb.mongodb import MongoDB
-from app.db.postgres.session import check_db_connection, get_db
+from app.core.health import prober
+from app.core.lifecycle import readiness
 
 router = APIRouter(prefix="/health", tags=["health"], include_in_schema=False)
 logger = logging.getLogger(__name__)
@@ -18,7 +17,7 @@ def health(request: Request):
     Root health check endpoint.
     Returns basic application info and status.
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "status": "healthy",
@@ -29,54 +28,41 @@ def health(request: Request):
 
 
 @router.get("/db")
-async def db_health(db: AsyncSession = Depends(get_db)):
+def db_health():
     """
-    Database health check.
-    Verifies connection to the database.
+    Database health check (cached result of the background prober; no session is opened per call).
     """
-    try:
-        is_connected = await check_db_connection(db)
-        return {
+    status = prober.status("postgres")
+    is_connected = bool(status and status["ok"])
+    return ORJSONResponse(
+        status_code=200 if is_connected else 503,
+        content={
             "status": "ok" if is_connected else "error",
             "database": "connected" if is_connected else "disconnected",
+            "check": status,
             "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
-    except Exception as e:
-        logger.error(f"Database health check failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        },
+    )
 
 
-@router.get("/ready")
-def readiness():
+@router.get("/dependencies")
+def dependencies_health():
     """
-    # TODO: add readiness probe for Kubernetes
+    Postgres, MongoDB, Redis and broker status as last seen by the background prober.
     """
-    return {
-        "status": "ready",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
+    deps = prober.snapshot()
+    healthy = prober.healthy()
+    return ORJSONResponse(
+        status_code=200 if healthy else 503,
+        content={"status": "ok" if healthy else "degraded", "dependencies": deps, "timestamp": datetime.now(timezone.utc).isoformat()},
+    )
 
 
-# @router.get("/mongodb")
-# async def mongodb_health():
-#     """
-#     MongoDB health check.
-#     Verifies connection to MongoDB.
-#     """
-#     try:
-#         client = await MongoDB.connect()
-#         # Test the connection
-#         await client.admin.command("ping")
-#         return {
-#             "status": "ok",
-#             "mongodb": "connected",
-#             "timestamp": datetime.now(timezone.utc).isoformat(),
-#         }
-#     except Exception as e:
-#         logger.error(f"MongoDB health check failed: {str(e)}")
-#         return {
-#             "status": "error",
-#             "mongodb": "disconnected",
-#             "error": str(e),
-#             "timestamp": datetime.now(timezone.utc).isoformat(),
-#         }
+@router.get("/ready")
+def readiness_probe():
+    """
+    Readiness probe for Kubernetes (O(1): reads cached probe results).
+    503 until startup opened the pools, while a required dependency is down, and once shutdown begins.
+    """
+    body = {**readiness.as_dict(), "timestamp": datetime.now(timezone.utc).isoformat()}
+    return ORJSONResponse(status_code=200 if readiness.is_ready() else 503, content=body)
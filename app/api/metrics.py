@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_latest
+
+router = APIRouter(tags=["metrics"], include_in_schema=False)
+
+
+@router.get("/metrics")
+def metrics():
+    """
+    Prometheus scrape endpoint.
+    Aggregates all API worker processes when PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
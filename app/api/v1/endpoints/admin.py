@@ -0,0 +1,43 @@
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+
+from app.api.deps import require_api_key
+from app.core.error_codes import ErrorCode
+from app.core.exceptions import ExceptionBase
+from app.core.profiling import load_stats
+from app.repositories.mongodb.profiles import ProfilesRepository
+from app.schemas.profiles import ProfileKind, ProfileRecord
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_api_key)])
+
+
+@router.get("/profiles", response_model=List[ProfileRecord], response_model_exclude={"pstats", "summary"})
+async def list_profiles(
+    kind: Optional[ProfileKind] = Query(default=None),
+    target: Optional[str] = Query(default=None, description="job_id, or 'METHOD /path' for requests"),
+    limit: int = Query(default=50, ge=1, le=500),
+):
+    """
+    List stored profiler captures (newest first, metadata only).
+    """
+    return await ProfilesRepository().list_recent(kind=kind, target=target, limit=limit)
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, format: Literal["pstats", "text"] = Query(default="pstats")):
+    """
+    Download a capture.
+    - pstats: binary file for `python -m pstats`, snakeviz, etc.
+    - text: top functions by cumulative time.
+    """
+    record = await ProfilesRepository().get(profile_id)
+    if record is None:
+        raise ExceptionBase(ErrorCode.RECORD_NOT_FOUND)
+    if format == "text":
+        return Response(content=record.summary or "", media_type="text/plain; charset=utf-8")
+    return Response(
+        content=load_stats(record),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{record.profile_id}.pstats"'},
+    )
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Header, Request, Response, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
 
 from app.api.deps import depends_orchestrator, require_authenticated_user
 from app.core.error_codes import ErrorCode
@@ -46,7 +46,22 @@ async def execute_job(
 @router.get("/jobs/{job_id}", response_model=JobStatusDTO)
 async def get_job_status(
     job_id: str,
+    include_result: bool = Query(default=True, description="Include the result (set false for cheap progress polling)"),
+    include_metrics: bool = Query(default=False, description="Include the per-stage timing breakdown"),
     actor: ActorSchema = Depends(require_authenticated_user),
     orchestrator: JobsOrchestrator = Depends(depends_orchestrator),
 ):
-    return await orchestrator.get_status_owner_guard(job_id, actor)
+    return await orchestrator.get_status_owner_guard(job_id, actor, include_result=include_result, include_metrics=include_metrics)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobStatusDTO)
+async def cancel_job(
+    job_id: str,
+    actor: ActorSchema = Depends(require_authenticated_user),
+    orchestrator: JobsOrchestrator = Depends(depends_orchestrator),
+):
+    """
+    Cancel a queued or running job.
+    Queued jobs are never picked up; running jobs are cancelled cooperatively by the worker.
+    """
+    return await orchestrator.cancel_owner_guard(job_id, actor)
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import agent, auth
+from app.api.v1.endpoints import admin, agent, auth
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, tags=["auth"])
 api_router.include_router(agent.router, tags=["agent"])
+api_router.include_router(admin.router, tags=["admin"])
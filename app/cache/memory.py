@@ -0,0 +1,46 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    Small in-process LRU with per-entry TTL (per process; not shared between API/worker processes).
+    Not thread-safe: meant for the event loop thread.
+    """
+
+    def __init__(self, maxsize: int, ttl_s: float) -> None:
+        self._maxsize = int(maxsize)
+        self._ttl_s = float(ttl_s)
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        if self._maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + self._ttl_s, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def clear(self) -> None:
+        self._data.clear()
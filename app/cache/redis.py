@@ -0,0 +1,46 @@
+import logging
+
+from redis.asyncio import Redis, from_url
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class RedisClient:
+    """Process-wide async Redis client (lazy, shared by API and worker)."""
+
+    client: Redis = None
+
+    @classmethod
+    async def connect(cls) -> Redis:
+        """Connect to Redis."""
+        try:
+            if cls.client is None:
+                cls.client = from_url(config.REDIS_URL, encoding="utf-8", decode_responses=True)
+                await cls.client.ping()
+                logger.info("Successfully connected to Redis")
+            return cls.client
+        except Exception as e:
+            logger.error(f"Failed to connect to Redis: {str(e)}")
+            cls.client = None
+            raise
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close Redis connection pool."""
+        if cls.client is not None:
+            await cls.client.aclose()
+            cls.client = None
+            logger.info("Redis connection closed")
+
+    @classmethod
+    async def get_client(cls) -> Redis:
+        if cls.client is None:
+            await cls.connect()
+        return cls.client
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Namespaced key, e.g. key("jobs", "cancel", job_id) -> 'agentic_ai:jobs:cancel:<job_id>'."""
+        return ":".join((config.REDIS_PREFIX.rstrip(":"),) + parts)
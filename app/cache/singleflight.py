@@ -0,0 +1,60 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterator, TypeVar
+
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[V]):
+    """
+    Coalesces concurrent calls per key: the first caller runs `fn`, callers arriving while it is in flight
+    await the same result (or exception). Per process and per event loop.
+    Waiters are counted: one caller being canceled does not cancel the shared call for the others, but when
+    the last waiter leaves the call is canceled (nobody wants its result any more, e.g. the job was canceled).
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, "asyncio.Task[V]"] = {}
+        self._waiters: Dict["asyncio.Task[V]", int] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def inflight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> V:
+        task = self.start(key, fn)
+        with self.waiting(key, task):
+            return await asyncio.shield(task)
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> "asyncio.Task[V]":
+        """The in-flight task for `key`, started from `fn` if there is none (registered before returning)."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    @contextmanager
+    def waiting(self, key: Hashable, task: "asyncio.Task[V]") -> Iterator["asyncio.Task[V]"]:
+        """Count the caller as a waiter of `task` while inside; the last one leaving cancels it if still running."""
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            yield task
+        finally:
+            left = self._waiters.pop(task) - 1
+            if left:
+                self._waiters[task] = left
+            elif not task.done():
+                # forget it right away, so a caller arriving before it unwinds starts a fresh call
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+                task.cancel()
+
+    def _done(self, key: Hashable, task: "asyncio.Task[V]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # every waiter may have been canceled; retrieve the exception so asyncio does not warn
+        if not task.cancelled():
+            task.exception()
@@ -33,6 +33,39 @@ class Config(BaseSettings):
 
     # QUEUE NAME
     QUEUE_NAME: str
+    # publish run_agent_task to "<QUEUE_NAME>.<agent>" (code/content worker pools); workers must consume those queues
+    JOB_QUEUE_PER_AGENT: bool = False
+    # Celery message encoding: "json" or "orjson". Workers accept both; switch to orjson only once every worker
+    # runs a release that accepts it (older workers reject application/x-orjson messages)
+    CELERY_TASK_SERIALIZER: str = "json"
+
+    # Routing (PeerAgent)
+    ROUTING_CACHE_SIZE: int = 10_000  # task_hash -> decision memo per process
+    ROUTING_CACHE_TTL_S: int = 24 * 60 * 60
+    ROUTER_BACKEND: Literal["rules", "ml"] = "rules"  # ml: hashed n-gram classifier (extra "ml"), rules below threshold
+    ROUTER_MODEL_PATH: str = "models/router.npz"  # written by `python -m app.peer.train_router`
+    ROUTER_ML_MIN_CONFIDENCE: float = 0.8
+
+    # Jobs
+    JOB_CANCEL_FLAG_TTL_S: int = 60 * 60  # how long a cancel signal stays visible to late subscribers
+    JOB_LEASE_TTL_S: int = 120  # running jobs without a heartbeat for this long are reaped
+    JOB_LEASE_RENEW_INTERVAL_S: int = 30
+    JOB_REAPER_INTERVAL_S: int = 60
+    JOB_MAX_ATTEMPTS: int = 3  # reaped jobs are requeued until this many attempts, then failed
+    JOB_RESULT_INLINE_MAX_BYTES: int = 16 * 1024  # larger results are stored compressed in 'job_results'
+    JOB_RESULT_CODEC: Literal["zstd", "gzip"] = "zstd"
+    JOB_IDEMPOTENCY_CACHE_SIZE: int = 10_000  # recent (idempotency key, task) -> job per API process
+    JOB_IDEMPOTENCY_CACHE_TTL_S: int = 10 * 60
+
+    # Startup (API lifespan)
+    STARTUP_WARMUP_CONNECTIONS: int = 4  # connections opened per pool (Mongo/Redis/Postgres) before serving
+    STARTUP_ENSURE_INDEXES: bool = True  # create Mongo indexes on startup (idempotent)
+
+    # Health probes (background prober; /health/* serve cached results)
+    HEALTH_PROBE_INTERVAL_S: float = 5.0
+    HEALTH_PROBE_TIMEOUT_S: float = 2.0
+    HEALTH_PROBE_STALE_S: float = 30.0  # older results count as failing
+    HEALTH_READY_DEPENDENCIES: str = "mongodb,redis,postgres,broker"  # all must be up for /health/ready
 
     # Rate Limiter Settings
     RATE_LIMIT_TIMES: int = 100  # Number of requests allowed
@@ -57,6 +90,21 @@ class Config(BaseSettings):
     MONGO_USER: str
     MONGO_PASSWORD: str
     MONGO_DB: str
+    MONGO_MAX_POOL_SIZE: int = 100  # per process (each Celery child and API worker has its own pool)
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: int = 5 * 60 * 1000  # idle pooled connections are closed after this
+    MONGO_MAX_CONNECTING: int = 2  # connections being established concurrently per pool
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None  # max wait for a pooled connection (None: until serverSelection/timeout)
+    MONGO_CONNECT_TIMEOUT_MS: int = 5_000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 10_000
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = None
+    MONGO_COMPRESSORS: str = ""  # wire compression, e.g. "zstd,snappy,zlib" (snappy needs python-snappy)
+    MONGO_ZLIB_COMPRESSION_LEVEL: int = 6
+    # write concern per operation class ("majority" | "1" | "0" | tag set name)
+    MONGO_WRITE_CONCERN_STATE: str = "majority"  # job transitions, results, webhook deliveries
+    MONGO_WRITE_CONCERN_EVENTS: str = "1"  # log events, progress, partial output, profiles
+    MONGO_WRITE_TIMEOUT_MS: int = 10_000
+    MONGO_READ_PREFERENCE_STATUS: Literal["primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"] = "primary"
 
     # LLM Settings
     LLM_PROVIDER: str
@@ -66,14 +114,72 @@ class Config(BaseSettings):
     LLM_MAX_RETRIES: int
     OPENAI_API_KEY: str
     OPENAI_BASE_URL: str
+    LLM_STREAMING: bool = True  # stream tokens into jobs.partial_output while the agent runs
+    LLM_STREAM_FLUSH_INTERVAL_MS: int = 250
+    LLM_STREAM_MAX_CHARS: int = 32_000
+    LLM_COALESCE: bool = True  # identical in-flight prompts (model + temperature + prompt) share one upstream call
+    LLM_MAX_CONCURRENCY: int = 8  # upstream calls in flight per model and process
+    LLM_MODEL_CONCURRENCY: str = ""  # per-model overrides, e.g. "gpt-4o=2,gpt-4o-mini=16"
+    LLM_BATCH_WINDOW_MS: int = 0  # >0: non-streamed calls are collected this long and sent through abatch
+    LLM_BATCH_MAX_SIZE: int = 8
 
     # Web / ContentAgent
     WEB_USER_AGENT: str = "AgenticAPI/ContentAgent"
     WEB_TIMEOUT_S: int = 10
-    WEB_WHITELIST: str = ""  # "wikipedia.org, mdn.mozilla.org" gibi
+    WEB_WHITELIST: str = ""  # "wikipedia.org, *.mozilla.org, !ads.example.com" gibi (see DomainMatcher)
+    # outbound guard per host (web fetches and search APIs)
+    WEB_PER_HOST_CONCURRENCY: int = 4
+    WEB_CIRCUIT_FAILURE_THRESHOLD: int = 3  # consecutive failures (network, timeout, 429, 5xx) that open the circuit
+    WEB_CIRCUIT_COOLOFF_S: float = 30.0  # the host is skipped this long, then probed with one call
+    WEB_HOST_STATS_WINDOW: int = 100
     WEB_SEARCH_PROVIDER: Optional[Literal["ddg", "serpapi", "bing"]] = None
+    WEB_SEARCH_PROVIDERS: str = ""  # "serpapi,bing,ddg": several providers, hedged (overrides WEB_SEARCH_PROVIDER)
+    WEB_SEARCH_HEDGE_DEFAULT_MS: int = 1500  # hedge delay until a provider has enough latency samples
+    WEB_SEARCH_HEDGE_MIN_MS: int = 200  # otherwise its p95, clamped to [min, max]
+    WEB_SEARCH_HEDGE_MAX_MS: int = 5000
+    WEB_SEARCH_MERGE_GRACE_MS: int = 200  # hedged calls answering this soon after the first answer are merged into it
+    WEB_SEARCH_STATS_WINDOW: int = 200  # latest calls per provider used for p95 / error rate
     SERPAPI_API_KEY: Optional[str] = None
     SERPAPI_ENGINE: Optional[str] = "duckduckgo"
+    BING_API_KEY: Optional[str] = None
+    BING_ENDPOINT: str = "https://api.bing.microsoft.com/v7.0/search"
+    BING_MARKET: str = "en-US"
+    # search result cache (in-process LRU + Redis); key = normalized query + engine + limit
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL_S: int = 24 * 60 * 60
+    SEARCH_CACHE_NEGATIVE_TTL_S: int = 60  # provider errors are remembered this long (no retry storms on quota/outage)
+    SEARCH_CACHE_MEMORY_SIZE: int = 1024
+    SEARCH_CACHE_LOCK_TTL_S: float = 15.0  # cross-process coalescing: others wait this long for the first caller
+    # fetched-page cache (title/snippet per URL, in-process LRU + Redis)
+    WEB_PAGE_CACHE_ENABLED: bool = True
+    WEB_PAGE_CACHE_FRESH_S: int = 60 * 60  # served without contacting the origin
+    WEB_PAGE_CACHE_TTL_S: int = 7 * 24 * 60 * 60  # then revalidated (ETag / Last-Modified) until this age
+    WEB_PAGE_CACHE_MEMORY_SIZE: int = 512
+
+    # Webhooks
+    WEBHOOK_SECRET: Optional[str] = None  # HMAC signing key; webhooks are not sent without it
+    WEBHOOK_TIMEOUT_S: float = 10.0
+    WEBHOOK_MAX_ATTEMPTS: int = 5
+    WEBHOOK_BACKOFF_BASE_S: float = 1.0
+    WEBHOOK_BACKOFF_MAX_S: float = 60.0
+    WEBHOOK_PER_HOST_CONCURRENCY: int = 4
+
+    # Metrics
+    METRICS_WORKER_PORT: Optional[int] = 9108  # Celery worker /metrics exporter (None disables)
+
+    # Tracing (OpenTelemetry; optional extra "tracing")
+    OTEL_ENABLED: bool = False
+    OTEL_TRACES_SAMPLE_RATIO: float = 0.05  # share of new traces recorded; queue/worker spans follow the parent
+    OTEL_EXPORTER: Literal["otlp", "file", "console"] = "otlp"
+    OTEL_EXPORTER_OTLP_ENDPOINT: str = "http://localhost:4318"  # OTLP/HTTP collector
+    OTEL_EXPORT_FILE: str = "logs/traces.jsonl"
+
+    # Profiling (opt-in; captures are stored in Mongo 'profiles', see /api/v1/admin/profiles)
+    PROFILE_ENGINE: Literal["auto", "cprofile", "yappi"] = "auto"  # auto: yappi when installed, else cProfile
+    PROFILE_JOB_SAMPLE_RATE: float = 0.0  # fraction of run_agent_task executions to profile
+    PROFILE_HEADER: str = "X-Profile"  # "1" + a valid X-API-Key profiles that API request
+    PROFILE_SUMMARY_LINES: int = 40
+    PROFILE_RETENTION_S: int = 3 * 24 * 60 * 60
 
     # Logging
     LOG_LEVEL: str = "INFO"
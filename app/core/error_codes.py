@@ -55,3 +55,6 @@ class ErrorCode(IntEnum):
 
     # API Errors (6000-6999)
     API_ERROR = (6000, "API error", 500, "An error occurred while accessing the API")
+
+    # Job Errors (7000-7999)
+    JOB_NOT_CANCELABLE = (7000, "Job not cancelable", 409, "The job has already finished and cannot be canceled")
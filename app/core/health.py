@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from sqlalchemy import text
+
+from app.cache.redis import RedisClient
+from app.core.config import config
+from app.db.mongodb.mongodb import MongoDB
+from app.db.postgres.session import async_engine
+
+logger = logging.getLogger(__name__)
+
+Probe = Callable[[], Awaitable[None]]
+
+
+async def probe_mongodb() -> None:
+    client = await MongoDB.connect()
+    await client.admin.command("ping")
+
+
+async def probe_redis() -> None:
+    redis = await RedisClient.get_client()
+    await redis.ping()
+
+
+async def probe_postgres() -> None:
+    # pooled connection; no ORM session per probe
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+def _broker_ping() -> None:
+    from app.workers.celery_config import celery_app
+
+    with celery_app.connection_for_write() as conn:
+        conn.ensure_connection(max_retries=1, timeout=config.HEALTH_PROBE_TIMEOUT_S)
+
+
+async def probe_broker() -> None:
+    # kombu is blocking; the prober keeps at most one of these threads per dependency
+    await asyncio.to_thread(_broker_ping)
+
+
+DEFAULT_PROBES: Dict[str, Probe] = {
+    "mongodb": probe_mongodb,
+    "redis": probe_redis,
+    "postgres": probe_postgres,
+    "broker": probe_broker,
+}
+
+
+class HealthProber:
+    """
+    Background dependency prober. Every `interval_s` each dependency is checked with a timeout and the
+    result is cached, so health endpoints only read a dict.
+    - at most one probe per dependency is in flight: a probe still hanging past its timeout is not restarted
+      (reported as failing), so a slow dependency never piles up connections or threads
+    - results older than `stale_s` count as failing (prober stalled)
+    """
+
+    def __init__(
+        self,
+        probes: Optional[Dict[str, Probe]] = None,
+        *,
+        required: Iterable[str] = (),
+        interval_s: float = config.HEALTH_PROBE_INTERVAL_S,
+        timeout_s: float = config.HEALTH_PROBE_TIMEOUT_S,
+        stale_s: float = config.HEALTH_PROBE_STALE_S,
+    ) -> None:
+        self._probes = dict(DEFAULT_PROBES if probes is None else probes)
+        self._required = set(required) or set(self._probes)
+        self._interval_s = float(interval_s)
+        self._timeout_s = float(timeout_s)
+        self._stale_s = float(stale_s)
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # ---- lifecycle ----
+
+    async def start(self) -> None:
+        """Run one round (so readiness is known right away), then keep probing in the background."""
+        await self.run_once()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for t in self._inflight.values():
+            t.cancel()
+        await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        self._inflight.clear()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_s)
+            try:
+                await self.run_once()
+            except Exception as e:
+                # never let the prober die; stale results turn readiness off anyway
+                logger.warning("health probe round failed: %s", e)
+
+    # ---- probing ----
+
+    async def run_once(self) -> None:
+        await asyncio.gather(*(self._check(name, probe) for name, probe in self._probes.items()))
+
+    async def _check(self, name: str, probe: Probe) -> None:
+        task = self._inflight.get(name)
+        if task is not None and not task.done():
+            self._store(name, False, None, "previous probe still running")
+            return
+        task = self._inflight[name] = asyncio.create_task(probe())
+        # a probe that outlives its timeout finishes unobserved; retrieve its exception so asyncio does not warn
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        started = time.perf_counter()
+        try:
+            # shield: on timeout the probe keeps running (and is skipped next round) instead of being torn down mid-call
+            await asyncio.wait_for(asyncio.shield(task), timeout=self._timeout_s)
+        except asyncio.TimeoutError:
+            self._store(name, False, None, f"timeout after {self._timeout_s}s")
+            return
+        except Exception as e:
+            self._store(name, False, time.perf_counter() - started, str(e) or type(e).__name__)
+            return
+        self._store(name, True, time.perf_counter() - started, None)
+
+    def _store(self, name: str, ok: bool, elapsed_s: Optional[float], error: Optional[str]) -> None:
+        prev = self._results.get(name)
+        if prev is not None and prev["ok"] != ok:
+            logger.warning("dependency %s is now %s%s", name, "up" if ok else "down", f": {error}" if error else "")
+        result: Dict[str, Any] = {"ok": ok, "checked_at": time.time()}
+        if elapsed_s is not None:
+            result["latency_ms"] = round(elapsed_s * 1000, 3)
+        if error:
+            result["error"] = error
+        self._results[name] = result
+
+    # ---- cached reads ----
+
+    def _fresh(self, result: Dict[str, Any]) -> bool:
+        return time.time() - result["checked_at"] <= self._stale_s
+
+    def status(self, name: str) -> Optional[Dict[str, Any]]:
+        result = self._results.get(name)
+        if result is None:
+            return None
+        out = dict(result)
+        out["ok"] = result["ok"] and self._fresh(result)
+        out["checked_at"] = datetime.fromtimestamp(result["checked_at"], timezone.utc).isoformat()
+        return out
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self.status(name) for name in self._probes if name in self._results}
+
+    def healthy(self) -> bool:
+        return all((self.status(name) or {}).get("ok") for name in self._required)
+
+
+prober = HealthProber(required=[d.strip() for d in config.HEALTH_READY_DEPENDENCIES.split(",") if d.strip()])
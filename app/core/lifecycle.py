@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy import text
+
+from app.cache.redis import RedisClient
+from app.core.config import config
+from app.core.health import prober
+from app.db.mongodb.mongodb import MongoDB
+from app.db.postgres.session import async_engine
+from app.peer import rules  # noqa: F401  (routing patterns are compiled at import)
+from app.peer.peer_agent import load_router
+from app.repositories.mongodb.job_results import JobResultsRepository
+from app.repositories.mongodb.jobs import JobsRepository
+from app.repositories.mongodb.log_events import LogEventsRepository
+from app.repositories.mongodb.profiles import ProfilesRepository
+from app.repositories.mongodb.webhook_deliveries import WebhookDeliveriesRepository
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """
+    Process readiness: set once startup finished, cleared when shutdown begins.
+    /health/ready additionally requires the background prober to see every required dependency up.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.checks: Dict[str, Dict[str, Any]] = {}
+        self.since: datetime | None = None
+
+    def mark(self, name: str, ok: bool, started: float, error: str | None = None) -> None:
+        check: Dict[str, Any] = {"ok": ok, "ms": round((time.perf_counter() - started) * 1000, 3)}
+        if error:
+            check["error"] = error
+        self.checks[name] = check
+
+    def is_ready(self) -> bool:
+        return self.ready and prober.healthy()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.is_ready() else "not_ready",
+            "since": self.since.isoformat() if self.since else None,
+            "startup": self.checks,
+            "dependencies": prober.snapshot(),
+        }
+
+
+readiness = Readiness()
+
+
+async def ensure_indexes(db) -> None:
+    """Create every Mongo index the repositories rely on (idempotent)."""
+    await JobsRepository.ensure_indexes(db)
+    await LogEventsRepository.ensure_indexes(db)
+    await WebhookDeliveriesRepository.ensure_indexes(db)
+    await JobResultsRepository.ensure_indexes(db)
+    await ProfilesRepository.ensure_indexes(db, config.PROFILE_RETENTION_S)
+
+
+async def _warm_mongo() -> None:
+    client = await MongoDB.connect()
+    # concurrent pings check out (and so open) that many pooled connections
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(config.STARTUP_WARMUP_CONNECTIONS)))
+    if config.STARTUP_ENSURE_INDEXES:
+        await ensure_indexes(await MongoDB.get_database())
+
+
+async def _warm_redis() -> None:
+    redis = await RedisClient.connect()
+    await asyncio.gather(*(redis.ping() for _ in range(config.STARTUP_WARMUP_CONNECTIONS)))
+
+
+async def _warm_postgres() -> None:
+    async def _one() -> None:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_one() for _ in range(config.STARTUP_WARMUP_CONNECTIONS)))
+
+
+STARTUP_STEPS: Dict[str, Callable[[], Awaitable[None]]] = {
+    "mongodb": _warm_mongo,
+    "redis": _warm_redis,
+    "postgres": _warm_postgres,
+}
+
+
+async def startup() -> None:
+    """
+    Open and pre-warm the Mongo/Redis/Postgres pools and ensure Mongo indexes, so the first requests
+    do not pay connection setup. Steps run concurrently; any failure aborts startup (the process restarts).
+    """
+
+    async def _step(name: str, fn: Callable[[], Awaitable[None]]) -> None:
+        started = time.perf_counter()
+        try:
+            await fn()
+        except Exception as e:
+            readiness.mark(name, False, started, str(e))
+            logger.error("startup step %s failed: %s", name, e)
+            raise
+        readiness.mark(name, True, started)
+
+    await asyncio.gather(*(_step(name, fn) for name, fn in STARTUP_STEPS.items()))
+    load_router()  # ROUTER_BACKEND=ml: load the model now, not on the first submit
+    await prober.start()
+    readiness.ready = True
+    readiness.since = datetime.now(timezone.utc)
+    logger.info("startup complete: %s", readiness.checks)
+
+
+async def shutdown() -> None:
+    """Stop reporting ready first, then close every pool (best-effort: one failure does not skip the rest)."""
+    readiness.ready = False
+    await prober.stop()
+    for name, close in (("mongodb", MongoDB.close), ("redis", RedisClient.close), ("postgres", async_engine.dispose)):
+        try:
+            await close()
+        except Exception as e:
+            logger.warning("failed to close %s: %s", name, e)
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import sys
@@ -9,7 +8,11 @@ from functools import wraps
 from logging.handlers import RotatingFileHandler
 from typing import Optional
 
+import orjson
+
 from app.core.config import config
+from app.core.profiling import profiled, should_sample
+from app.schemas.profiles import ProfileKind
 
 
 class StructuredLogger:
@@ -68,7 +71,8 @@ class StructuredLogger:
             "service": self.logger.name,
             **kwargs,
         }
-        return json.dumps(log_data)
+        # orjson: datetimes/enums/UUIDs natively, anything else via str() instead of failing the log call
+        return orjson.dumps(log_data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
 
     def debug(self, message: str, **kwargs):
         self.logger.debug(self._format_log("DEBUG", message, **kwargs))
@@ -86,12 +90,27 @@ class StructuredLogger:
         self.logger.critical(self._format_log("CRITICAL", message, **kwargs))
 
 
-def log_execution(logger: StructuredLogger):
+def log_execution(
+    logger: StructuredLogger,
+    *,
+    profile_kind: Optional[str] = None,
+    profile_sample_rate: float = 0.0,
+    profile_target: Optional[str] = None,
+):
+    """
+    Log start/end/error of an async function.
+
+    Profiling (opt-in): with profile_kind set, a profile_sample_rate fraction of calls runs under
+    app.core.profiling.profiled(); profile_target names the kwarg used as the stored target/id
+    (e.g. "job_id"), otherwise the function name is used. The profile_id is added to the logs.
+    """
+
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
             request_id = str(uuid.uuid4())
             start_time = datetime.now(timezone.utc)
+            profile_id = None
 
             try:
                 logger.info(
@@ -102,11 +121,21 @@ def log_execution(logger: StructuredLogger):
                     kwargs=str(kwargs),
                 )
 
-                result = await func(*args, **kwargs)
+                if profile_kind and should_sample(profile_sample_rate):
+                    target = str(kwargs.get(profile_target)) if profile_target else func.__qualname__
+                    async with profiled(ProfileKind(profile_kind), target) as handle:
+                        profile_id = handle.profile_id
+                        result = await func(*args, **kwargs)
+                else:
+                    result = await func(*args, **kwargs)
 
                 execution_time = (datetime.now(timezone.utc) - start_time).total_seconds()
                 logger.info(
-                    f"Completed execution of {func.__name__}", request_id=request_id, function=func.__name__, execution_time=execution_time
+                    f"Completed execution of {func.__name__}",
+                    request_id=request_id,
+                    function=func.__name__,
+                    execution_time=execution_time,
+                    profile_id=profile_id,
                 )
 
                 return result
@@ -120,6 +149,7 @@ def log_execution(logger: StructuredLogger):
                     error=str(e),
                     traceback=traceback.format_exc(),
                     execution_time=execution_time,
+                    profile_id=profile_id,
                 )
                 raise
 
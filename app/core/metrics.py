@@ -0,0 +1,170 @@
+import os
+import time
+from functools import wraps
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.core.tracing import span
+
+# Prometheus metrics shared by API and worker.
+# Celery prefork children write to PROMETHEUS_MULTIPROC_DIR (set it before the process starts);
+# the exporters below aggregate those files, otherwise the default in-process registry is used.
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+_JOB_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "agentic_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+JOB_QUEUE_WAIT = Histogram(
+    "agentic_job_queue_wait_seconds",
+    "Time from job creation to a worker starting it (created_at -> running)",
+    buckets=_JOB_BUCKETS,
+)
+AGENT_RUN_DURATION = Histogram(
+    "agentic_agent_run_duration_seconds",
+    "Agent.run wall time",
+    ["agent"],
+    buckets=_JOB_BUCKETS,
+)
+JOB_OUTCOMES = Counter(
+    "agentic_job_outcomes_total",
+    "Finished jobs by agent and outcome",
+    ["agent", "outcome"],
+)
+ROUTING_DECISIONS = Counter(
+    "agentic_routing_decisions_total",
+    "PeerAgent routing decisions",
+    ["agent", "rule"],
+)
+LLM_CALL_DURATION = Histogram(
+    "agentic_llm_call_duration_seconds",
+    "LLM call latency",
+    ["model", "outcome"],
+    buckets=_JOB_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "agentic_llm_tokens_total",
+    "LLM tokens by model and kind (prompt|completion)",
+    ["model", "kind"],
+)
+LLM_COALESCED_CALLS = Counter(
+    "agentic_llm_coalesced_calls_total",
+    "LLM calls served by an identical call already in flight",
+    ["model"],
+)
+LLM_BATCH_SIZE = Histogram(
+    "agentic_llm_batch_size",
+    "Calls per LLM micro-batch (LLM_BATCH_WINDOW_MS > 0)",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32),
+)
+WEB_REQUEST_DURATION = Histogram(
+    "agentic_web_request_duration_seconds",
+    "Outbound web latency for ContentAgent (search|fetch)",
+    ["op"],
+    buckets=_LATENCY_BUCKETS,
+)
+SEARCH_CACHE_LOOKUPS = Counter(
+    "agentic_search_cache_lookups_total",
+    "Web search cache lookups by outcome (memory|redis|negative|coalesced|miss)",
+    ["outcome"],
+)
+SEARCH_PROVIDER_CALLS = Counter(
+    "agentic_search_provider_calls_total",
+    "Search provider calls by outcome (ok|empty|error|canceled)",
+    ["provider", "outcome"],
+)
+SEARCH_HEDGES = Counter(
+    "agentic_search_hedges_total",
+    "Hedged search requests, by the provider fired as the hedge",
+    ["provider"],
+)
+WEB_CIRCUIT_TRANSITIONS = Counter(
+    "agentic_web_circuit_transitions_total",
+    "Per-host circuit breaker transitions for outbound web calls (open|closed)",
+    ["state"],
+)
+WEB_CIRCUIT_REJECTIONS = Counter(
+    "agentic_web_circuit_rejections_total",
+    "Outbound web calls skipped because the host's circuit was open",
+)
+WEB_PAGE_CACHE_LOOKUPS = Counter(
+    "agentic_web_page_cache_lookups_total",
+    "Fetched-page cache lookups by outcome (memory|redis|coalesced|revalidated|miss)",
+    ["outcome"],
+)
+MONGO_OP_DURATION = Histogram(
+    "agentic_mongo_op_duration_seconds",
+    "Mongo repository method latency",
+    ["collection", "op"],
+    buckets=_LATENCY_BUCKETS,
+)
+MONGO_POOL_OPEN = Gauge(
+    "agentic_mongo_pool_connections",
+    "Open Mongo connections in this process' pools",
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "agentic_mongo_pool_checked_out_connections",
+    "Mongo connections currently checked out (in use)",
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "agentic_mongo_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled Mongo connection",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "agentic_mongo_pool_checkout_failures_total",
+    "Failed Mongo connection checkouts by reason (timeout|connectionError|poolClosed)",
+    ["reason"],
+)
+
+
+def observe_mongo_op(func):
+    """
+    Decorator for MongoDBRepository methods: records latency labelled by collection and method name,
+    and a client span (when tracing is enabled).
+    """
+
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            with span(f"mongo.{func.__name__}", kind="client", **{"db.system": "mongodb", "db.mongodb.collection": self.collection_name}):
+                return await func(self, *args, **kwargs)
+        finally:
+            MONGO_OP_DURATION.labels(collection=self.collection_name, op=func.__name__).observe(time.perf_counter() - started)
+
+    return wrapper
+
+
+def is_multiprocess() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir"))
+
+
+def exposition_registry() -> CollectorRegistry:
+    """Registry to export: aggregated multiprocess files when enabled, else the default registry."""
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_latest() -> Tuple[bytes, str]:
+    return generate_latest(exposition_registry()), CONTENT_TYPE_LATEST
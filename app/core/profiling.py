@@ -0,0 +1,164 @@
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import random
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Tuple
+
+from app.core.config import config
+from app.schemas.profiles import ProfileKind, ProfileRecord
+
+try:  # optional: asyncio-aware wall-clock profiler
+    import yappi
+except ImportError:  # pragma: no cover - depends on the environment
+    yappi = None
+
+logger = logging.getLogger(__name__)
+
+# One capture per process at a time: both cProfile and yappi hook the interpreter globally,
+# so a second concurrent capture would either fail or mix the two. Extra requests run unprofiled.
+_CAPTURE_LOCK = threading.Lock()
+
+
+def profiler_engine() -> str:
+    """Resolved engine for PROFILE_ENGINE ("auto" prefers yappi when installed)."""
+    if config.PROFILE_ENGINE == "yappi" or (config.PROFILE_ENGINE == "auto" and yappi is not None):
+        if yappi is None:
+            logger.warning("PROFILE_ENGINE=yappi but yappi is not installed; using cProfile")
+            return "cprofile"
+        return "yappi"
+    return "cprofile"
+
+
+def should_sample(rate: float) -> bool:
+    return rate > 0 and (rate >= 1 or random.random() < rate)
+
+
+class ProfileCapture:
+    """
+    Start/stop wrapper around cProfile or yappi producing a pstats dump + text summary.
+    - cProfile: deterministic, current thread only. In the API event loop it also sees other
+      requests interleaved with the profiled one; in the worker (one job per process) it is exact.
+    - yappi: wall clock, coroutine-aware; preferred for asyncio code when installed.
+    """
+
+    def __init__(self, engine: Optional[str] = None) -> None:
+        self.engine = engine or profiler_engine()
+        self._profile: Optional[cProfile.Profile] = None
+        self._started = 0.0
+        self.duration_ms = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.engine == "yappi":
+            yappi.clear_stats()
+            yappi.set_clock_type("wall")
+            yappi.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self) -> Tuple[bytes, str]:
+        """-> (marshalled pstats, summary text)."""
+        if self.engine == "yappi":
+            yappi.stop()
+            stats = self._yappi_stats()
+        else:
+            self._profile.disable()
+            stats = pstats.Stats(self._profile)
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000.0, 3)
+
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(config.PROFILE_SUMMARY_LINES)
+        return marshal.dumps(stats.stats), out.getvalue()
+
+    @staticmethod
+    def _yappi_stats() -> pstats.Stats:
+        fd, path = tempfile.mkstemp(suffix=".pstats")
+        os.close(fd)
+        try:
+            yappi.get_func_stats().save(path, type="pstat")
+            return pstats.Stats(path)
+        finally:
+            yappi.clear_stats()
+            os.unlink(path)
+
+
+class ProfileHandle:
+    """Yielded by profiled(); profile_id is None when the capture was skipped (another one is running)."""
+
+    def __init__(self, profile_id: Optional[str]) -> None:
+        self.profile_id = profile_id
+
+
+@asynccontextmanager
+async def profiled(kind: ProfileKind, target: str, *, profile_id: Optional[str] = None) -> AsyncIterator[ProfileHandle]:
+    """
+    Profile the enclosed block and store the capture in Mongo 'profiles' (best-effort).
+
+    Usage:
+        async with profiled(ProfileKind.job, job_id) as handle:
+            await work()
+    """
+    if not _CAPTURE_LOCK.acquire(blocking=False):
+        logger.info("profiler busy; running %s %s unprofiled", kind.value, target)
+        yield ProfileHandle(None)
+        return
+
+    capture = ProfileCapture()
+    try:
+        capture.start()
+    except Exception as e:
+        # e.g. a debugger or coverage tool already owns the profiling hook
+        logger.warning("profiler failed to start for %s %s: %s", kind.value, target, e)
+        capture = None
+    if capture is None:
+        _CAPTURE_LOCK.release()
+        yield ProfileHandle(None)
+        return
+
+    handle = ProfileHandle(profile_id or f"prof_{uuid.uuid4().hex}")
+    try:
+        yield handle
+    finally:
+        try:
+            raw, summary = capture.stop()
+        finally:
+            _CAPTURE_LOCK.release()
+        # failed requests/jobs are stored too: those are often the interesting ones
+        await _store(handle.profile_id, kind, target, capture, raw, summary)
+
+
+async def _store(profile_id: str, kind: ProfileKind, target: str, capture: ProfileCapture, raw: bytes, summary: str) -> None:
+    from app.repositories.mongodb.profiles import ProfilesRepository
+
+    blob = zlib.compress(raw, 6)
+    record = ProfileRecord(
+        profile_id=profile_id,
+        kind=kind,
+        target=target,
+        engine=capture.engine,
+        duration_ms=capture.duration_ms,
+        size_bytes=len(blob),
+        summary=summary,
+        pstats=blob,
+    )
+    try:
+        await ProfilesRepository().record(record)
+    except Exception as e:
+        # profiling must never fail the profiled request/job
+        logger.warning("failed to store profile %s: %s", profile_id, e)
+
+
+def load_stats(record: ProfileRecord) -> bytes:
+    """Stored blob -> pstats file content (what pstats.Stats / snakeviz read)."""
+    return zlib.decompress(record.pstats or b"")
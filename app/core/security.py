@@ -1,5 +1,10 @@
+import hmac
+from typing import Optional
+
 from passlib.context import CryptContext
 
+from app.core.config import config
+
 # Create a password context using bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -29,3 +34,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         bool: True if the password matches the hash, False otherwise
     """
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_api_key(api_key: Optional[str]) -> bool:
+    """
+    Constant-time check of an admin API key (X-API-Key header) against config.API_KEY.
+
+    Args:
+        api_key: The key sent by the caller
+
+    Returns:
+        bool: True if the key matches
+    """
+    return bool(api_key) and hmac.compare_digest(api_key.encode("utf-8"), config.API_KEY.encode("utf-8"))
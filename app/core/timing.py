@@ -0,0 +1,93 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.tracing import span
+
+_current_timer: ContextVar[Optional["JobTimer"]] = ContextVar("job_timer", default=None)
+
+
+class JobTimer:
+    """
+    Low-overhead per-job timing breakdown (monotonic clock).
+    - stage(name, **attrs): context manager recording one span.
+    - record(name, seconds, **attrs): add an externally measured span (e.g. queue wait).
+    - as_dict(): aggregated stages + individual spans, ready to persist on JobDoc.metrics.
+
+    The timer is bound to the current context (bind()); code deeper in the call stack uses the
+    module-level timed()/record() helpers, which are no-ops when no timer is bound.
+    """
+
+    MAX_SPANS = 100
+
+    def __init__(self) -> None:
+        self._t0 = time.perf_counter()
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._spans: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def bind(self) -> Iterator["JobTimer"]:
+        token = _current_timer.set(self)
+        try:
+            yield self
+        finally:
+            _current_timer.reset(token)
+
+    @contextmanager
+    def stage(self, name: str, **attrs: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, started, time.perf_counter() - started, attrs)
+
+    def record(self, name: str, seconds: float, **attrs: Any) -> None:
+        self._add(name, None, seconds, attrs)
+
+    def _add(self, name: str, started: Optional[float], seconds: float, attrs: Dict[str, Any]) -> None:
+        ms = seconds * 1000.0
+        agg = self._stages.get(name)
+        if agg is None:
+            agg = self._stages[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        agg["count"] += 1
+        agg["total_ms"] += ms
+        agg["max_ms"] = max(agg["max_ms"], ms)
+        if len(self._spans) < self.MAX_SPANS:
+            span = {"stage": name, "ms": round(ms, 3)}
+            if started is not None:
+                span["start_ms"] = round((started - self._t0) * 1000.0, 3)
+            span.update(attrs)
+            self._spans.append(span)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round((time.perf_counter() - self._t0) * 1000.0, 3),
+            "stages": {
+                name: {"count": int(a["count"]), "total_ms": round(a["total_ms"], 3), "max_ms": round(a["max_ms"], 3)}
+                for name, a in self._stages.items()
+            },
+            "spans": list(self._spans),
+        }
+
+
+def current_timer() -> Optional[JobTimer]:
+    return _current_timer.get()
+
+
+@contextmanager
+def timed(name: str, **attrs: Any) -> Iterator[None]:
+    """Record a span on the bound JobTimer (no-op outside a job) and a tracing span (when enabled)."""
+    with span(name, **attrs):
+        timer = _current_timer.get()
+        if timer is None:
+            yield
+            return
+        with timer.stage(name, **attrs):
+            yield
+
+
+def record(name: str, seconds: float, **attrs: Any) -> None:
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.record(name, seconds, **attrs)
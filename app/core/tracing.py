@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, Mapping, MutableMapping, Optional
+
+from app.core.config import config
+
+# OpenTelemetry is optional (`pip install -e .[tracing]`). Without it, or with OTEL_ENABLED=false,
+# every helper below is a cheap no-op, so call sites never need to check.
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import SpanKind
+except ImportError:  # pragma: no cover - depends on the environment
+    propagate = trace = None
+
+logger = logging.getLogger(__name__)
+
+TRACER_NAME = "agentic_api"
+# W3C trace context keys carried in Celery message headers
+TRACE_HEADERS = ("traceparent", "tracestate")
+
+_PROVIDER = None
+
+
+def tracing_enabled() -> bool:
+    return trace is not None and config.OTEL_ENABLED
+
+
+def setup_tracing(service_name: str) -> bool:
+    """
+    Install a TracerProvider for this process (API lifespan / Celery worker_process_init).
+    - sampling: parent-based, OTEL_TRACES_SAMPLE_RATIO of new traces (workers follow the API's decision)
+    - exporter: OTEL_EXPORTER = otlp (OTLP/HTTP to OTEL_EXPORTER_OTLP_ENDPOINT) | file (JSON lines) | console
+    Returns False when tracing is disabled or the SDK is not installed.
+    """
+    global _PROVIDER
+    if not tracing_enabled() or _PROVIDER is not None:
+        return _PROVIDER is not None
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning("OTEL_ENABLED is set but opentelemetry-sdk is not installed; tracing disabled")
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name, "deployment.environment": config.APP_ENV}),
+        sampler=ParentBased(TraceIdRatioBased(config.OTEL_TRACES_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_make_exporter()))
+    trace.set_tracer_provider(provider)
+    _PROVIDER = provider
+    logger.info("tracing enabled: service=%s exporter=%s ratio=%s", service_name, config.OTEL_EXPORTER, config.OTEL_TRACES_SAMPLE_RATIO)
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans (called on API shutdown / worker process exit)."""
+    global _PROVIDER
+    if _PROVIDER is not None:
+        _PROVIDER.shutdown()
+        _PROVIDER = None
+
+
+def _make_exporter():
+    if config.OTEL_EXPORTER == "file":
+        return FileSpanExporter(config.OTEL_EXPORT_FILE)
+    if config.OTEL_EXPORTER == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+    return OTLPSpanExporter(endpoint=config.OTEL_EXPORTER_OTLP_ENDPOINT.rstrip("/") + "/v1/traces")
+
+
+class FileSpanExporter:
+    """SpanExporter writing one JSON object per span (local debugging without a collector)."""
+
+    def __init__(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans) -> Any:
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        lines = [json.dumps(json.loads(s.to_json()), separators=(",", ":")) for s in spans]
+        with self._lock, open(self._path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+# ---- spans ----
+
+
+def span(name: str, *, kind: Optional[str] = None, **attrs: Any):
+    """
+    Context manager for a child span of the current context; exceptions are recorded on the span.
+    kind: "server" | "client" | "producer" | "consumer" (default internal).
+    """
+    if not tracing_enabled():
+        return nullcontext()
+    return _span(name, kind, attrs, None)
+
+
+def span_from_headers(name: str, headers: Mapping[str, Any], *, kind: Optional[str] = "consumer", **attrs: Any):
+    """Start a span whose parent is the W3C trace context found in `headers` (Celery task / HTTP request)."""
+    if not tracing_enabled():
+        return nullcontext()
+    carrier = {k: str(headers[k]) for k in TRACE_HEADERS if headers.get(k)}
+    return _span(name, kind, attrs, propagate.extract(carrier))
+
+
+@contextmanager
+def _span(name: str, kind: Optional[str], attrs: Dict[str, Any], context) -> Iterator[Any]:
+    tracer = trace.get_tracer(TRACER_NAME)
+    span_kind = getattr(SpanKind, (kind or "internal").upper())
+    attributes = {k: v for k, v in attrs.items() if v is not None}
+    # exceptions are recorded and mark the span as error (start_as_current_span defaults)
+    with tracer.start_as_current_span(name, context=context, kind=span_kind, attributes=attributes) as s:
+        yield s
+
+
+def inject_headers(headers: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+    """Add the current W3C trace context (traceparent/tracestate) to outgoing message headers."""
+    if tracing_enabled():
+        propagate.inject(headers)
+    return headers
@@ -1,11 +1,120 @@
 import logging
+from typing import Any, Dict, Literal
 
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference, WriteConcern, monitoring
 
 from app.core.config import config
+from app.core.metrics import (
+    MONGO_POOL_CHECKED_OUT,
+    MONGO_POOL_CHECKOUT_FAILURES,
+    MONGO_POOL_CHECKOUT_WAIT,
+    MONGO_POOL_OPEN,
+)
 
 logger = logging.getLogger(__name__)
 
+# Operation classes, each with its own write concern / read preference (see config MONGO_*):
+# - "state":  job state transitions, results, webhook deliveries (must survive a primary failover)
+# - "events": log events, progress ticks, streamed partial output, profiles (cheap, loss-tolerant)
+WriteProfile = Literal["state", "events"]
+# - "primary": default reads
+# - "status":  status polls, which may tolerate a slightly stale secondary
+ReadProfile = Literal["primary", "status"]
+
+_READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+def _parse_w(value: str) -> int | str:
+    return int(value) if value.isdigit() else value
+
+
+def write_concern(profile: WriteProfile) -> WriteConcern:
+    w = config.MONGO_WRITE_CONCERN_STATE if profile == "state" else config.MONGO_WRITE_CONCERN_EVENTS
+    w = _parse_w(str(w))
+    # wtimeout only makes sense when waiting on other members
+    if w in (0, 1):
+        return WriteConcern(w=w)
+    return WriteConcern(w=w, wtimeout=config.MONGO_WRITE_TIMEOUT_MS)
+
+
+def read_preference(profile: ReadProfile):
+    if profile == "status":
+        return _READ_PREFERENCES[config.MONGO_READ_PREFERENCE_STATUS]
+    return ReadPreference.PRIMARY
+
+
+def client_options() -> Dict[str, Any]:
+    """AsyncIOMotorClient keyword arguments from config (pool, timeouts, wire compression)."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": config.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": config.MONGO_MAX_IDLE_TIME_MS,
+        "maxConnecting": config.MONGO_MAX_CONNECTING,
+        "connectTimeoutMS": config.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "appname": config.APP_NAME,
+        "event_listeners": [PoolMetricsListener()],
+    }
+    if config.MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = config.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    if config.MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = config.MONGO_SOCKET_TIMEOUT_MS
+    compressors = [c.strip() for c in config.MONGO_COMPRESSORS.split(",") if c.strip()]
+    if compressors:
+        # negotiated with the server; unsupported ones are skipped
+        options["compressors"] = compressors
+        if "zlib" in compressors:
+            options["zlibCompressionLevel"] = config.MONGO_ZLIB_COMPRESSION_LEVEL
+    return options
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Feeds the Prometheus pool gauges (open / checked out connections, checkout wait and failures)."""
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        MONGO_POOL_OPEN.inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_POOL_OPEN.dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.labels(reason=str(event.reason)).inc()
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CHECKED_OUT.inc()
+        # time spent waiting for a pooled connection (pymongo >= 4.7)
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            MONGO_POOL_CHECKOUT_WAIT.observe(duration)
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CHECKED_OUT.dec()
+
 
 class MongoDB:
     client: AsyncIOMotorClient = None
@@ -18,17 +127,21 @@ class MongoDB:
     @classmethod
     async def connect(cls):
         """Connect to MongoDB."""
-        try:
-            if cls.client is None:
-                cls.client = AsyncIOMotorClient(cls.mongodb_uri)
-                # Test the connection
-                await cls.client.admin.command("ping")
-                logger.info("Successfully connected to MongoDB")
+        if cls.client is not None:
             return cls.client
+        # assigned before the ping, so concurrent callers share one client (and one pool)
+        client = cls.client = AsyncIOMotorClient(cls.mongodb_uri, **client_options())
+        try:
+            # Test the connection
+            await client.admin.command("ping")
+            logger.info("Successfully connected to MongoDB")
+            return client
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
             # Reset client on error
-            cls.client = None
+            if cls.client is client:
+                cls.client = None
+            client.close()
             raise
 
     @classmethod
@@ -41,14 +154,13 @@ class MongoDB:
 
     @classmethod
     async def get_database(cls):
-        """Get MongoDB database instance."""
-        try:
-            if cls.client is None:
-                await cls.connect()
-            db = cls.client[config.MONGO_DB]
-            return db
-        except Exception as e:
-            logger.error(f"Failed to get database: {str(e)}")
-            # Try to reconnect
+        """Get MongoDB database instance (the driver reconnects on its own; only the first call connects)."""
+        if cls.client is None:
             await cls.connect()
-            return cls.client[config.MONGO_DB]
+        return cls.client[config.MONGO_DB]
+
+    @classmethod
+    async def get_collection(cls, name: str, *, write: WriteProfile = "state", read: ReadProfile = "primary"):
+        """Collection handle carrying the write concern / read preference of the given operation class."""
+        db = await cls.get_database()
+        return db.get_collection(name, write_concern=write_concern(write), read_preference=read_preference(read))
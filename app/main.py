@@ -2,16 +2,22 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.api.health import router as health_router
+from app.api.metrics import router as metrics_router
 from app.api.v1.router import api_router as api_router_v1
+from app.core import lifecycle
 from app.core.config import config
 from app.core.exceptions import ExceptionBase
 from app.core.logging import default_logger
+from app.core.tracing import setup_tracing, shutdown_tracing
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
 from app.middleware.rate_limit import init_limiter, rate_limit_middleware
 from app.middleware.request_id import RequestIDMiddleware
 from app.middleware.request_logging import RequestLoggingMiddleware
+from app.middleware.tracing import TracingMiddleware
 
 
 @asynccontextmanager
@@ -22,14 +28,17 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     default_logger.info("Application starting up...")
-    await init_limiter()  # Initialize rate limiter
+    setup_tracing("agentic-api")
+    await lifecycle.startup()  # open + warm Mongo/Redis/Postgres pools, ensure indexes
+    await init_limiter()  # Initialize rate limiter (shared Redis client)
 
     try:
         yield
     finally:
         # Shutdown
         default_logger.info("Application shutting down...")
-        # TODO: close the necessary connections
+        await lifecycle.shutdown()
+        shutdown_tracing()
 
 
 app = FastAPI(
@@ -46,11 +55,15 @@ app = FastAPI(
         "showCommonExtensions": True,
     },
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # middlewares
+app.add_middleware(ProfilingMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(RequestIDMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 app.middleware("http")(rate_limit_middleware)
 
 # Add CORS middleware
@@ -74,7 +87,7 @@ def http_exception_handler(request, exc: ExceptionBase):
         path=request.url.path,
         method=request.method,
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "code": exc.code,
@@ -87,3 +100,4 @@ def http_exception_handler(request, exc: ExceptionBase):
 # Include API router
 app.include_router(api_router_v1, prefix=config.APP_STR)
 app.include_router(health_router, prefix=config.APP_STR)
+app.include_router(metrics_router)
@@ -0,0 +1,28 @@
+import time
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.metrics import HTTP_REQUEST_DURATION
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware to record HTTP latency per route template (e.g. /api/v1/agent/jobs/{job_id}),
+    so path parameters do not blow up label cardinality. Unmatched paths are grouped as "unmatched".
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            if path != "/metrics":
+                HTTP_REQUEST_DURATION.labels(method=request.method, route=path, status=str(status)).observe(
+                    time.perf_counter() - start_time
+                )
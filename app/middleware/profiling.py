@@ -0,0 +1,28 @@
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import config
+from app.core.profiling import profiled
+from app.core.security import verify_api_key
+from app.schemas.profiles import ProfileKind
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware to profile a single API request on demand.
+    Requests sending `X-Profile: 1` together with a valid admin `X-API-Key` run under the profiler;
+    the capture id is returned in `X-Profile-Id` (download it from /api/v1/admin/profiles/{id}).
+    Everything else passes straight through.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if request.headers.get(config.PROFILE_HEADER, "").lower() not in ("1", "true", "yes"):
+            return await call_next(request)
+        if not verify_api_key(request.headers.get("X-API-Key")):
+            return await call_next(request)
+
+        async with profiled(ProfileKind.request, f"{request.method} {request.url.path}") as handle:
+            response = await call_next(request)
+        if handle.profile_id:
+            response.headers["X-Profile-Id"] = handle.profile_id
+        return response
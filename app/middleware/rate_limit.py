@@ -1,28 +1,19 @@
 import logging
 
-import aioredis
 from fastapi import Request, Response
 from fastapi_limiter import FastAPILimiter
 
-from app.core.config import config
+from app.cache.redis import RedisClient
 
 logger = logging.getLogger(__name__)
 
 
 async def init_limiter():
     """
-    Initialize the rate limiter
+    Initialize the rate limiter on the shared Redis client (one pool per process)
     """
     try:
-        redis_client = await aioredis.from_url(
-            config.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True,
-        )
-
-        # Test Redis connection
-        await redis_client.set("test", "test")
-        logger.info("Redis connection successful")
+        redis_client = await RedisClient.get_client()
 
         # Initialize FastAPILimiter
         FastAPILimiter.init(redis_client)
@@ -0,0 +1,29 @@
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.tracing import span_from_headers, tracing_enabled
+
+
+class TracingMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware to open a server span per request (OpenTelemetry, when enabled).
+    An incoming W3C `traceparent` is continued; the span is renamed to the route template once routing
+    has happened, and the job enqueue / worker spans become its children.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if not tracing_enabled():
+            return await call_next(request)
+
+        attrs = {"http.request.method": request.method, "url.path": request.url.path}
+        with span_from_headers(f"{request.method} {request.url.path}", request.headers, kind="server", **attrs) as s:
+            response = await call_next(request)
+            route = getattr(request.scope.get("route"), "path", None)
+            if route:
+                s.update_name(f"{request.method} {route}")
+                s.set_attribute("http.route", route)
+            s.set_attribute("http.response.status_code", response.status_code)
+            request_id = getattr(request.state, "request_id", None)
+            if request_id:
+                s.set_attribute("request.id", request_id)
+            return response
@@ -0,0 +1,125 @@
+import re
+import zlib
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np  # optional extra "ml"; only imported when ROUTER_BACKEND=ml (see PeerAgent)
+
+AGENTS = ("content", "code")  # label index: 0 = content, 1 = code (predict_proba returns P(code))
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]{2,}", flags=re.UNICODE)
+_MAX_CHARS = 2000  # long tasks: the head carries the intent, the tail is usually pasted material
+
+
+def features(text: str) -> List[str]:
+    """Word unigrams/bigrams + character 3/4-grams (catch ``` , c++, suffixes of Turkish words)."""
+    t = " ".join(text.lower().split())[:_MAX_CHARS]
+    words = _WORD_RE.findall(t)
+    feats = [f"w:{w}" for w in words]
+    feats += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    padded = f" {t} "
+    for n in (3, 4):
+        feats += [f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1)]
+    return feats
+
+
+@dataclass
+class SparseBatch:
+    """CSR-like batch as flat (row, col, value) arrays; rows are L2 normalized."""
+
+    rows: np.ndarray
+    cols: np.ndarray
+    vals: np.ndarray
+    n: int
+
+
+class HashedNgramRouter:
+    """
+    Binary code/content classifier: hashed n-gram features (signed hashing trick) + logistic regression,
+    in plain NumPy. Scoring a batch is a handful of vectorized ops over the flat feature arrays, so bulk
+    routing costs about the same per task as a single call. Trained offline (app/peer/train_router.py).
+    """
+
+    def __init__(self, dim: int = 1 << 18) -> None:
+        self.dim = int(dim)
+        self.w = np.zeros(self.dim, dtype=np.float32)
+        self.b = 0.0
+
+    # ---- features ----
+
+    def vectorize(self, texts: Sequence[str]) -> SparseBatch:
+        rows: List[int] = []
+        hashes: List[int] = []
+        for i, text in enumerate(texts):
+            feats = features(text)
+            rows.extend([i] * len(feats))
+            hashes.extend(zlib.crc32(f.encode("utf-8")) for f in feats)
+        h = np.asarray(hashes, dtype=np.uint64)
+        r = np.asarray(rows, dtype=np.int64)
+        cols = (h % self.dim).astype(np.int64)
+        signs = np.where((h >> np.uint64(31)) & np.uint64(1), -1.0, 1.0)
+
+        # merge duplicate (row, col) pairs, then L2 normalize each row
+        keys, inverse = np.unique(r * self.dim + cols, return_inverse=True)
+        vals = np.bincount(inverse, weights=signs, minlength=len(keys))
+        rows_u, cols_u = keys // self.dim, keys % self.dim
+        norms = np.sqrt(np.bincount(rows_u, weights=vals * vals, minlength=len(texts)))
+        vals = vals / np.maximum(norms[rows_u], 1e-12)
+        return SparseBatch(rows_u, cols_u, vals.astype(np.float32), len(texts))
+
+    # ---- inference ----
+
+    def _logits(self, batch: SparseBatch) -> np.ndarray:
+        return np.bincount(batch.rows, weights=self.w[batch.cols] * batch.vals, minlength=batch.n) + self.b
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """P(code) per text."""
+        if not texts:
+            return np.zeros(0)
+        return 1.0 / (1.0 + np.exp(-self._logits(self.vectorize(texts))))
+
+    # ---- training ----
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        *,
+        epochs: int = 20,
+        batch_size: int = 256,
+        lr: float = 0.5,
+        l2: float = 1e-6,
+        seed: int = 0,
+    ) -> "HashedNgramRouter":
+        """Mini-batch AdaGrad on the logistic loss; labels are agent names ("code" | "content")."""
+        y_all = np.asarray([AGENTS.index(a) for a in labels], dtype=np.float64)
+        rng = np.random.default_rng(seed)
+        grad_sq = np.full(self.dim, 1e-8)
+        b_grad_sq = 1e-8
+        for _ in range(epochs):
+            order = rng.permutation(len(texts))
+            for start in range(0, len(order), batch_size):
+                idx = order[start : start + batch_size]
+                batch = self.vectorize([texts[i] for i in idx])
+                err = 1.0 / (1.0 + np.exp(-self._logits(batch))) - y_all[idx]
+                grad = np.bincount(batch.cols, weights=batch.vals * err[batch.rows], minlength=self.dim) / len(idx)
+                grad += l2 * self.w
+                grad_sq += grad * grad
+                self.w -= (lr * grad / np.sqrt(grad_sq)).astype(np.float32)
+                b_grad = float(err.mean())
+                b_grad_sq += b_grad * b_grad
+                self.b -= lr * b_grad / np.sqrt(b_grad_sq)
+        return self
+
+    # ---- persistence ----
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, w=self.w, b=np.float64(self.b), dim=np.int64(self.dim))
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNgramRouter":
+        with np.load(path) as data:
+            router = cls(dim=int(data["dim"]))
+            router.w = data["w"].astype(np.float32)
+            router.b = float(data["b"])
+        return router
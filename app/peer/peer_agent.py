@@ -1,12 +1,91 @@
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+from app.cache.memory import TTLCache
+from app.core.config import config
+from app.core.metrics import ROUTING_DECISIONS
 from app.peer.rules import _score
 
+logger = logging.getLogger(__name__)
+
+# task_hash -> (decision, rule); decide() is pure, so resubmitted/retried tasks skip the scoring
+_DECISIONS: TTLCache[Tuple[dict, str]] = TTLCache(config.ROUTING_CACHE_SIZE, config.ROUTING_CACHE_TTL_S)
+
+_ROUTER = None
+_ROUTER_LOADED = False
+
+
+def load_router():
+    """
+    The ML router when ROUTER_BACKEND=ml (loaded once per process), else None.
+    A missing model file or missing numpy (extra "ml") logs a warning and keeps the rules.
+    """
+    global _ROUTER, _ROUTER_LOADED
+    if config.ROUTER_BACKEND != "ml":
+        return None
+    if not _ROUTER_LOADED:
+        _ROUTER_LOADED = True
+        try:
+            from app.peer.ml_router import HashedNgramRouter
+
+            _ROUTER = HashedNgramRouter.load(config.ROUTER_MODEL_PATH)
+            logger.info("ML router loaded from %s", config.ROUTER_MODEL_PATH)
+        except (ImportError, OSError, KeyError, ValueError) as e:
+            logger.warning("ROUTER_BACKEND=ml but the model could not be loaded (%s); routing with rules", e)
+    return _ROUTER
+
 
 class PeerAgent:
     @staticmethod
-    def decide(task: str) -> dict:
+    def decide(task: str, *, task_hash: Optional[str] = None) -> dict:
+        """Route a task to "code" or "content". With `task_hash` the decision is memoized (bounded LRU)."""
+        return PeerAgent.decide_many([task], task_hashes=[task_hash])[0]
+
+    @staticmethod
+    def decide_many(tasks: Sequence[str], *, task_hashes: Optional[Sequence[Optional[str]]] = None) -> List[dict]:
+        """Batch routing: memo hits are reused, the misses are scored in one vectorized ML call (or by rules)."""
+        hashes = list(task_hashes) if task_hashes is not None else [None] * len(tasks)
+        out: List[Optional[Tuple[dict, str]]] = [_DECISIONS.get(h) if h else None for h in hashes]
+        misses = [i for i, hit in enumerate(out) if hit is None]
+        if misses:
+            for i, decided in zip(misses, PeerAgent._decide_batch([tasks[i] for i in misses])):
+                out[i] = decided
+                if hashes[i]:
+                    _DECISIONS.set(hashes[i], decided)
+
+        decisions = []
+        for decision, rule in out:
+            ROUTING_DECISIONS.labels(agent=decision["agent"], rule=rule).inc()
+            decisions.append(dict(decision))
+        return decisions
+
+    @staticmethod
+    def _decide_batch(tasks: List[str]) -> List[Tuple[dict, str]]:
+        router = load_router()
+        if router is None:
+            return [PeerAgent._decide(t) for t in tasks]
+
+        decided = []
+        for task, p_code in zip(tasks, router.predict_proba(tasks)):
+            confidence = max(p_code, 1.0 - p_code)
+            if confidence >= config.ROUTER_ML_MIN_CONFIDENCE:
+                agent = "code" if p_code >= 0.5 else "content"
+                decided.append(({"agent": agent, "reason": f"ml: p_code={p_code:.3f}"}, "ml"))
+            else:
+                # not sure: the rules decide (and their content fallback still applies)
+                decided.append(PeerAgent._decide(task))
+        return decided
+
+    @staticmethod
+    def _decide(task: str) -> Tuple[dict, str]:
         code, content, breakdown = _score(task)
         if code >= 2 and code > content:
-            return {"agent": "code", "reason": f"rules: code_signals={breakdown}"}
-        if content >= 1 and content >= code:
-            return {"agent": "content", "reason": f"rules: content_signals={breakdown}"}
-        return {"agent": "content", "reason": f"fallback_content: signals={breakdown}"}
+            decision = {"agent": "code", "reason": f"rules: code_signals={breakdown}"}
+            rule = "rules"
+        elif content >= 1 and content >= code:
+            decision = {"agent": "content", "reason": f"rules: content_signals={breakdown}"}
+            rule = "rules"
+        else:
+            decision = {"agent": "content", "reason": f"fallback_content: signals={breakdown}"}
+            rule = "fallback"
+        return decision, rule
@@ -1,5 +1,5 @@
 import re
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 # Language tokens / abbreviations
 LANG_TOKENS = r"(python|javascript|typescript|js|ts|java|go|golang|rust|c\+\+|c#|ruby|php)"
@@ -55,18 +55,29 @@ CO_OCCUR = re.compile(
 )
 
 
+def _compile(patterns: List[str]) -> List[re.Pattern]:
+    return [re.compile(p, flags=re.IGNORECASE) for p in patterns]
+
+
+# compiled once at import (API startup / worker boot) instead of going through re's cache per call
+_CODE_RES = _compile(CODE_PATTERNS)
+_CONTENT_RES = _compile(CONTENT_PATTERNS)
+_HARD_CODE_RES = _compile(HARD_CODE)
+_HARD_CONTENT_RES = _compile(HARD_CONTENT)
+
+
 def _score(text: str) -> Tuple[int, int, Dict]:
     t = text.lower()
 
     def count(ps):
-        return sum(1 for p in ps if re.search(p, t, flags=re.IGNORECASE))
+        return sum(1 for p in ps if p.search(t))
 
-    code = count(CODE_PATTERNS)
-    content = count(CONTENT_PATTERNS)
+    code = count(_CODE_RES)
+    content = count(_CONTENT_RES)
 
-    if any(re.search(p, t, flags=re.IGNORECASE) for p in HARD_CODE):
+    if any(p.search(t) for p in _HARD_CODE_RES):
         code += 2
-    if any(re.search(p, t, flags=re.IGNORECASE) for p in HARD_CONTENT):
+    if any(p.search(t) for p in _HARD_CONTENT_RES):
         content += 2
     if CO_OCCUR.search(t):
         code += 2  # "js + example", "python + code" etc.
@@ -0,0 +1,130 @@
+"""
+Train the ML router (ROUTER_BACKEND=ml) from past routing decisions.
+
+Labels come from the `route_decision` log events joined with the job's task. By default only rule decisions
+(reason "rules: ...") are used: content-fallback decisions are "no signal" rather than a real label, and
+decisions made by the ML router itself ("ml: ...") would feed its own mistakes back as labels.
+
+Usage (env as for the app, e.g. `set -a; . ./.env.example; set +a`; needs the "ml" extra):
+    python -m app.peer.train_router --out models/router.npz
+    python -m app.peer.train_router --export routes.jsonl          # dump the dataset only
+    python -m app.peer.train_router --from-jsonl routes.jsonl --out models/router.npz
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+from typing import List, Tuple
+
+from app.core.config import config
+from app.peer.ml_router import AGENTS, HashedNgramRouter
+
+Example = Tuple[str, str]  # (task, agent)
+
+
+def is_training_label(reason: str, *, include_fallback: bool = False, include_model: bool = False) -> bool:
+    """Whether a route decision with this reason is used as a training label."""
+    if reason.startswith("rules:"):
+        return True
+    if reason.startswith("fallback"):
+        return include_fallback
+    return include_model
+
+
+async def load_from_mongo(limit: int, include_fallback: bool, include_model: bool) -> List[Example]:
+    from app.db.mongodb.mongodb import MongoDB
+
+    db = await MongoDB.get_database()
+    try:
+        labels = {}
+        cursor = db["log_events"].find({"type": "route_decision"}, {"job_id": 1, "payload": 1}).sort("_id", -1).limit(limit)
+        async for ev in cursor:
+            payload = ev.get("payload") or {}
+            if payload.get("agent") not in AGENTS:
+                continue
+            if not is_training_label(str(payload.get("reason", "")), include_fallback=include_fallback, include_model=include_model):
+                continue
+            # newest decision per job wins (a re-route after a retry supersedes the first one)
+            labels.setdefault(ev["job_id"], payload["agent"])
+
+        examples: List[Example] = []
+        ids = list(labels)
+        for start in range(0, len(ids), 1000):
+            async for job in db["jobs"].find({"_id": {"$in": ids[start : start + 1000]}}, {"task": 1}):
+                if job.get("task"):
+                    examples.append((job["task"], labels[job["_id"]]))
+        return examples
+    finally:
+        await MongoDB.close()
+
+
+def load_jsonl(path: str) -> List[Example]:
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [(r["task"], r["agent"]) for r in rows if r.get("agent") in AGENTS]
+
+
+def evaluate(router: HashedNgramRouter, examples: List[Example], min_confidence: float) -> dict:
+    """Holdout accuracy overall and on the confident share (the rest falls back to the rules)."""
+    if not examples:
+        return {"n": 0}
+    probs = router.predict_proba([t for t, _ in examples])
+    correct = confident = confident_correct = 0
+    for (_, agent), p in zip(examples, probs):
+        ok = (p >= 0.5) == (agent == "code")
+        correct += ok
+        if max(p, 1.0 - p) >= min_confidence:
+            confident += 1
+            confident_correct += ok
+    return {
+        "n": len(examples),
+        "accuracy": round(correct / len(examples), 4),
+        "confident_share": round(confident / len(examples), 4),
+        "confident_accuracy": round(confident_correct / confident, 4) if confident else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--from-jsonl", help="read {task, agent} rows instead of Mongo")
+    parser.add_argument("--export", help="write the dataset as jsonl and exit")
+    parser.add_argument("--out", default=config.ROUTER_MODEL_PATH)
+    parser.add_argument("--limit", type=int, default=200_000, help="newest route decisions to read from Mongo")
+    parser.add_argument("--include-fallback", action="store_true", help="also use content-fallback decisions")
+    parser.add_argument("--include-model-decisions", action="store_true", help="also use decisions made by the ML router (self-training)")
+    parser.add_argument("--holdout", type=float, default=0.1)
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--dim", type=int, default=1 << 18)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.from_jsonl:
+        examples = load_jsonl(args.from_jsonl)
+    else:
+        examples = asyncio.run(load_from_mongo(args.limit, args.include_fallback, args.include_model_decisions))
+    if not examples:
+        raise SystemExit("no labelled routing decisions found")
+
+    if args.export:
+        with open(args.export, "w", encoding="utf-8") as f:
+            for task, agent in examples:
+                f.write(json.dumps({"task": task, "agent": agent}, ensure_ascii=False) + "\n")
+        print(f"exported {len(examples)} examples to {args.export}")
+        return
+
+    random.Random(args.seed).shuffle(examples)
+    n_test = int(len(examples) * args.holdout)
+    test, train = examples[:n_test], examples[n_test:]
+    router = HashedNgramRouter(dim=args.dim).fit([t for t, _ in train], [a for _, a in train], epochs=args.epochs, seed=args.seed)
+    print(json.dumps({"train": len(train), "holdout": evaluate(router, test, config.ROUTER_ML_MIN_CONFIDENCE)}))
+
+    if os.path.dirname(args.out):
+        os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    router.save(args.out)
+    print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,8 @@ from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
 
 from pydantic import BaseModel
 
-from app.db.mongodb.mongodb import MongoDB
+from app.core.metrics import observe_mongo_op
+from app.db.mongodb.mongodb import MongoDB, ReadProfile, WriteProfile
 from app.repositories.interfaces.base import IRepository
 
 T = TypeVar("T", bound=BaseModel)
@@ -22,10 +23,13 @@ class MongoDBRepository(IRepository[T]):
         to_mongo: Optional[Callable[[T | Dict[str, Any]], Dict[str, Any]]] = None,
         from_mongo: Optional[Callable[[Dict[str, Any]], T]] = None,
         id_field: str = "_id",
+        write_profile: WriteProfile = "state",
     ):
         self.model = model
         self.collection_name = collection_name
         self.collection = None
+        self.write_profile = write_profile
+        self._collections: Dict[tuple, Any] = {}
         self.logger = logging.getLogger(__name__)
         self._to_mongo = to_mongo
         self._from_mongo = from_mongo
@@ -33,14 +37,20 @@ class MongoDBRepository(IRepository[T]):
 
     # ---------- helpers ----------
 
-    async def _get_collection(self):
-        """Get MongoDB collection (lazy)."""
+    async def _get_collection(self, *, write: Optional[WriteProfile] = None, read: ReadProfile = "primary"):
+        """
+        Get MongoDB collection (lazy). The default handle uses the repository's write profile;
+        `write`/`read` select another operation class (e.g. write="events" for progress ticks).
+        """
+        key = (write or self.write_profile, read)
         try:
-            if self.collection is None:
-                db = await MongoDB.get_database()
-                self.collection = db[self.collection_name]
-                self.logger.info("Connected to collection: %s", self.collection_name)
-            return self.collection
+            coll = self._collections.get(key)
+            if coll is None:
+                coll = self._collections[key] = await MongoDB.get_collection(self.collection_name, write=key[0], read=key[1])
+                if self.collection is None:
+                    self.collection = coll
+                    self.logger.info("Connected to collection: %s", self.collection_name)
+            return coll
         except Exception as e:
             self._raise("Failed to get collection %s: %s", self.collection_name, e)
 
@@ -71,6 +81,7 @@ class MongoDBRepository(IRepository[T]):
 
     # ---------- IRepository impl ----------
 
+    @observe_mongo_op
     async def create(self, obj_in: Dict[str, Any] | T) -> T:
         """Create a new record in MongoDB."""
         try:
@@ -85,6 +96,7 @@ class MongoDBRepository(IRepository[T]):
         except Exception as e:
             self._raise("Failed to create record: %s", e)
 
+    @observe_mongo_op
     async def get(self, id: Any) -> Optional[T]:
         """Get a single record by id."""
         try:
@@ -94,6 +106,7 @@ class MongoDBRepository(IRepository[T]):
         except Exception as e:
             self._raise("Failed to get record: %s", e)
 
+    @observe_mongo_op
     async def get_multi(
         self,
         *,
@@ -118,6 +131,7 @@ class MongoDBRepository(IRepository[T]):
         except Exception as e:
             self._raise("Failed to get multiple records: %s", e)
 
+    @observe_mongo_op
     async def update(self, id: Any, obj_in: dict) -> Optional[T]:
         """Update a record (partial)."""
         try:
@@ -128,6 +142,7 @@ class MongoDBRepository(IRepository[T]):
         except Exception as e:
             self._raise("Failed to update record: %s", e)
 
+    @observe_mongo_op
     async def delete(self, id: Any) -> bool:
         """Delete a record."""
         try:
@@ -137,6 +152,7 @@ class MongoDBRepository(IRepository[T]):
         except Exception as e:
             self._raise("Failed to delete record: %s", e)
 
+    @observe_mongo_op
     async def exists(self, **filters: Any) -> bool:
         """Check if a record exists with given filters (efficient)."""
         try:
@@ -146,6 +162,7 @@ class MongoDBRepository(IRepository[T]):
         except Exception as e:
             self._raise("Failed to check record existence: %s", e)
 
+    @observe_mongo_op
     async def filter_one(self, **filters: Any) -> Optional[T]:
         """Filter records with given filters."""
         try:
@@ -0,0 +1,55 @@
+from typing import Optional
+
+from app.repositories.mongodb.base import MongoDBRepository
+from app.repositories.mongodb.jobs import TERMINAL_JOB_TTL_S
+from app.schemas.jobs import JobResultBlob
+
+
+class JobResultsRepository(MongoDBRepository[JobResultBlob]):
+    """
+    Repository for Mongo 'job_results' collection: compressed results too large to keep inline in 'jobs'.
+    _id <-> blob_id mapping; jobs reference their blob through job.result_ref.blob_id.
+    """
+
+    def __init__(self, collection_name: str = "job_results") -> None:
+        super().__init__(
+            model=JobResultBlob,
+            collection_name=collection_name,
+            to_mongo=self._to_mongo,
+            from_mongo=self._from_mongo,
+            id_field="_id",
+        )
+
+    # ------------- mapping helpers -------------
+
+    @staticmethod
+    def _to_mongo(obj: JobResultBlob | dict) -> dict:
+        d = obj.model_dump() if isinstance(obj, JobResultBlob) else dict(obj)
+        if "blob_id" in d:
+            d["_id"] = d.pop("blob_id")
+        return d
+
+    @staticmethod
+    def _from_mongo(doc: dict) -> JobResultBlob:
+        d = dict(doc)
+        if "_id" in d:
+            d["blob_id"] = str(d.pop("_id"))
+        return JobResultBlob.model_validate(d)
+
+    # ------------- domain methods -------------
+
+    async def put(self, blob: JobResultBlob) -> str:
+        created = await self.create(blob)
+        return created.blob_id
+
+    async def get_blob(self, blob_id: str) -> Optional[JobResultBlob]:
+        return await self.get(blob_id)
+
+    # ------------- indexes (optional helper) -------------
+
+    @staticmethod
+    async def ensure_indexes(db) -> None:
+        results = db.get_collection("job_results")
+        await results.create_index([("job_id", 1)], name="job_id")
+        # a blob is written right before its job turns terminal, so it expires together with the job
+        await results.create_index([("created_at", 1)], name="ttl_48h", expireAfterSeconds=TERMINAL_JOB_TTL_S)
@@ -1,8 +1,13 @@
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.metrics import observe_mongo_op
+from app.db.mongodb.mongodb import ReadProfile
 from app.repositories.mongodb.base import MongoDBRepository
-from app.schemas.jobs import JobDoc, JobError, JobResult, JobStatusEnum
+from app.schemas.jobs import JobDoc, JobError, JobResult, JobResultRef, JobStatusEnum
 
 # State machine rules
 ALLOWED_TRANSITIONS = {
@@ -13,6 +18,9 @@ ALLOWED_TRANSITIONS = {
     JobStatusEnum.canceled: set(),
 }
 
+# terminal jobs (and their offloaded result blobs in 'job_results') are kept for 48h
+TERMINAL_JOB_TTL_S = 48 * 3600
+
 
 def _now() -> datetime:
     return datetime.now(timezone.utc)
@@ -25,7 +33,11 @@ class JobsRepository(MongoDBRepository[JobDoc]):
     Notes:
     - _id field is mapped to string 'job_id'.
     - transition/succeed/fail atomic updates.
-    - succeed/fail only happens when status is queued|running (race condition protection).
+    - succeed/fail/cancel only happens when status is queued|running (race condition protection).
+    - state changes use the "state" write concern (MONGO_WRITE_CONCERN_STATE); progress and streamed
+      partial output are frequent and superseded by the final update, so they use the "events" one.
+    - running jobs hold a lease (lease_owner, lease_expires_at) renewed by the worker heartbeat;
+      reap_expired() requeues or fails jobs whose lease ran out (dead worker).
     """
 
     def __init__(self, collection_name: str = "jobs") -> None:
@@ -82,9 +94,43 @@ class JobsRepository(MongoDBRepository[JobDoc]):
         created = await self.create(job)
         return created.job_id  # type: ignore[return-value]
 
-    async def get_by_idempotency(self, idempotency_key: str, task_hash: str) -> Optional[JobDoc]:
-        return await self.filter_one(idempotency_key=idempotency_key, task_hash=task_hash)
+    # heavy fields left out of reads that do not need them (status polls, idempotency lookups)
+    HEAVY_FIELDS = ("result", "metrics", "partial_output")
+
+    @observe_mongo_op
+    async def get_light(self, job_id: str, *, include: Tuple[str, ...] = (), read: ReadProfile = "primary") -> Optional[JobDoc]:
+        """Job without HEAVY_FIELDS, except those named in `include`."""
+        coll = await self._get_collection(read=read)
+        projection = {f: 0 for f in self.HEAVY_FIELDS if f not in include}
+        doc = await coll.find_one({"_id": job_id}, projection=projection or None)
+        return self._from_mongo(doc) if doc else None
+
+    @observe_mongo_op
+    async def create_or_get_by_idempotency(self, job: JobDoc) -> Tuple[JobDoc, bool]:
+        """
+        Idempotent insert in one round trip: an upsert on (idempotency_key, task_hash) that either inserts
+        `job` or returns the job already holding the key (heavy fields left out). Returns (job, created).
+        """
+        coll = await self._get_collection()
+        doc = self._to_mongo(job)
+        filt = {"idempotency_key": doc.pop("idempotency_key"), "task_hash": doc.pop("task_hash")}
+        try:
+            found = await self._upsert_idempotent(coll, filt, doc)
+        except DuplicateKeyError:
+            # two concurrent upserts on a new key: uniq_idem_task lets one insert; the other now matches it
+            found = await self._upsert_idempotent(coll, filt, doc)
+        return self._from_mongo(found), found["_id"] == doc["_id"]
 
+    async def _upsert_idempotent(self, coll, filt: dict, doc: dict) -> dict:
+        return await coll.find_one_and_update(
+            filt,
+            {"$setOnInsert": doc},
+            upsert=True,
+            projection={f: 0 for f in self.HEAVY_FIELDS},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    @observe_mongo_op
     async def transition(
         self,
         job_id: str,
@@ -107,6 +153,7 @@ class JobsRepository(MongoDBRepository[JobDoc]):
         res = await coll.update_one(filt, {"$set": {"status": to.value, "updated_at": _now()}})
         return res.modified_count == 1
 
+    @observe_mongo_op
     async def set_decision(self, job_id: str, *, agent: str, reason: str) -> None:
         coll = await self._get_collection()
         await coll.update_one(
@@ -114,49 +161,194 @@ class JobsRepository(MongoDBRepository[JobDoc]):
             {"$set": {"decided_agent": agent, "reason": reason, "updated_at": _now()}},
         )
 
+    @observe_mongo_op
     async def progress(self, job_id: str, value: float) -> None:
         v = max(0.0, min(1.0, float(value)))
-        coll = await self._get_collection()
-        await coll.update_one({"_id": job_id}, {"$set": {"progress": v, "updated_at": _now()}})
+        coll = await self._get_collection(write="events")
+        # only while running: a late tick must not overwrite the final progress written by succeed()
+        await coll.update_one({"_id": job_id, "status": JobStatusEnum.running.value}, {"$set": {"progress": v, "updated_at": _now()}})
 
-    async def set_attempts_inc(self, job_id: str, by: int = 1) -> None:
-        coll = await self._get_collection()
-        await coll.update_one({"_id": job_id}, {"$inc": {"attempts": int(by)}, "$set": {"updated_at": _now()}})
+    @observe_mongo_op
+    async def set_partial_output(self, job_id: str, text: str) -> None:
+        """Streamed LLM text (only while running, so a late flush never lands on a finished job)."""
+        coll = await self._get_collection(write="events")
+        await coll.update_one(
+            {"_id": job_id, "status": JobStatusEnum.running.value},
+            {"$set": {"partial_output": text, "updated_at": _now()}},
+        )
+
+    @staticmethod
+    def _terminal_filter(job_id: str, lease_owner: Optional[str]) -> dict:
+        filt = {"_id": job_id, "status": {"$in": [JobStatusEnum.queued.value, JobStatusEnum.running.value]}}
+        if lease_owner:
+            # a worker that lost its lease (job reaped and picked up elsewhere) must not write the outcome
+            filt["lease_owner"] = lease_owner
+        return filt
 
-    async def succeed(self, job_id: str, result: JobResult) -> bool:
+    @observe_mongo_op
+    async def succeed(
+        self,
+        job_id: str,
+        result: Optional[JobResult],
+        *,
+        result_ref: Optional[JobResultRef] = None,
+        lease_owner: Optional[str] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+    ) -> bool:
         """
-        queued|running -> succeeded
+        queued|running -> succeeded, progress 1.0 (timing breakdown, if given, is written in the same update)
+        Either the inline `result` or the `result_ref` of an offloaded one (see ResultStore).
         """
 
-        payload = result.model_dump(mode="json")
+        fields = {
+            "status": JobStatusEnum.succeeded.value,
+            "progress": 1.0,
+            "result": result.model_dump(mode="json") if result else None,
+            "result_ref": result_ref.model_dump() if result_ref else None,
+            "error": None,
+            "updated_at": _now(),
+        }
+        if metrics is not None:
+            fields["metrics"] = metrics
 
         coll = await self._get_collection()
         res = await coll.update_one(
-            {"_id": job_id, "status": {"$in": [JobStatusEnum.queued.value, JobStatusEnum.running.value]}},
+            self._terminal_filter(job_id, lease_owner),
             {
-                "$set": {
-                    "status": JobStatusEnum.succeeded.value,
-                    "result": payload,
-                    "error": None,
-                    "updated_at": _now(),
-                }
+                "$set": fields,
+                "$unset": {"lease_expires_at": "", "partial_output": ""},
             },
         )
         return res.modified_count == 1
 
-    async def fail(self, job_id: str, error: JobError) -> bool:
+    @observe_mongo_op
+    async def fail(
+        self, job_id: str, error: JobError, *, lease_owner: Optional[str] = None, metrics: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """
         queued|running -> failed
         """
         payload = error.model_dump(mode="json")
+        fields = {"status": JobStatusEnum.failed.value, "error": payload, "updated_at": _now()}
+        if metrics is not None:
+            fields["metrics"] = metrics
 
         coll = await self._get_collection()
         res = await coll.update_one(
-            {"_id": job_id, "status": {"$in": [JobStatusEnum.queued.value, JobStatusEnum.running.value]}},
-            {"$set": {"status": JobStatusEnum.failed.value, "error": payload, "updated_at": _now()}},
+            self._terminal_filter(job_id, lease_owner),
+            {
+                "$set": fields,
+                "$unset": {"lease_expires_at": "", "partial_output": ""},
+            },
+        )
+        return res.modified_count == 1
+
+    # ------------- leases -------------
+
+    @observe_mongo_op
+    async def claim(self, job_id: str, *, owner: str, ttl_s: int) -> Optional[JobDoc]:
+        """
+        Claim-and-load in one round trip: lease the job to `owner`, count the attempt and return the
+        job (heavy fields left out). Claimable when
+          queued -> running, or
+          running with an expired lease -> running (redelivered message after a worker died).
+        Returns None when the job is missing, terminal or leased by a live worker.
+        """
+        now = _now()
+        coll = await self._get_collection()
+        doc = await coll.find_one_and_update(
+            {
+                "_id": job_id,
+                "$or": [
+                    {"status": JobStatusEnum.queued.value},
+                    {"status": JobStatusEnum.running.value, "lease_expires_at": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": JobStatusEnum.running.value,
+                    "lease_owner": owner,
+                    "lease_expires_at": now + timedelta(seconds=ttl_s),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            projection={f: 0 for f in self.HEAVY_FIELDS},
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._from_mongo(doc) if doc else None
+
+    @observe_mongo_op
+    async def renew_lease(self, job_id: str, *, owner: str, ttl_s: int) -> bool:
+        """Heartbeat. False means the lease is gone (job canceled, finished or reaped)."""
+        now = _now()
+        coll = await self._get_collection()
+        res = await coll.update_one(
+            {"_id": job_id, "status": JobStatusEnum.running.value, "lease_owner": owner},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=ttl_s), "updated_at": now}},
         )
         return res.modified_count == 1
 
+    @observe_mongo_op
+    async def reap_expired(self, *, ttl_s: int, max_attempts: int, limit: int = 100) -> Tuple[List[JobDoc], List[JobDoc]]:
+        """
+        Find running jobs whose lease expired and either requeue them (attempts < max_attempts) or fail them.
+        Candidates come from the status_updated index (heartbeats bump updated_at); each job is then
+        moved with a guarded atomic update so concurrent reapers/workers cannot double-handle it.
+        Returns: (requeued jobs, failed jobs)
+        """
+        now = _now()
+        coll = await self._get_collection()
+        cursor = coll.find(
+            {
+                "status": JobStatusEnum.running.value,
+                "updated_at": {"$lt": now - timedelta(seconds=ttl_s)},
+                "$or": [{"lease_expires_at": {"$lt": now}}, {"lease_expires_at": None}],
+            },
+            projection={"_id": 1, "attempts": 1},
+            hint="status_updated",
+            limit=int(limit),
+        )
+
+        requeued: List[JobDoc] = []
+        failed: List[JobDoc] = []
+        async for doc in cursor:
+            guard = {"_id": doc["_id"], "status": JobStatusEnum.running.value, "updated_at": {"$lt": now - timedelta(seconds=ttl_s)}}
+            if int(doc.get("attempts") or 0) < max_attempts:
+                update = {
+                    "$set": {"status": JobStatusEnum.queued.value, "updated_at": now},
+                    "$unset": {"lease_owner": "", "lease_expires_at": ""},
+                }
+                bucket = requeued
+            else:
+                err = JobError(code="lease_expired", message="Worker lease expired too many times", retryable=True)
+                update = {
+                    "$set": {"status": JobStatusEnum.failed.value, "error": err.model_dump(mode="json"), "updated_at": now},
+                    "$unset": {"lease_expires_at": ""},
+                }
+                bucket = failed
+            updated = await coll.find_one_and_update(guard, update, projection={"result": 0}, return_document=ReturnDocument.AFTER)
+            if updated:
+                bucket.append(self._from_mongo(updated))
+        return requeued, failed
+
+    @observe_mongo_op
+    async def cancel(self, job_id: str) -> Optional[JobStatusEnum]:
+        """
+        queued|running -> canceled (atomic).
+        Returns the status the job had before cancel, or None if it was already terminal/missing.
+        """
+        coll = await self._get_collection()
+        prev = await coll.find_one_and_update(
+            {"_id": job_id, "status": {"$in": [JobStatusEnum.queued.value, JobStatusEnum.running.value]}},
+            {"$set": {"status": JobStatusEnum.canceled.value, "updated_at": _now()}},
+            projection={"status": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if not prev:
+            return None
+        return JobStatusEnum(prev["status"])
+
     # ------------- indexes (optional helper) -------------
 
     @staticmethod
@@ -174,6 +366,6 @@ class JobsRepository(MongoDBRepository[JobDoc]):
         await jobs.create_index(
             [("updated_at", 1)],
             name="ttl_48h_terminal",
-            expireAfterSeconds=172800,
+            expireAfterSeconds=TERMINAL_JOB_TTL_S,
             partialFilterExpression={"status": {"$in": ["succeeded", "failed", "canceled"]}},
         )
@@ -1,5 +1,6 @@
 from typing import List
 
+from app.core.metrics import observe_mongo_op
 from app.repositories.mongodb.base import MongoDBRepository
 from app.schemas.logs import LogEvent
 
@@ -17,6 +18,7 @@ class LogEventsRepository(MongoDBRepository[LogEvent]):
             to_mongo=self._to_mongo,
             from_mongo=self._from_mongo,
             id_field="_id",
+            write_profile="events",
         )
 
     # ------------- mapping helpers -------------
@@ -51,6 +53,14 @@ class LogEventsRepository(MongoDBRepository[LogEvent]):
         # event_id mapping from _from_mongo
         return created.event_id or ""  # type: ignore[return-value]
 
+    @observe_mongo_op
+    async def push_many(self, events: List[LogEvent]) -> None:
+        """Several events in one ordered insert (one round trip)."""
+        if not events:
+            return
+        coll = await self._get_collection()
+        await coll.insert_many([self._to_mongo(e) for e in events], ordered=True)
+
     async def list_by_job(self, job_id: str, limit: int = 200) -> List[LogEvent]:
         return await self.get_multi(
             limit=int(limit),
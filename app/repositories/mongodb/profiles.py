@@ -0,0 +1,68 @@
+from typing import List, Optional
+
+from app.repositories.mongodb.base import MongoDBRepository
+from app.schemas.profiles import ProfileKind, ProfileRecord
+
+
+class ProfilesRepository(MongoDBRepository[ProfileRecord]):
+    """
+    Repository for Mongo 'profiles' collection (opt-in profiler captures from API requests and jobs).
+    _id <-> profile_id mapping. Shared by API and workers so captures are downloadable from the admin API.
+    """
+
+    def __init__(self, collection_name: str = "profiles") -> None:
+        super().__init__(
+            model=ProfileRecord,
+            collection_name=collection_name,
+            to_mongo=self._to_mongo,
+            from_mongo=self._from_mongo,
+            id_field="_id",
+            write_profile="events",
+        )
+
+    # ------------- mapping helpers -------------
+
+    @staticmethod
+    def _to_mongo(obj: ProfileRecord | dict) -> dict:
+        if isinstance(obj, ProfileRecord):
+            d = obj.model_dump()
+            d["kind"] = obj.kind.value
+        else:
+            d = dict(obj)
+        if "profile_id" in d:
+            d["_id"] = d.pop("profile_id")
+        return d
+
+    @staticmethod
+    def _from_mongo(doc: dict) -> ProfileRecord:
+        d = dict(doc)
+        if "_id" in d:
+            d["profile_id"] = str(d.pop("_id"))
+        if isinstance(d.get("kind"), str):
+            d["kind"] = ProfileKind(d["kind"])
+        return ProfileRecord.model_validate(d)
+
+    # ------------- domain methods -------------
+
+    async def record(self, profile: ProfileRecord) -> str:
+        created = await self.create(profile)
+        return created.profile_id
+
+    async def list_recent(
+        self, *, kind: Optional[ProfileKind] = None, target: Optional[str] = None, limit: int = 50
+    ) -> List[ProfileRecord]:
+        """Metadata only (the pstats blob and summary are left out)."""
+        filters = {}
+        if kind:
+            filters["kind"] = kind.value
+        if target:
+            filters["target"] = target
+        return await self.get_multi(limit=int(limit), sort=[("created_at", -1)], projection={"pstats": 0, "summary": 0}, **filters)
+
+    # ------------- indexes (optional helper) -------------
+
+    @staticmethod
+    async def ensure_indexes(db, retention_s: int) -> None:
+        profiles = db.get_collection("profiles")
+        await profiles.create_index([("kind", 1), ("created_at", -1)], name="kind_created")
+        await profiles.create_index([("created_at", 1)], name="ttl_retention", expireAfterSeconds=int(retention_s))
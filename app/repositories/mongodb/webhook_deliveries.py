@@ -0,0 +1,69 @@
+from typing import List
+
+from app.repositories.mongodb.base import MongoDBRepository
+from app.schemas.webhooks import (
+    WebhookDelivery,
+    WebhookDeliveryStatus,
+    WebhookEventType,
+)
+
+
+class WebhookDeliveriesRepository(MongoDBRepository[WebhookDelivery]):
+    """
+    Repository for Mongo 'webhook_deliveries' collection (one document per delivery, attempts embedded).
+    _id <-> delivery_id mapping.
+    """
+
+    def __init__(self, collection_name: str = "webhook_deliveries") -> None:
+        super().__init__(
+            model=WebhookDelivery,
+            collection_name=collection_name,
+            to_mongo=self._to_mongo,
+            from_mongo=self._from_mongo,
+            id_field="_id",
+        )
+
+    # ------------- mapping helpers -------------
+
+    @staticmethod
+    def _to_mongo(obj: WebhookDelivery | dict) -> dict:
+        if isinstance(obj, WebhookDelivery):
+            d = obj.model_dump(mode="json")
+            # keep datetimes native for TTL/sorting
+            d["created_at"] = obj.created_at
+            d["finished_at"] = obj.finished_at
+        else:
+            d = dict(obj)
+        if "delivery_id" in d:
+            d["_id"] = d.pop("delivery_id")
+        return d
+
+    @staticmethod
+    def _from_mongo(doc: dict) -> WebhookDelivery:
+        d = dict(doc)
+        if "_id" in d:
+            d["delivery_id"] = str(d.pop("_id"))
+        for key, enum in (("event", WebhookEventType), ("status", WebhookDeliveryStatus)):
+            if isinstance(d.get(key), str):
+                d[key] = enum(d[key])
+        return WebhookDelivery.model_validate(d)
+
+    # ------------- domain methods -------------
+
+    async def record(self, delivery: WebhookDelivery) -> str:
+        """Insert or replace the delivery document (it is rewritten after every attempt)."""
+        collection = await self._get_collection()
+        doc = self._to_mongo(delivery)
+        await collection.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+        return delivery.delivery_id
+
+    async def list_by_job(self, job_id: str, limit: int = 50) -> List[WebhookDelivery]:
+        return await self.get_multi(limit=int(limit), sort=[("created_at", 1)], job_id=job_id)
+
+    # ------------- indexes (optional helper) -------------
+
+    @staticmethod
+    async def ensure_indexes(db) -> None:
+        deliveries = db.get_collection("webhook_deliveries")
+        await deliveries.create_index([("job_id", 1), ("created_at", 1)], name="job_created")
+        await deliveries.create_index([("created_at", 1)], name="ttl_7d", expireAfterSeconds=7 * 24 * 3600)
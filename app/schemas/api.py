@@ -3,7 +3,7 @@ from typing import Any, Dict, Literal, Optional
 
 from pydantic import AnyUrl, BaseModel, ConfigDict, Field
 
-from app.schemas.jobs import AgentName, JobStatusEnum
+from app.schemas.jobs import AgentName, JobDoc, JobStatusEnum
 
 
 class ExecuteRequest(BaseModel):
@@ -35,8 +35,25 @@ class JobStatus(BaseModel):
     decided_agent: Optional[AgentName] = None
     result: Optional[Dict[str, Any]] = None  # (ContentOutput|CodeOutput) serialized dict
     error: Optional[Dict[str, Any]] = None  # JobError serialized dict
+    partial_output: Optional[str] = None  # streamed LLM text while running
     progress: Optional[float] = Field(None, ge=0.0, le=1.0)
+    metrics: Optional[Dict[str, Any]] = None  # per-stage timing breakdown (?include_metrics=true)
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(extra="ignore")
+
+    @classmethod
+    def from_job(cls, job: JobDoc, *, include_metrics: bool = False) -> "JobStatus":
+        return cls(
+            job_id=job.job_id,
+            status=job.status,
+            decided_agent=job.decided_agent,
+            result=job.result.model_dump(mode="json") if job.result else None,
+            error=job.error.model_dump(mode="json") if job.error else None,
+            partial_output=job.partial_output if job.status == JobStatusEnum.running else None,
+            progress=job.progress,
+            metrics=job.metrics if include_metrics else None,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+        )
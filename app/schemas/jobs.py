@@ -32,6 +32,29 @@ class JobResult(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
 
+class JobResultRef(BaseModel):
+    # Pointer to a large result offloaded to 'job_results'.
+    blob_id: str
+    codec: Literal["zstd", "gzip"]
+    size_bytes: int  # encoded JSON size
+    stored_bytes: int  # compressed size
+
+    model_config = ConfigDict(extra="ignore")
+
+
+class JobResultBlob(BaseModel):
+    # Mongo _id <-> blob_id mapping is done in repository layer.
+    # One blob per successful attempt, so a worker that lost its lease never touches the winner's blob.
+    blob_id: str
+    job_id: str
+    codec: Literal["zstd", "gzip"]
+    data: bytes
+    size_bytes: int
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    model_config = ConfigDict(extra="ignore")
+
+
 class JobDoc(BaseModel):
     # Mongo _id <-> job_id mapping is done in repository layer.
     job_id: str
@@ -47,7 +70,11 @@ class JobDoc(BaseModel):
     reason: Optional[str] = None
 
     result: Optional[JobResult] = None
+    # Set instead of `result` when the output is above JOB_RESULT_INLINE_MAX_BYTES (see ResultStore)
+    result_ref: Optional[JobResultRef] = None
     error: Optional[JobError] = None
+    # Streamed (unparsed) LLM text while running; removed once the job reaches a terminal state
+    partial_output: Optional[str] = None
 
     progress: Optional[float] = Field(None, ge=0.0, le=1.0)
     attempts: int = 0
@@ -56,6 +83,10 @@ class JobDoc(BaseModel):
     webhook_url: Optional[AnyUrl] = None
     celery_task_id: Optional[str] = None
 
+    # Lease held by the worker running the job (renewed by heartbeat; expired leases are reaped)
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+
     created_at: datetime = Field(default_factory=datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=datetime.now(timezone.utc))
 
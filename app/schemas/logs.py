@@ -11,6 +11,7 @@ class LogType(str, Enum):
     agent_started = "agent_started"
     tool_call = "tool_call"
     agent_finished = "agent_finished"
+    job_canceled = "job_canceled"
     error = "error"
 
 
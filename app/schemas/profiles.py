@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ProfileKind(str, Enum):
+    request = "request"
+    job = "job"
+    function = "function"
+
+
+class ProfileRecord(BaseModel):
+    # Mongo _id <-> profile_id mapping is done in the repository layer.
+    profile_id: str
+    kind: ProfileKind
+    target: str  # "GET /api/v1/agent/jobs/{job_id}", job_id or function name
+    engine: str  # cprofile | yappi
+    duration_ms: float
+    size_bytes: int = 0
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    summary: Optional[str] = None  # top functions by cumulative time (pstats text)
+    pstats: Optional[bytes] = None  # zlib-compressed pstats dump (load with pstats.Stats)
+
+    model_config = ConfigDict(extra="ignore")
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class WebhookEventType(str, Enum):
+    job_succeeded = "job.succeeded"
+    job_failed = "job.failed"
+    job_canceled = "job.canceled"
+
+
+class WebhookDeliveryStatus(str, Enum):
+    pending = "pending"  # a retry is scheduled
+    delivered = "delivered"
+    failed = "failed"
+
+
+class WebhookAttempt(BaseModel):
+    attempt: int
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    duration_ms: float
+    ts: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    model_config = ConfigDict(extra="ignore")
+
+
+class WebhookDelivery(BaseModel):
+    # Mongo _id <-> delivery_id mapping is done in the repository layer.
+    delivery_id: str
+    job_id: str
+    request_id: str
+    event: WebhookEventType
+    url: str
+    status: WebhookDeliveryStatus
+    attempts: List[WebhookAttempt] = Field(default_factory=list)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(extra="ignore")
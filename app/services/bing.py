@@ -0,0 +1,51 @@
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.services.host_guard import host_guard
+from app.services.interfaces import ISearchProvider
+
+SearchHit = Dict[str, str]
+
+
+class BingProvider(ISearchProvider):
+    """
+    Bing Web Search API v7 adapter (Azure "Bing Search" resource key).
+    """
+
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        endpoint: str = "https://api.bing.microsoft.com/v7.0/search",
+        market: str = "en-US",
+        timeout_s: int = 10,
+        user_agent: Optional[str] = None,
+    ):
+        if not api_key:
+            raise ValueError("BING_API_KEY is required")
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.market = market
+        self.timeout_s = int(timeout_s)
+        self.user_agent = user_agent or "AgenticAPI/ContentAgent"
+
+    async def search(self, query: str, *, limit: int = 5) -> List[SearchHit]:
+        params = {"q": query, "count": max(1, min(50, int(limit))), "mkt": self.market, "responseFilter": "Webpages"}
+        headers = {"Ocp-Apim-Subscription-Key": self.api_key, "User-Agent": self.user_agent, "Accept": "application/json"}
+
+        async with host_guard.slot(self.endpoint):
+            async with httpx.AsyncClient(timeout=self.timeout_s, headers=headers) as client:
+                r = await client.get(self.endpoint, params=params)
+                r.raise_for_status()
+                data = r.json()
+
+        hits: List[Dict[str, str]] = []
+        for it in (data.get("webPages") or {}).get("value") or []:
+            title = it.get("name") or ""
+            url = it.get("url") or ""
+            if title and url:
+                hits.append({"title": title[:240], "url": url})
+            if len(hits) >= limit:
+                break
+        return hits
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Awaitable, Optional, TypeVar
+
+from app.cache.redis import RedisClient
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class JobCanceled(Exception):
+    """Raised inside the worker when a running job was canceled by its owner."""
+
+    code = "job_canceled"
+
+
+class CancellationBus:
+    """
+    Cooperative cancel signal for running jobs (Redis).
+    - request_cancel(job_id): set a short-lived flag + publish on the job channel.
+    - wait(job_id): resolves once the job is canceled (flag is checked after subscribing, so no signal is lost).
+    """
+
+    def __init__(self, *, flag_ttl_s: int = config.JOB_CANCEL_FLAG_TTL_S) -> None:
+        self._flag_ttl_s = int(flag_ttl_s)
+
+    @staticmethod
+    def _flag_key(job_id: str) -> str:
+        return RedisClient.key("jobs", "cancel", job_id)
+
+    @staticmethod
+    def _channel(job_id: str) -> str:
+        return RedisClient.key("jobs", "cancel", "channel", job_id)
+
+    async def request_cancel(self, job_id: str) -> None:
+        redis = await RedisClient.get_client()
+        await redis.set(self._flag_key(job_id), "1", ex=self._flag_ttl_s)
+        await redis.publish(self._channel(job_id), "cancel")
+
+    async def is_canceled(self, job_id: str) -> bool:
+        redis = await RedisClient.get_client()
+        return bool(await redis.exists(self._flag_key(job_id)))
+
+    async def wait(self, job_id: str) -> None:
+        redis = await RedisClient.get_client()
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(self._channel(job_id))
+            if await redis.exists(self._flag_key(job_id)):
+                return
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    return
+        finally:
+            await pubsub.aclose()
+
+
+async def run_cancellable(aw: Awaitable[T], *, job_id: str, bus: Optional[CancellationBus]) -> T:
+    """
+    Run `aw` until it completes or a cancel signal for `job_id` arrives.
+    On cancel, the in-flight task (and its HTTP/LLM calls) is cancelled and JobCanceled is raised.
+    If the signal channel itself fails (e.g. Redis is down), the job keeps running uncancellable.
+    """
+    work = asyncio.ensure_future(aw)
+    if bus is None:
+        return await work
+
+    watcher = asyncio.ensure_future(bus.wait(job_id))
+    try:
+        done, _ = await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if work in done:
+            return work.result()
+        if watcher.exception() is not None:
+            logger.warning("cancel watcher failed for job %s: %s", job_id, watcher.exception())
+            return await work
+
+        work.cancel()
+        await asyncio.gather(work, return_exceptions=True)
+        raise JobCanceled(f"job {job_id} canceled")
+    finally:
+        if not watcher.done():
+            watcher.cancel()
+            await asyncio.gather(watcher, return_exceptions=True)
+        if not work.done():
+            work.cancel()
+            await asyncio.gather(work, return_exceptions=True)
@@ -0,0 +1,74 @@
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+
+def _clean(domain: str) -> str:
+    return domain.strip().lower().strip(".")
+
+
+class DomainMatcher:
+    """
+    Compiled host allow/deny list; a lookup walks the host's labels (most specific suffix first), so the cost
+    is O(labels in the host) whatever the number of rules.
+
+    Rule syntax (comma separated in WEB_WHITELIST):
+      wikipedia.org      the domain and all its subdomains
+      *.example.com      subdomains only (not example.com itself)
+      !ads.example.com   deny (same forms; "!*.cdn.example.com" too)
+    The most specific matching rule wins; deny wins over allow on the same domain. Without any allow rule every
+    host not denied is allowed.
+    """
+
+    def __init__(self, rules: Iterable[str] = ()) -> None:
+        self._domain: Dict[str, bool] = {}  # suffix -> allow/deny, for the domain and its subdomains
+        self._subdomains: Dict[str, bool] = {}  # suffix -> allow/deny, subdomains only ("*.")
+        self._has_allow = False
+        for raw in rules:
+            rule = raw.strip()
+            allow = not rule.startswith("!")
+            rule = rule.lstrip("!").strip()
+            table = self._domain
+            if rule.startswith("*."):
+                table, rule = self._subdomains, rule[2:]
+            rule = _clean(rule)
+            if not rule:
+                continue
+            # deny wins when both are given for the same suffix
+            table[rule] = table.get(rule, True) and allow
+            self._has_allow = self._has_allow or allow
+
+    def __len__(self) -> int:
+        return len(self._domain) + len(self._subdomains)
+
+    def decide(self, host: str) -> Optional[bool]:
+        """True/False from the most specific matching rule, None when no rule matches."""
+        host = _clean(host)
+        if not host:
+            return None
+        suffix, apex = host, True
+        while True:
+            verdict = self._domain.get(suffix)
+            if not apex:
+                sub = self._subdomains.get(suffix)
+                if sub is not None:
+                    verdict = sub if verdict is None else (verdict and sub)
+            if verdict is not None:
+                return verdict
+            dot = suffix.find(".")
+            if dot < 0:
+                return None
+            suffix, apex = suffix[dot + 1 :], False
+
+    def allows_host(self, host: str) -> bool:
+        verdict = self.decide(host)
+        return verdict if verdict is not None else not self._has_allow
+
+    def allows(self, url: str) -> bool:
+        return self.allows_host(urlparse(url).hostname or "")
+
+
+@lru_cache(maxsize=8)
+def compile_rules(spec: str) -> DomainMatcher:
+    """DomainMatcher for a comma separated rule string (e.g. config.WEB_WHITELIST), compiled once per value."""
+    return DomainMatcher(d for d in (spec or "").split(",") if d.strip())
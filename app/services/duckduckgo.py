@@ -0,0 +1,41 @@
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.services.host_guard import host_guard
+from app.services.interfaces import ISearchProvider
+
+SearchHit = Dict[str, str]
+
+
+class DuckDuckGoProvider(ISearchProvider):
+    """
+    DuckDuckGo Instant Answer API adapter (no key).
+    Returns the abstract source and the official-site `Results` rather than full web results: fewer and more
+    encyclopedic hits, useful as a keyless fallback behind SerpAPI/Bing. `RelatedTopics` are skipped: they
+    link to duckduckgo.com topic pages, not sources.
+    """
+
+    def __init__(self, *, timeout_s: int = 10, user_agent: Optional[str] = None):
+        self.timeout_s = int(timeout_s)
+        self.user_agent = user_agent or "AgenticAPI/ContentAgent"
+
+    async def search(self, query: str, *, limit: int = 5) -> List[SearchHit]:
+        params = {"q": query, "format": "json", "no_html": 1, "skip_disambig": 1}
+        headers = {"User-Agent": self.user_agent, "Accept": "application/json"}
+
+        async with host_guard.slot("https://api.duckduckgo.com/"):
+            async with httpx.AsyncClient(timeout=self.timeout_s, headers=headers) as client:
+                r = await client.get("https://api.duckduckgo.com/", params=params)
+                r.raise_for_status()
+                data = r.json()
+
+        hits: List[Dict[str, str]] = []
+        if data.get("AbstractURL") and data.get("Heading"):
+            hits.append({"title": data["Heading"][:240], "url": data["AbstractURL"]})
+        for it in data.get("Results") or []:
+            title = it.get("Text") or ""
+            url = it.get("FirstURL") or ""
+            if title and url:
+                hits.append({"title": title[:240], "url": url})
+        return hits[:limit]
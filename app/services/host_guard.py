@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import config
+from app.core.metrics import WEB_CIRCUIT_REJECTIONS, WEB_CIRCUIT_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+_MIN_SAMPLES = 10  # below this p95 is unknown
+
+
+class HostUnavailable(Exception):
+    """Raised instead of calling a host whose circuit is open (it failed repeatedly, cooling off)."""
+
+    code = "host_unavailable"
+
+
+class RollingStats:
+    """Rolling latency and success window (per process)."""
+
+    def __init__(self, window: int) -> None:
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+
+    def record(self, ok: bool, latency_s: Optional[float]) -> None:
+        self._outcomes.append(ok)
+        if latency_s is not None:
+            self._latencies.append(latency_s)
+
+    def p95(self) -> Optional[float]:
+        if len(self._latencies) < _MIN_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def error_rate(self) -> float:
+        return (1.0 - sum(self._outcomes) / len(self._outcomes)) if self._outcomes else 0.0
+
+    def as_dict(self) -> Dict[str, object]:
+        p95 = self.p95()
+        return {
+            "samples": len(self._outcomes),
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(self.error_rate(), 3),
+        }
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures; open rejects calls for `cooloff_s`;
+    then half-open lets a single probe through: success closes it, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, cooloff_s: float) -> None:
+        self._threshold = max(1, int(failure_threshold))
+        self._cooloff_s = float(cooloff_s)
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self._cooloff_s:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> bool:
+        """True when this closed a previously open circuit."""
+        reopened = self.opened_at is not None
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        return reopened
+
+    def record_failure(self) -> bool:
+        """True when this opened (or re-opened) the circuit."""
+        self.failures += 1
+        if self._probing or (self.opened_at is None and self.failures >= self._threshold):
+            self.opened_at = time.monotonic()
+            self._probing = False
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        # the probe ended without a verdict (e.g. canceled): let the next call probe
+        self._probing = False
+
+
+class _Host:
+    __slots__ = ("slots", "breaker", "stats", "active")
+
+    def __init__(self, concurrency: int, failure_threshold: int, cooloff_s: float, window: int) -> None:
+        self.slots = asyncio.Semaphore(concurrency)
+        self.breaker = CircuitBreaker(failure_threshold, cooloff_s)
+        self.stats = RollingStats(window)
+        self.active = 0
+
+
+def _is_host_failure(exc: BaseException) -> bool:
+    # the host is unwell: unreachable, too slow, throttling or failing server-side (a 404 is not its fault)
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, (httpx.TransportError, TimeoutError))
+
+
+class HostGuard:
+    """
+    Outbound guard for web fetches and search API calls, per host (per process):
+    - semaphore: at most `concurrency` calls in flight to one host
+    - circuit breaker: after `failure_threshold` consecutive failures the host is skipped (HostUnavailable,
+      not retried by Celery) for `cooloff_s`, then probed with a single call
+    - rolling latency / error stats, used to prefer healthy hosts (rank)
+    Only the most recently used `max_hosts` idle hosts are remembered.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = config.WEB_PER_HOST_CONCURRENCY,
+        failure_threshold: int = config.WEB_CIRCUIT_FAILURE_THRESHOLD,
+        cooloff_s: float = config.WEB_CIRCUIT_COOLOFF_S,
+        window: int = config.WEB_HOST_STATS_WINDOW,
+        max_hosts: int = 1024,
+    ) -> None:
+        self._concurrency = max(1, int(concurrency))
+        self._failure_threshold = int(failure_threshold)
+        self._cooloff_s = float(cooloff_s)
+        self._window = int(window)
+        self._max_hosts = int(max_hosts)
+        self._hosts: "OrderedDict[str, _Host]" = OrderedDict()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    def _get(self, host: str) -> _Host:
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = self._hosts[host] = _Host(self._concurrency, self._failure_threshold, self._cooloff_s, self._window)
+            if len(self._hosts) > self._max_hosts:
+                for name, old in list(self._hosts.items()):
+                    if old.active == 0 and name != host:
+                        del self._hosts[name]
+                        break
+        self._hosts.move_to_end(host)
+        return entry
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Guard one outbound call to `url`'s host; raises HostUnavailable while its circuit is open."""
+        host = self.host_of(url)
+        entry = self._get(host)
+        if not entry.breaker.allow():
+            WEB_CIRCUIT_REJECTIONS.inc()
+            raise HostUnavailable(f"host_unavailable: {host} (circuit open after {entry.breaker.failures} failures)")
+
+        entry.active += 1
+        verdict = False
+        try:
+            async with entry.slots:
+                started = time.perf_counter()
+                try:
+                    yield
+                except BaseException as e:
+                    if _is_host_failure(e):
+                        verdict = True
+                        self._failed(host, entry, e)
+                    elif isinstance(e, httpx.HTTPStatusError):
+                        # it answered (e.g. 404): reachable
+                        verdict = True
+                        self._succeeded(host, entry, time.perf_counter() - started)
+                    raise
+                verdict = True
+                self._succeeded(host, entry, time.perf_counter() - started)
+        finally:
+            entry.active -= 1
+            if not verdict:
+                entry.breaker.release_probe()
+
+    @staticmethod
+    def _succeeded(host: str, entry: _Host, latency_s: float) -> None:
+        entry.stats.record(True, latency_s)
+        if entry.breaker.record_success():
+            WEB_CIRCUIT_TRANSITIONS.labels(state="closed").inc()
+            logger.info("circuit closed for %s", host)
+
+    @staticmethod
+    def _failed(host: str, entry: _Host, exc: BaseException) -> None:
+        entry.stats.record(False, None)
+        if entry.breaker.record_failure():
+            WEB_CIRCUIT_TRANSITIONS.labels(state="open").inc()
+            logger.warning("circuit open for %s: %s", host, exc)
+
+    def is_healthy(self, url: str) -> bool:
+        entry = self._hosts.get(self.host_of(url))
+        return entry is None or entry.breaker.state != "open"
+
+    def rank(self, url: str) -> tuple:
+        """Sort key: hosts with a closed circuit first, then lower error rate, then lower p95 (unknown = neutral)."""
+        entry = self._hosts.get(self.host_of(url))
+        if entry is None:
+            return (0, 0.0, 0.0)
+        p95 = entry.stats.p95()
+        return (0 if entry.breaker.state == "closed" else 1, round(entry.stats.error_rate(), 1), p95 or 0.0)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        return {host: {"state": e.breaker.state, "active": e.active, **e.stats.as_dict()} for host, e in self._hosts.items()}
+
+
+# shared by WebClient and the search providers of this process
+host_guard = HostGuard()
@@ -1,10 +1,16 @@
 import hashlib
+import logging
 import uuid
 from datetime import datetime, timezone
 from typing import Optional, Tuple
 
+from app.cache.memory import TTLCache
+from app.core.config import config
 from app.core.error_codes import ErrorCode
 from app.core.exceptions import ExceptionBase, QueueUnavailable
+from app.core.tracing import span
+from app.db.mongodb.mongodb import ReadProfile
+from app.peer.peer_agent import PeerAgent
 from app.repositories.mongodb.jobs import JobsRepository
 from app.repositories.mongodb.log_events import LogEventsRepository
 from app.schemas.api import ExecuteRequest, JobAccepted
@@ -12,7 +18,15 @@ from app.schemas.api import JobStatus as JobStatusDTO
 from app.schemas.auth import ActorSchema
 from app.schemas.jobs import JobDoc, JobError, JobStatusEnum
 from app.schemas.logs import LogEvent, LogType
+from app.schemas.webhooks import WebhookEventType
+from app.services.cancellation import CancellationBus
 from app.services.queue import Producer
+from app.services.result_store import ResultStore
+
+logger = logging.getLogger(__name__)
+
+# (idempotency_key, task_hash) -> (job_id, request_id); shared by the per-request orchestrators of this process
+_IDEMPOTENCY_CACHE: TTLCache[Tuple[str, str]] = TTLCache(config.JOB_IDEMPOTENCY_CACHE_SIZE, config.JOB_IDEMPOTENCY_CACHE_TTL_S)
 
 
 class JobsOrchestrator:
@@ -23,6 +37,9 @@ class JobsOrchestrator:
         jobs_repo: Optional[JobsRepository] = None,
         logs_repo: Optional[LogEventsRepository] = None,
         producer: Optional[Producer] = None,
+        cancel_bus: Optional[CancellationBus] = None,
+        result_store: Optional[ResultStore] = None,
+        idempotency_cache: Optional[TTLCache[Tuple[str, str]]] = None,
     ) -> None:
         """
         Initialize the JobsOrchestrator with optional repositories and producer to make it easier to test.
@@ -31,6 +48,9 @@ class JobsOrchestrator:
         self._jobs_repo = jobs_repo or JobsRepository()
         self._logs_repo = logs_repo or LogEventsRepository()
         self._producer = producer or Producer()
+        self._cancel_bus = cancel_bus or CancellationBus()
+        self._result_store = result_store or ResultStore()
+        self._idempotency_cache = _IDEMPOTENCY_CACHE if idempotency_cache is None else idempotency_cache
 
     @staticmethod
     def _task_hash(task: str) -> str:
@@ -60,18 +80,29 @@ class JobsOrchestrator:
         Job queued, first log pushed, enqueued.
         Returns: (JobAccepted DTO, location_path)
         """
+        with span("jobs.create_and_enqueue", **{"request.id": http_request_id, "idempotent": bool(idempotency_key)}):
+            return await self._create_and_enqueue(payload, actor, http_request_id, idempotency_key)
+
+    async def _create_and_enqueue(
+        self,
+        payload: ExecuteRequest,
+        actor: ActorSchema,
+        http_request_id: Optional[str],
+        idempotency_key: Optional[str],
+    ) -> Tuple[JobAccepted, str]:
         t_hash = self._task_hash(payload.task)
 
-        # Idempotency
+        # Idempotency: recent keys are answered from memory (no Mongo round trip)
         if idempotency_key:
-            existing = await self._jobs_repo.get_by_idempotency(idempotency_key, t_hash)
-            if existing:
-                accepted = JobAccepted(job_id=existing.job_id, status="queued", request_id=existing.request_id)
-                return accepted, f"/api/v1/jobs/{existing.job_id}"
+            cached = self._idempotency_cache.get((idempotency_key, t_hash))
+            if cached:
+                return self._accepted_existing(*cached)
 
-        # New job
+        # New job, routed once here (memoized by task_hash); the decision also picks the worker queue
         job_id = self._new_job_id()
         request_id = http_request_id or self._new_request_id()
+        with span("jobs.route"):
+            decision = PeerAgent.decide(payload.task, task_hash=t_hash)
 
         now = self._now()
         job_doc = JobDoc(
@@ -83,24 +114,36 @@ class JobsOrchestrator:
             idempotency_key=idempotency_key,
             status=JobStatusEnum.queued,
             progress=0.0,
+            decided_agent=decision["agent"],
+            reason=decision.get("reason", ""),
             webhook_url=str(payload.webhook_url) if payload.webhook_url else None,
             created_at=now,
             updated_at=now,
         )
-        await self._jobs_repo.create_job(job_doc)
-
-        # First event
-        await self._logs_repo.push(
-            LogEvent(
-                job_id=job_id,
-                request_id=request_id,
-                type=LogType.request_received,
-                payload={"mode": payload.mode, "owner_user_id": str(actor.user_id)},
-            )
+        if idempotency_key:
+            # atomic reserve-or-get, so concurrent retries with the same key all get the same job
+            stored, created = await self._jobs_repo.create_or_get_by_idempotency(job_doc)
+            self._idempotency_cache.set((idempotency_key, t_hash), (stored.job_id, stored.request_id))
+            if not created:
+                return self._accepted_existing(stored.job_id, stored.request_id)
+        else:
+            await self._jobs_repo.create_job(job_doc)
+
+        # First events
+        await self._logs_repo.push_many(
+            [
+                LogEvent(
+                    job_id=job_id,
+                    request_id=request_id,
+                    type=LogType.request_received,
+                    payload={"mode": payload.mode, "owner_user_id": str(actor.user_id)},
+                ),
+                LogEvent(job_id=job_id, request_id=request_id, type=LogType.route_decision, payload=decision),
+            ]
         )
 
         try:
-            self._producer.enqueue_execute(job_id=job_id, request_id=request_id, owner_user_id=str(actor.user_id))
+            self._producer.enqueue_execute(job_id=job_id, request_id=request_id, owner_user_id=str(actor.user_id), agent=decision["agent"])
         except Exception as e:
             # 1) log_events (best-effort)
             await self._logs_repo.push(
@@ -127,19 +170,66 @@ class JobsOrchestrator:
         accepted = JobAccepted(job_id=job_id, status="queued", request_id=request_id)
         return accepted, f"/api/v1/jobs/{job_id}"
 
-    async def get_status_owner_guard(self, job_id: str, actor: ActorSchema) -> JobStatusDTO:
-        job = await self._jobs_repo.get(job_id)
+    @staticmethod
+    def _accepted_existing(job_id: str, request_id: str) -> Tuple[JobAccepted, str]:
+        return JobAccepted(job_id=job_id, status="queued", request_id=request_id), f"/api/v1/jobs/{job_id}"
+
+    async def _get_owned(self, job_id: str, actor: ActorSchema, *, include: Tuple[str, ...] = (), read: ReadProfile = "primary") -> JobDoc:
+        job = await self._jobs_repo.get_light(job_id, include=include, read=read)
         if not job:
             raise ExceptionBase(ErrorCode.RECORD_NOT_FOUND)
         if job.owner_user_id and str(job.owner_user_id) != str(actor.user_id):
             raise ExceptionBase(ErrorCode.UNAUTHORIZED_ACCESS)
-        return JobStatusDTO(
-            job_id=job.job_id,
-            status=job.status,
-            decided_agent=job.decided_agent,
-            result=job.result.model_dump(mode="json") if job.result else None,
-            error=job.error.model_dump(mode="json") if job.error else None,
-            progress=job.progress,
-            created_at=job.created_at,
-            updated_at=job.updated_at,
+        return job
+
+    async def get_status_owner_guard(
+        self, job_id: str, actor: ActorSchema, *, include_result: bool = True, include_metrics: bool = False
+    ) -> JobStatusDTO:
+        """
+        Status read. Heavy fields are only fetched when asked for: result (inline, or lazily loaded from
+        'job_results' when offloaded), metrics; partial_output is always included while running.
+        """
+        include = ("partial_output",) + (("result",) if include_result else ()) + (("metrics",) if include_metrics else ())
+        # status polls may be served by a secondary (MONGO_READ_PREFERENCE_STATUS)
+        job = await self._get_owned(job_id, actor, include=include, read="status")
+        if include_result:
+            await self._result_store.hydrate(job)
+        return JobStatusDTO.from_job(job, include_metrics=include_metrics)
+
+    async def cancel_owner_guard(self, job_id: str, actor: ActorSchema) -> JobStatusDTO:
+        """
+        queued  -> canceled: the worker's queued->running guard skips the message; the job.canceled webhook is
+                   published from here (no worker will see this job).
+        running -> canceled: the worker is signalled to cancel the in-flight agent run (and sends the webhook).
+        """
+        job = await self._get_owned(job_id, actor)
+
+        previous = await self._jobs_repo.cancel(job_id)
+        if previous is None:
+            raise ExceptionBase(ErrorCode.JOB_NOT_CANCELABLE)
+
+        if previous == JobStatusEnum.running:
+            try:
+                await self._cancel_bus.request_cancel(job_id)
+            except Exception as e:
+                # status is already canceled; the worker's succeed/fail guards will not overwrite it
+                logger.warning("cancel signal failed for job %s: %s", job_id, e)
+        elif job.webhook_url:
+            try:
+                self._producer.enqueue_webhook(job_id=job_id, request_id=job.request_id, event=WebhookEventType.job_canceled.value)
+            except Exception as e:
+                # best-effort: the canceled status is still available via polling
+                logger.warning("failed to enqueue webhook for job %s: %s", job_id, e)
+
+        await self._logs_repo.push(
+            LogEvent(
+                job_id=job_id,
+                request_id=job.request_id,
+                type=LogType.job_canceled,
+                payload={"previous_status": previous.value, "owner_user_id": str(actor.user_id)},
+            )
         )
+
+        job.status = JobStatusEnum.canceled
+        job.updated_at = self._now()
+        return JobStatusDTO.from_job(job)
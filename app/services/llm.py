@@ -1,9 +1,16 @@
+import time
 from functools import lru_cache
+from typing import Any, Dict
+from uuid import UUID
 
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
 from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
 
 from app.core.config import config
+from app.core.metrics import LLM_CALL_DURATION, LLM_TOKENS
+from app.services.llm_coalescing import CoalescingLLM
 
 
 class LLMClient:
@@ -12,6 +19,7 @@ class LLMClient:
     - Currently only OpenAI is supported.
     - Each different (provider, model, api_key, base_url, temperature, timeout_s, max_retries)
         combination creates a separate cache entry.
+    - With LLM_COALESCE the model is wrapped in CoalescingLLM (in-flight dedup, per-model limits, micro-batching).
     """
 
     @classmethod
@@ -25,7 +33,8 @@ class LLMClient:
         provider = config.LLM_PROVIDER.lower()
 
         if provider == "openai":
-            return _get_openai_chat_llm_cached(
+            factory = _get_coalescing_llm_cached if config.LLM_COALESCE else _get_openai_chat_llm_cached
+            return factory(
                 provider="openai",
                 model=model_name,
                 api_key=config.OPENAI_API_KEY,
@@ -38,6 +47,50 @@ class LLMClient:
         raise ValueError(f"Unknown LLM provider: {provider}")
 
 
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Records LLM call latency and token usage (prompt/completion) per model in Prometheus."""
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        self._observe(run_id, "ok")
+        prompt_tokens, completion_tokens = self._usage(response)
+        if prompt_tokens:
+            LLM_TOKENS.labels(model=self.model, kind="prompt").inc(prompt_tokens)
+        if completion_tokens:
+            LLM_TOKENS.labels(model=self.model, kind="completion").inc(completion_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._observe(run_id, "error")
+
+    def _observe(self, run_id: UUID, outcome: str) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            LLM_CALL_DURATION.labels(model=self.model, outcome=outcome).observe(time.perf_counter() - started)
+
+    @staticmethod
+    def _usage(response: LLMResult):
+        # non-streaming: llm_output.token_usage; streaming (stream_usage=True): message.usage_metadata
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage:
+            return int(usage.get("prompt_tokens") or 0), int(usage.get("completion_tokens") or 0)
+        prompt_tokens = completion_tokens = 0
+        for gens in response.generations:
+            for gen in gens:
+                meta = getattr(getattr(gen, "message", None), "usage_metadata", None) or {}
+                prompt_tokens += int(meta.get("input_tokens") or 0)
+                completion_tokens += int(meta.get("output_tokens") or 0)
+        return prompt_tokens, completion_tokens
+
+
 @lru_cache(maxsize=128)
 def _get_openai_chat_llm_cached(
     *,
@@ -66,4 +119,13 @@ def _get_openai_chat_llm_cached(
         temperature=round(temperature, 3),
         timeout=int(timeout_s),
         max_retries=int(max_retries),
+        stream_usage=True,
+        callbacks=[LLMMetricsCallback(model)],
     )
+
+
+@lru_cache(maxsize=128)
+def _get_coalescing_llm_cached(*, model: str, temperature: float, **kwargs: Any) -> CoalescingLLM:
+    """One CoalescingLLM per cached ChatOpenAI, so agents on the same model share in-flight calls."""
+    inner = _get_openai_chat_llm_cached(model=model, temperature=temperature, **kwargs)
+    return CoalescingLLM(inner, model=model, temperature=temperature)
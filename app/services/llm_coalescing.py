@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from app.cache.singleflight import SingleFlight
+from app.core.config import config as app_config
+from app.core.metrics import LLM_BATCH_SIZE, LLM_COALESCED_CALLS
+
+_DONE = object()
+
+
+def _parse_limits(spec: str) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+    for item in (spec or "").split(","):
+        model, _, value = item.partition("=")
+        if model.strip() and value.strip():
+            limits[model.strip()] = max(1, int(value))
+    return limits
+
+
+class ModelLimits:
+    """Per-model concurrency limits for upstream LLM calls (per process, per event loop)."""
+
+    def __init__(self, default: int = app_config.LLM_MAX_CONCURRENCY, per_model: Optional[Dict[str, int]] = None) -> None:
+        self._default = max(1, int(default))
+        self._per_model = dict(per_model or {})
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._bulk: Dict[str, asyncio.Lock] = {}
+
+    @classmethod
+    def from_config(cls) -> "ModelLimits":
+        return cls(app_config.LLM_MAX_CONCURRENCY, _parse_limits(app_config.LLM_MODEL_CONCURRENCY))
+
+    def limit(self, model: str) -> int:
+        return self._per_model.get(model, self._default)
+
+    @asynccontextmanager
+    async def slot(self, model: str, n: int = 1) -> AsyncIterator[None]:
+        """Hold `n` of the model's slots (a micro-batch of n calls holds n)."""
+        sem = self._slots.get(model)
+        if sem is None:
+            sem = self._slots[model] = asyncio.Semaphore(self.limit(model))
+        async with AsyncExitStack() as stack:
+            if n == 1:
+                await stack.enter_async_context(sem)
+            else:
+                # one multi-slot acquirer at a time, or two half-acquired batches could wait on each other forever
+                async with self._bulk.setdefault(model, asyncio.Lock()):
+                    for _ in range(n):
+                        await stack.enter_async_context(sem)
+            yield
+
+
+# shared by every CoalescingLLM of this process
+model_limits = ModelLimits.from_config()
+
+
+class _MicroBatcher:
+    """Collects calls for `window_s` (or until `max_size`) and sends them through the inner runnable's abatch."""
+
+    def __init__(self, llm: "CoalescingLLM", window_s: float, max_size: int) -> None:
+        self._llm = llm
+        self._window_s = float(window_s)
+        self._max_size = max(1, int(max_size))
+        self._pending: List[Tuple[Any, Optional[RunnableConfig], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, input: Any, config: Optional[RunnableConfig]) -> Any:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((input, config, fut))
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window_s, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Any, Optional[RunnableConfig], asyncio.Future]]) -> None:
+        LLM_BATCH_SIZE.labels(model=self._llm.model).observe(len(batch))
+        try:
+            async with self._llm.limits.slot(self._llm.model, len(batch)):
+                results = await self._llm.inner.abatch(
+                    [item[0] for item in batch], [item[1] or {} for item in batch], return_exceptions=True
+                )
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, _, fut), result in zip(batch, results):
+            if fut.done():
+                continue
+            if isinstance(result, Exception):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
+
+
+class CoalescingLLM(Runnable[Any, Any]):
+    """
+    Wraps a chat model runnable:
+    - identical in-flight calls (same model, temperature and prompt) share one upstream call; a caller joining a
+      streamed call gets the full completion as one chunk
+    - upstream calls are bounded per model (ModelLimits: LLM_MAX_CONCURRENCY / LLM_MODEL_CONCURRENCY)
+    - a shared call is canceled once every caller waiting for it was canceled (job cancel stops the LLM call)
+    - with `batch_window_s` > 0, non-streamed calls are collected briefly and sent through the model's abatch
+    Coalescing is per process; sync invoke() is passed through unchanged.
+    """
+
+    def __init__(
+        self,
+        inner: Runnable,
+        *,
+        model: str,
+        temperature: float,
+        limits: Optional[ModelLimits] = None,
+        batch_window_s: float = app_config.LLM_BATCH_WINDOW_MS / 1000.0,
+        batch_max_size: int = app_config.LLM_BATCH_MAX_SIZE,
+    ) -> None:
+        self.inner = inner
+        self.model = model
+        self.temperature = float(temperature)
+        self.limits = limits or model_limits
+        self._flight: SingleFlight[Any] = SingleFlight()
+        self._batcher: Optional[_MicroBatcher] = None
+        if batch_window_s > 0:
+            self._batcher = _MicroBatcher(self, batch_window_s, min(int(batch_max_size), self.limits.limit(model)))
+
+    def key(self, input: Any, **kwargs: Any) -> str:
+        prompt = input.to_string() if hasattr(input, "to_string") else repr(input)
+        raw = f"{self.model}\n{self.temperature:.3f}\n{sorted(kwargs.items())!r}\n{prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ---- Runnable ----
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return self.inner.invoke(input, config, **kwargs)
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        yield from self.inner.stream(input, config, **kwargs)
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        key = self.key(input, **kwargs)
+        if self._flight.inflight(key):
+            LLM_COALESCED_CALLS.labels(model=self.model).inc()
+        return await self._flight.do(key, lambda: self._call(input, config, **kwargs))
+
+    async def astream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> AsyncIterator[Any]:
+        key = self.key(input, **kwargs)
+        if self._flight.inflight(key):
+            LLM_COALESCED_CALLS.labels(model=self.model).inc()
+            yield await self._flight.do(key, self._never_called)
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def _stream() -> Any:
+            # runs as the shared call: forwards chunks to this caller, returns the whole completion to joiners
+            completion = None
+            try:
+                async with self.limits.slot(self.model):
+                    async for chunk in self.inner.astream(input, config, **kwargs):
+                        queue.put_nowait(chunk)
+                        completion = chunk if completion is None else completion + chunk
+            finally:
+                queue.put_nowait(_DONE)
+            return completion
+
+        # registered right away, so a caller arriving from here on joins instead of calling upstream again;
+        # this caller counts as a waiter: canceled (or closing the stream early) without joiners, it stops the stream
+        shared = self._flight.start(key, _stream)
+        with self._flight.waiting(key, shared):
+            while True:
+                chunk = await queue.get()
+                if chunk is _DONE:
+                    break
+                yield chunk
+            await asyncio.shield(shared)  # re-raise the upstream error, if any
+
+    # ---- helpers ----
+
+    async def _call(self, input: Any, config: Optional[RunnableConfig], **kwargs: Any) -> Any:
+        if self._batcher is not None and not kwargs:
+            return await self._batcher.submit(input, config)
+        async with self.limits.slot(self.model):
+            return await self.inner.ainvoke(input, config, **kwargs)
+
+    @staticmethod
+    async def _never_called() -> Any:
+        raise RuntimeError("joined call finished before it could be awaited")
@@ -0,0 +1,111 @@
+import hashlib
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import orjson
+from redis.asyncio import Redis
+
+from app.cache.memory import TTLCache
+from app.cache.redis import RedisClient
+from app.cache.singleflight import SingleFlight
+from app.core.config import config
+from app.core.metrics import WEB_PAGE_CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# {title, url, snippet, etag?, last_modified?, fetched_at}
+CachedPage = Dict[str, object]
+# (url, cached entry to revalidate or None) -> fresh entry, or None when the origin answered 304 Not Modified
+Fetcher = Callable[[str, Optional[CachedPage]], Awaitable[Optional[CachedPage]]]
+
+
+class PageCache:
+    """
+    Cache of extracted page metadata (title/snippet) per URL: in-process LRU, then Redis.
+    - younger than `fresh_s`: served without touching the origin
+    - older (kept up to `ttl_s`): revalidated with If-None-Match / If-Modified-Since; a 304 only bumps fetched_at
+    - concurrent fetches of one URL share a single request (SingleFlight)
+    Redis is best-effort: when it is down the cache degrades to the in-process tier.
+    """
+
+    def __init__(
+        self,
+        *,
+        fresh_s: int = config.WEB_PAGE_CACHE_FRESH_S,
+        ttl_s: int = config.WEB_PAGE_CACHE_TTL_S,
+        memory_size: int = config.WEB_PAGE_CACHE_MEMORY_SIZE,
+        redis: Optional[Callable[[], Awaitable[Redis]]] = RedisClient.get_client,
+    ) -> None:
+        self._fresh_s = float(fresh_s)
+        self._ttl_s = int(ttl_s)
+        self._redis = redis
+        self._memory: TTLCache[CachedPage] = TTLCache(memory_size, ttl_s)
+        self._flight: SingleFlight[CachedPage] = SingleFlight()
+
+    @staticmethod
+    def key(url: str) -> str:
+        return RedisClient.key("web", "page", hashlib.sha256(url.encode("utf-8")).hexdigest()[:32])
+
+    async def get(self, url: str, fetch: Fetcher) -> CachedPage:
+        key = self.key(url)
+        entry = self._memory.get(key)
+        if entry is not None and self._is_fresh(entry):
+            WEB_PAGE_CACHE_LOOKUPS.labels(outcome="memory").inc()
+            return entry
+        if self._flight.inflight(key):
+            WEB_PAGE_CACHE_LOOKUPS.labels(outcome="coalesced").inc()
+        return await self._flight.do(key, lambda: self._load(key, url, entry, fetch))
+
+    def _is_fresh(self, entry: CachedPage) -> bool:
+        return time.time() - float(entry.get("fetched_at") or 0) < self._fresh_s
+
+    async def _load(self, key: str, url: str, entry: Optional[CachedPage], fetch: Fetcher) -> CachedPage:
+        redis = await self._redis_client()
+        stored = await self._redis_get(redis, key)
+        # another process may have revalidated it more recently than our in-process copy
+        if stored is not None and (entry is None or float(stored.get("fetched_at") or 0) > float(entry.get("fetched_at") or 0)):
+            entry = stored
+        if entry is not None and self._is_fresh(entry):
+            WEB_PAGE_CACHE_LOOKUPS.labels(outcome="redis").inc()
+            self._memory.set(key, entry)
+            return entry
+
+        fetched = await fetch(url, entry)
+        if fetched is None and entry is not None:
+            WEB_PAGE_CACHE_LOOKUPS.labels(outcome="revalidated").inc()
+            fetched = {**entry, "fetched_at": time.time()}
+        else:
+            WEB_PAGE_CACHE_LOOKUPS.labels(outcome="miss").inc()
+        if fetched.get("cacheable", True):
+            self._memory.set(key, fetched)
+            await self._redis_set(redis, key, fetched)
+        return fetched
+
+    async def _redis_client(self) -> Optional[Redis]:
+        if self._redis is None:
+            return None
+        try:
+            return await self._redis()
+        except Exception as e:
+            logger.debug("page cache: redis unavailable: %s", e)
+            return None
+
+    async def _redis_get(self, redis: Optional[Redis], key: str) -> Optional[CachedPage]:
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(key)
+            return orjson.loads(raw) if raw else None
+        except Exception as e:
+            # cache only; a broken entry or a Redis hiccup means a miss
+            logger.debug("page cache: redis get failed: %s", e)
+            return None
+
+    async def _redis_set(self, redis: Optional[Redis], key: str, entry: CachedPage) -> None:
+        if redis is None:
+            return
+        try:
+            await redis.set(key, orjson.dumps(entry), ex=self._ttl_s)
+        except Exception as e:
+            logger.debug("page cache: redis set failed: %s", e)
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class PartialOutputBuffer:
+    """
+    Collects streamed LLM tokens for one job and persists them, throttled.
+    - append(text) is a plain sync callback (agent stream_cb); writes are scheduled as tasks.
+    - At most one write in flight and at most one write per interval; the stored text is capped.
+    - aclose() flushes the latest text and waits for pending writes.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[str], Awaitable[Any]],
+        *,
+        interval_s: float = config.LLM_STREAM_FLUSH_INTERVAL_MS / 1000.0,
+        max_chars: int = config.LLM_STREAM_MAX_CHARS,
+    ) -> None:
+        self._flush = flush
+        self._interval_s = float(interval_s)
+        self._max_chars = int(max_chars)
+        self._parts: List[str] = []
+        self._size = 0
+        self._flushed_size = 0
+        self._last_flush = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def append(self, chunk: str) -> None:
+        if not chunk or self._size >= self._max_chars:
+            return
+        chunk = chunk[: self._max_chars - self._size]
+        self._parts.append(chunk)
+        self._size += len(chunk)
+
+        now = time.monotonic()
+        if (self._inflight is None or self._inflight.done()) and now - self._last_flush >= self._interval_s:
+            self._last_flush = now
+            self._inflight = asyncio.create_task(self._write())
+
+    async def aclose(self) -> None:
+        if self._inflight is not None:
+            await asyncio.gather(self._inflight, return_exceptions=True)
+        if self._size > self._flushed_size:
+            await self._write()
+
+    async def _write(self) -> None:
+        size, text = self._size, self.text
+        try:
+            await self._flush(text)
+            self._flushed_size = max(self._flushed_size, size)
+        except Exception as e:
+            # partial output is best-effort; the final result is written by succeed()
+            logger.warning("partial output flush failed: %s", e)
@@ -1,7 +1,15 @@
 from typing import Optional
 
 from app.core.config import config
-from app.workers.tasks import run_agent_task
+from app.core.tracing import inject_headers, span
+from app.workers.tasks import deliver_webhook, run_agent_task
+
+
+def agent_queue(base: str, agent: Optional[str]) -> str:
+    """Queue for a routed job: "<base>.<agent>" with JOB_QUEUE_PER_AGENT, else the shared queue."""
+    if config.JOB_QUEUE_PER_AGENT and agent:
+        return f"{base}.{agent}"
+    return base
 
 
 class Producer:
@@ -10,14 +18,23 @@ class Producer:
     def __init__(self, queue_name: str = config.QUEUE_NAME) -> None:
         self.queue_name = queue_name
 
-    def enqueue_execute(self, *, job_id: str, request_id: str, owner_user_id: Optional[str] = None) -> None:
+    def enqueue_execute(self, *, job_id: str, request_id: str, owner_user_id: Optional[str] = None, agent: Optional[str] = None) -> None:
+        queue = agent_queue(self.queue_name, agent)
         headers = {
             "request_id": request_id,
             "job_id": job_id,
             "owner_user_id": owner_user_id,
         }
-        run_agent_task.apply_async(
-            kwargs={"job_id": job_id, "request_id": request_id},
-            queue=self.queue_name,
-            headers=headers,
-        )
+        with span("queue.publish", kind="producer", **{"messaging.destination.name": queue, "job.id": job_id}):
+            # W3C trace context travels with the message so the worker span joins this trace
+            inject_headers(headers)
+            run_agent_task.apply_async(
+                kwargs={"job_id": job_id, "request_id": request_id},
+                queue=queue,
+                headers=headers,
+            )
+
+    def enqueue_webhook(self, *, job_id: str, request_id: str, event: str) -> None:
+        """Publish a webhook delivery for a terminal transition made outside a worker (e.g. canceling a queued job)."""
+        headers = inject_headers({"request_id": request_id})
+        deliver_webhook.apply_async(kwargs={"job_id": job_id, "event": event}, headers=headers)
@@ -0,0 +1,79 @@
+import gzip
+import logging
+import uuid
+from typing import Optional, Tuple
+
+import orjson
+import zstandard
+
+from app.core.config import config
+from app.core.timing import timed
+from app.repositories.mongodb.job_results import JobResultsRepository
+from app.schemas.jobs import JobDoc, JobResult, JobResultBlob, JobResultRef
+
+logger = logging.getLogger(__name__)
+
+
+class ResultStore:
+    """
+    Keeps large job results out of the hot 'jobs' documents.
+    - offload(): results whose encoded JSON exceeds inline_max_bytes are compressed (zstd|gzip) into
+      'job_results' and only a JobResultRef is stored on the job; small results stay inline.
+    - hydrate(): loads the blob back into job.result, only when a caller actually needs the result.
+    The codec is recorded per blob, so changing JOB_RESULT_CODEC never breaks reading older results.
+    """
+
+    def __init__(
+        self,
+        results_repo: Optional[JobResultsRepository] = None,
+        *,
+        inline_max_bytes: int = config.JOB_RESULT_INLINE_MAX_BYTES,
+        codec: str = config.JOB_RESULT_CODEC,
+    ) -> None:
+        self._results = results_repo or JobResultsRepository()
+        self._inline_max_bytes = int(inline_max_bytes)
+        self._codec = codec
+
+    async def offload(self, job_id: str, result: JobResult) -> Tuple[Optional[JobResult], Optional[JobResultRef]]:
+        """-> (inline result, None) or (None, ref) once the compressed blob is stored."""
+        raw = orjson.dumps(result.model_dump(mode="json"))
+        if len(raw) <= self._inline_max_bytes:
+            return result, None
+
+        with timed("db_write", op="result_offload"):
+            data = self.compress(raw, self._codec)
+            blob_id = f"res_{uuid.uuid4().hex}"
+            await self._results.put(JobResultBlob(blob_id=blob_id, job_id=job_id, codec=self._codec, data=data, size_bytes=len(raw)))
+        return None, JobResultRef(blob_id=blob_id, codec=self._codec, size_bytes=len(raw), stored_bytes=len(data))
+
+    async def discard(self, ref: JobResultRef) -> None:
+        """Drop a blob whose job write was refused (lease lost, canceled); best-effort."""
+        try:
+            await self._results.delete(ref.blob_id)
+        except Exception as e:
+            logger.warning("failed to discard offloaded result %s: %s", ref.blob_id, e)
+
+    async def load(self, ref: JobResultRef) -> Optional[JobResult]:
+        blob = await self._results.get_blob(ref.blob_id)
+        if blob is None:
+            return None
+        return JobResult.model_validate(orjson.loads(self.decompress(blob.data, blob.codec)))
+
+    async def hydrate(self, job: JobDoc) -> JobDoc:
+        if job.result is None and job.result_ref is not None:
+            job.result = await self.load(job.result_ref)
+        return job
+
+    # ---- codecs ----
+
+    @staticmethod
+    def compress(raw: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(raw)
+        return gzip.compress(raw, compresslevel=6)
+
+    @staticmethod
+    def decompress(data: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import logging
+import unicodedata
+import uuid
+from typing import Awaitable, Callable, List, Optional
+
+import httpx
+import orjson
+from redis.asyncio import Redis
+
+from app.cache.memory import TTLCache
+from app.cache.redis import RedisClient
+from app.cache.singleflight import SingleFlight
+from app.core.config import config
+from app.core.metrics import SEARCH_CACHE_LOOKUPS
+from app.services.interfaces import ISearchProvider, SearchHit
+
+logger = logging.getLogger(__name__)
+
+# upstream failures worth remembering for a short while (quota exhausted, 5xx, timeouts)
+_NEGATIVE_ERRORS = (httpx.HTTPError, TimeoutError)
+_LOCK_POLL_S = 0.05
+# delete the lock only while it still holds our token: a holder that outlived the lock TTL must not release the
+# lock another process has taken since
+_UNLOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SearchUnavailable(Exception):
+    """Raised for a query whose upstream search failed within SEARCH_CACHE_NEGATIVE_TTL_S."""
+
+    code = "search_unavailable"
+
+
+def normalize_query(query: str) -> str:
+    """Case/whitespace/Unicode-form insensitive query text (the cache key is built from this)."""
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+
+class CachedSearchProvider(ISearchProvider):
+    """
+    ISearchProvider wrapper that caches results: in-process LRU first, then Redis (shared by API and workers).
+    - key: normalized query + namespace (provider/engine) + limit
+    - provider errors are cached for `negative_ttl_s` and re-raised as SearchUnavailable
+    - concurrent identical queries share one upstream call: SingleFlight within the process, and a short
+      Redis lock across processes (the others poll for the result, then call upstream themselves)
+    Redis is best-effort: when it is down the cache degrades to the in-process tier.
+    """
+
+    def __init__(
+        self,
+        provider: ISearchProvider,
+        *,
+        namespace: str,
+        ttl_s: int = config.SEARCH_CACHE_TTL_S,
+        negative_ttl_s: int = config.SEARCH_CACHE_NEGATIVE_TTL_S,
+        memory_size: int = config.SEARCH_CACHE_MEMORY_SIZE,
+        lock_ttl_s: float = config.SEARCH_CACHE_LOCK_TTL_S,
+        redis: Optional[Callable[[], Awaitable[Redis]]] = RedisClient.get_client,
+    ) -> None:
+        self._provider = provider
+        self._namespace = namespace
+        self._ttl_s = int(ttl_s)
+        self._negative_ttl_s = int(negative_ttl_s)
+        self._lock_ttl_s = float(lock_ttl_s)
+        self._redis = redis
+        self._hits: TTLCache[List[SearchHit]] = TTLCache(memory_size, ttl_s)
+        self._errors: TTLCache[str] = TTLCache(memory_size, negative_ttl_s)
+        self._flight: SingleFlight[List[SearchHit]] = SingleFlight()
+
+    def key(self, query: str, limit: int) -> str:
+        digest = hashlib.sha256(f"{self._namespace}\n{int(limit)}\n{normalize_query(query)}".encode("utf-8")).hexdigest()
+        return RedisClient.key("search", self._namespace, digest[:32])
+
+    async def search(self, query: str, *, limit: int = 5) -> List[SearchHit]:
+        key = self.key(query, limit)
+        hits = self._hits.get(key)
+        if hits is not None:
+            SEARCH_CACHE_LOOKUPS.labels(outcome="memory").inc()
+            return list(hits)
+        error = self._errors.get(key)
+        if error is not None:
+            SEARCH_CACHE_LOOKUPS.labels(outcome="negative").inc()
+            raise SearchUnavailable(error)
+
+        if self._flight.inflight(key):
+            SEARCH_CACHE_LOOKUPS.labels(outcome="coalesced").inc()
+        return list(await self._flight.do(key, lambda: self._load(key, query, limit)))
+
+    # ---- tiers ----
+
+    async def _load(self, key: str, query: str, limit: int) -> List[SearchHit]:
+        redis = await self._redis_client()
+        cached = await self._redis_get(redis, key)
+        locked, token = False, uuid.uuid4().hex
+        if cached is None and redis is not None:
+            acquired = await self._try_lock(redis, key, token)
+            locked = acquired is True
+            if acquired is False:
+                # another process is fetching this query: wait for its result instead of spending a search
+                cached = await self._wait_for(redis, key)
+        if cached is not None:
+            SEARCH_CACHE_LOOKUPS.labels(outcome="redis").inc()
+            return self._remember(key, cached)
+
+        SEARCH_CACHE_LOOKUPS.labels(outcome="miss").inc()
+        try:
+            hits = await self._provider.search(query, limit=limit)
+        except _NEGATIVE_ERRORS as e:
+            error = f"{type(e).__name__}: {e}"
+            self._errors.set(key, error)
+            await self._redis_set(redis, key, {"error": error}, self._negative_ttl_s)
+            raise
+        finally:
+            if locked:
+                await self._unlock(redis, key, token)
+        await self._redis_set(redis, key, {"hits": hits}, self._ttl_s)
+        self._hits.set(key, hits)
+        return hits
+
+    def _remember(self, key: str, cached: dict) -> List[SearchHit]:
+        if "error" in cached:
+            SEARCH_CACHE_LOOKUPS.labels(outcome="negative").inc()
+            self._errors.set(key, cached["error"])
+            raise SearchUnavailable(cached["error"])
+        self._hits.set(key, cached["hits"])
+        return cached["hits"]
+
+    async def _redis_client(self) -> Optional[Redis]:
+        if self._redis is None:
+            return None
+        try:
+            return await self._redis()
+        except Exception as e:
+            logger.debug("search cache: redis unavailable: %s", e)
+            return None
+
+    async def _redis_get(self, redis: Optional[Redis], key: str) -> Optional[dict]:
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(key)
+            return orjson.loads(raw) if raw else None
+        except Exception as e:
+            # cache only; a broken entry or a Redis hiccup means a miss
+            logger.debug("search cache: redis get failed: %s", e)
+            return None
+
+    async def _redis_set(self, redis: Optional[Redis], key: str, value: dict, ttl_s: int) -> None:
+        if redis is None or ttl_s <= 0:
+            return
+        try:
+            await redis.set(key, orjson.dumps(value), ex=ttl_s)
+        except Exception as e:
+            logger.debug("search cache: redis set failed: %s", e)
+
+    async def _try_lock(self, redis: Redis, key: str, token: str) -> Optional[bool]:
+        """True: acquired, False: another process holds it, None: Redis failed (fetch without a lock)."""
+        try:
+            return bool(await redis.set(f"{key}:lock", token, nx=True, px=int(self._lock_ttl_s * 1000)))
+        except Exception as e:
+            logger.debug("search cache: redis lock failed: %s", e)
+            return None
+
+    async def _unlock(self, redis: Redis, key: str, token: str) -> None:
+        try:
+            await redis.eval(_UNLOCK_SCRIPT, 1, f"{key}:lock", token)
+        except Exception as e:
+            # expires on its own after lock_ttl_s
+            logger.debug("search cache: redis unlock failed: %s", e)
+
+    async def _wait_for(self, redis: Redis, key: str) -> Optional[dict]:
+        deadline = asyncio.get_running_loop().time() + self._lock_ttl_s
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(_LOCK_POLL_S)
+            cached = await self._redis_get(redis, key)
+            if cached is not None:
+                return cached
+            try:
+                if not await redis.exists(f"{key}:lock"):
+                    return await self._redis_get(redis, key)  # holder gave up (or its write was lost)
+            except Exception:
+                return None
+        return None
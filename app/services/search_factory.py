@@ -1,12 +1,43 @@
-from typing import Optional
+import logging
+from typing import Dict, Optional
 
 from app.core.config import config
+from app.services.bing import BingProvider
+from app.services.duckduckgo import DuckDuckGoProvider
 from app.services.interfaces import ISearchProvider
+from app.services.search_cache import CachedSearchProvider
+from app.services.search_hedged import HedgedSearchProvider
 from app.services.serpapi import SerpAPIProvider
 
+logger = logging.getLogger(__name__)
+
 
 def make_search_provider() -> Optional[ISearchProvider]:
-    name = (config.WEB_SEARCH_PROVIDER or "").lower()
+    """
+    WEB_SEARCH_PROVIDERS="serpapi,bing,ddg" -> hedged composite over the configured ones (in that preference);
+    otherwise the single WEB_SEARCH_PROVIDER. Providers without credentials are skipped. Results are cached.
+    """
+    names = [n.strip().lower() for n in (config.WEB_SEARCH_PROVIDERS or "").split(",") if n.strip()]
+    if not names and config.WEB_SEARCH_PROVIDER:
+        names = [config.WEB_SEARCH_PROVIDER.lower()]
+
+    providers: Dict[str, ISearchProvider] = {}
+    for name in names:
+        provider = _make_one(name)
+        if provider is None:
+            logger.warning("search provider %r is not configured (unknown name or missing API key); skipped", name)
+        else:
+            providers[name] = provider
+
+    if not providers:
+        return None
+    if len(providers) == 1:
+        ((name, provider),) = providers.items()
+        return _cached(provider, namespace=_namespace(name))
+    return _cached(HedgedSearchProvider(providers), namespace="+".join(_namespace(n) for n in providers))
+
+
+def _make_one(name: str) -> Optional[ISearchProvider]:
     if name == "serpapi" and getattr(config, "SERPAPI_API_KEY", ""):
         engine = getattr(config, "SERPAPI_ENGINE", "duckduckgo")
         return SerpAPIProvider(
@@ -15,6 +46,24 @@ def make_search_provider() -> Optional[ISearchProvider]:
             timeout_s=config.WEB_TIMEOUT_S,
             user_agent=config.WEB_USER_AGENT,
         )
-    # later: if name == "bing": ...
-    # later: if name == "ddg":  ...
+    if name == "bing" and config.BING_API_KEY:
+        return BingProvider(
+            api_key=config.BING_API_KEY,
+            endpoint=config.BING_ENDPOINT,
+            market=config.BING_MARKET,
+            timeout_s=config.WEB_TIMEOUT_S,
+            user_agent=config.WEB_USER_AGENT,
+        )
+    if name == "ddg":
+        return DuckDuckGoProvider(timeout_s=config.WEB_TIMEOUT_S, user_agent=config.WEB_USER_AGENT)
     return None
+
+
+def _namespace(name: str) -> str:
+    return f"serpapi:{config.SERPAPI_ENGINE}" if name == "serpapi" else name
+
+
+def _cached(provider: ISearchProvider, *, namespace: str) -> ISearchProvider:
+    if not config.SEARCH_CACHE_ENABLED:
+        return provider
+    return CachedSearchProvider(provider, namespace=namespace)
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from app.core.config import config
+from app.core.metrics import SEARCH_HEDGES, SEARCH_PROVIDER_CALLS
+from app.services.host_guard import RollingStats
+from app.services.interfaces import ISearchProvider, SearchHit
+
+
+def _url_key(url: str) -> str:
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+
+class HedgedSearchProvider(ISearchProvider):
+    """
+    Composite ISearchProvider over several backends, tried in adaptive order:
+    - the best-ranked provider is called first; if it has not answered within its own p95 latency
+      (clamped to [hedge_min_s, hedge_max_s]) the next one is fired as well (hedge)
+    - an error or an empty answer fires the next provider right away (fallback)
+    - the first non-empty answer is kept; calls already in flight get `merge_grace_s` more to answer, their
+      hits are merged in (rank order, deduped by URL); calls still running after that are canceled
+    - ranking: expected latency (p95) inflated by the recent error/empty rate, configured order breaks ties
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, ISearchProvider],
+        *,
+        hedge_min_s: float = config.WEB_SEARCH_HEDGE_MIN_MS / 1000.0,
+        hedge_max_s: float = config.WEB_SEARCH_HEDGE_MAX_MS / 1000.0,
+        hedge_default_s: float = config.WEB_SEARCH_HEDGE_DEFAULT_MS / 1000.0,
+        merge_grace_s: float = config.WEB_SEARCH_MERGE_GRACE_MS / 1000.0,
+        window: int = config.WEB_SEARCH_STATS_WINDOW,
+    ) -> None:
+        if not providers:
+            raise ValueError("at least one search provider is required")
+        self._providers = dict(providers)
+        self._hedge_min_s = float(hedge_min_s)
+        self._hedge_max_s = float(hedge_max_s)
+        self._hedge_default_s = float(hedge_default_s)
+        self._merge_grace_s = float(merge_grace_s)
+        self.stats: Dict[str, RollingStats] = {name: RollingStats(window) for name in self._providers}
+
+    def order(self) -> List[str]:
+        names = list(self._providers)
+
+        def cost(name: str) -> float:
+            s = self.stats[name]
+            p95 = s.p95()
+            return (p95 if p95 is not None else self._hedge_default_s) / max(0.05, 1.0 - s.error_rate())
+
+        return sorted(names, key=lambda n: (cost(n), names.index(n)))
+
+    def hedge_delay(self, name: str) -> float:
+        p95 = self.stats[name].p95()
+        if p95 is None:
+            return self._hedge_default_s
+        return min(self._hedge_max_s, max(self._hedge_min_s, p95))
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        return {name: self.stats[name].as_dict() for name in self.order()}
+
+    async def search(self, query: str, *, limit: int = 5) -> List[SearchHit]:
+        order = self.order()
+        started: List[str] = []
+        pending: Dict[asyncio.Task, str] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch() -> str:
+            name = order[len(started)]
+            started.append(name)
+            task = asyncio.create_task(self._call(name, query, limit))
+            # a loser may fail after we stopped watching it; retrieve the exception so asyncio does not warn
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            pending[task] = name
+            return name
+
+        newest = launch()
+        try:
+            while pending:
+                can_hedge = len(started) < len(order)
+                done, _ = await asyncio.wait(
+                    pending, timeout=self.hedge_delay(newest) if can_hedge else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    SEARCH_HEDGES.labels(provider=order[len(started)]).inc()
+                    newest = launch()
+                    continue
+
+                answers: List[Tuple[int, List[SearchHit]]] = []
+                for task in done:
+                    name = pending.pop(task)
+                    hits, error = self._outcome(task)
+                    last_error = error or last_error
+                    if hits:
+                        answers.append((order.index(name), hits))
+                    elif len(started) < len(order):
+                        newest = launch()
+                if answers:
+                    # give the hedges already in flight a short grace to add their hits
+                    deadline = asyncio.get_running_loop().time() + self._merge_grace_s
+                    while pending:
+                        remaining = deadline - asyncio.get_running_loop().time()
+                        if remaining <= 0:
+                            break
+                        done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            name = pending.pop(task)
+                            hits, _ = self._outcome(task)
+                            if hits:
+                                answers.append((order.index(name), hits))
+                    return self._merge([hits for _, hits in sorted(answers, key=lambda a: a[0])], limit)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if last_error is not None:
+            raise last_error
+        return []
+
+    @staticmethod
+    def _outcome(task: asyncio.Task) -> Tuple[List[SearchHit], Optional[BaseException]]:
+        try:
+            return task.result(), None
+        except Exception as e:
+            return [], e
+
+    async def _call(self, name: str, query: str, limit: int) -> List[SearchHit]:
+        started = time.perf_counter()
+        try:
+            hits = await self._providers[name].search(query, limit=limit)
+        except asyncio.CancelledError:
+            # lost the race: says nothing about the provider
+            SEARCH_PROVIDER_CALLS.labels(provider=name, outcome="canceled").inc()
+            raise
+        except Exception:
+            self.stats[name].record(False, None)
+            SEARCH_PROVIDER_CALLS.labels(provider=name, outcome="error").inc()
+            raise
+        self.stats[name].record(bool(hits), time.perf_counter() - started)
+        SEARCH_PROVIDER_CALLS.labels(provider=name, outcome="ok" if hits else "empty").inc()
+        return hits
+
+    @staticmethod
+    def _merge(answers: List[List[SearchHit]], limit: int) -> List[SearchHit]:
+        merged: List[SearchHit] = []
+        seen = set()
+        for hits in answers:
+            for hit in hits:
+                key = _url_key(hit.get("url", ""))
+                if key and key not in seen:
+                    seen.add(key)
+                    merged.append(hit)
+        return merged[: max(1, int(limit))]
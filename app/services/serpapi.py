@@ -2,6 +2,7 @@ from typing import Dict, List, Optional
 
 import httpx
 
+from app.services.host_guard import host_guard
 from app.services.interfaces import ISearchProvider
 
 SearchHit = Dict[str, str]
@@ -31,10 +32,11 @@ class SerpAPIProvider(ISearchProvider):
         }
         headers = {"User-Agent": self.user_agent, "Accept": "application/json"}
 
-        async with httpx.AsyncClient(timeout=self.timeout_s, headers=headers) as client:
-            r = await client.get("https://serpapi.com/search.json", params=params)
-            r.raise_for_status()
-            data = r.json()
+        async with host_guard.slot("https://serpapi.com/search.json"):
+            async with httpx.AsyncClient(timeout=self.timeout_s, headers=headers) as client:
+                r = await client.get("https://serpapi.com/search.json", params=params)
+                r.raise_for_status()
+                data = r.json()
 
         organic = data.get("organic_results") or []
         hits: List[Dict[str, str]] = []
@@ -1,11 +1,17 @@
 import re
+import time
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
 import httpx
 
 from app.core.config import config
+from app.core.metrics import WEB_REQUEST_DURATION
+from app.core.timing import timed
+from app.services.domain_matcher import DomainMatcher
+from app.services.host_guard import HostGuard, host_guard
 from app.services.interfaces import ISearchProvider
+from app.services.page_cache import CachedPage, PageCache
 
 SearchHit = Dict[str, str]
 Page = Dict[str, str]
@@ -15,8 +21,11 @@ class WebClient:
     """
     Minimal async web client for ContentAgent.
     - search(query): Delegate to ISearchProvider (RuntimeError if no provider).
-    - fetch(url): Get request and extract title and snippet.
-    - optional whitelist: WEB_WHITELIST = "wikipedia.org, mdn.mozilla.org"
+    - fetch(url): Get request and extract title and snippet (through PageCache when given: revalidated
+      with ETag/Last-Modified instead of re-downloaded).
+    - fetches go through HostGuard (per-host concurrency, circuit breaker); prefer_healthy() orders hits by host health.
+    - optional whitelist: WEB_WHITELIST = "wikipedia.org, mdn.mozilla.org" (wildcards and "!" deny rules, see
+      DomainMatcher); allowed_hits() drops search hits outside it before anything is fetched.
     """
 
     def __init__(
@@ -24,11 +33,16 @@ class WebClient:
         *,
         search_provider: Optional[ISearchProvider] = None,
         whitelist: Optional[List[str]] = None,
+        matcher: Optional[DomainMatcher] = None,
         timeout_s: int = 10,
         user_agent: Optional[str] = None,
+        page_cache: Optional[PageCache] = None,
+        guard: Optional[HostGuard] = None,
     ) -> None:
         self._provider = search_provider
-        self._whitelist = [d.strip().lower() for d in (whitelist or []) if d.strip()]
+        self._page_cache = page_cache
+        self._guard = guard or host_guard
+        self._matcher = matcher if matcher is not None else DomainMatcher(whitelist or [])
         self._timeout_s = int(timeout_s)
         self._ua = user_agent or config.WEB_USER_AGENT
 
@@ -37,29 +51,60 @@ class WebClient:
             # In production, deliberate decision: if no search provider, fail-fast,
             # in test, inject FakeSearchProvider.
             raise RuntimeError("No search provider configured. Set WEB_SEARCH_PROVIDER or inject one.")
-        hits = await self._provider.search(query, limit=limit)
+        with WEB_REQUEST_DURATION.labels(op="search").time(), timed("search"):
+            hits = await self._provider.search(query, limit=limit)
         return hits[: max(1, int(limit))]
 
     async def fetch(self, url: str) -> Page:
         if not self._is_allowed(url):
             raise ValueError(f"url_not_whitelisted: {url}")
+        if self._page_cache is None:
+            page = await self._download(url, None)
+        else:
+            page = await self._page_cache.get(url, self._download)
+        return {"title": page["title"], "url": url, "snippet": page["snippet"]}
 
+    async def _download(self, url: str, cached: Optional[CachedPage]) -> Optional[CachedPage]:
+        """GET and extract; conditional when `cached` has validators (None on 304 Not Modified)."""
         headers = {"User-Agent": self._ua, "Accept": "text/html,application/xhtml+xml"}
-        async with httpx.AsyncClient(timeout=self._timeout_s, follow_redirects=True, headers=headers) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            html = resp.text or ""
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = str(cached["etag"])
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = str(cached["last_modified"])
 
-        title = self._extract_title(html) or self._host_as_title(url)
-        snippet = self._extract_meta_description(html) or self._first_p_tag(html) or ""
-        return {"title": title, "url": url, "snippet": snippet}
+        with WEB_REQUEST_DURATION.labels(op="fetch").time(), timed("fetch", host=urlparse(url).hostname or ""):
+            async with self._guard.slot(url):
+                async with httpx.AsyncClient(timeout=self._timeout_s, follow_redirects=True, headers=headers) as client:
+                    resp = await client.get(url)
+                    if resp.status_code == 304 and cached is not None:
+                        return None
+                    resp.raise_for_status()
+                    html = resp.text or ""
+
+        page: CachedPage = {
+            "title": self._extract_title(html) or self._host_as_title(url),
+            "url": url,
+            "snippet": self._extract_meta_description(html) or self._first_p_tag(html) or "",
+            "fetched_at": time.time(),
+            "cacheable": "no-store" not in resp.headers.get("Cache-Control", "").lower(),
+        }
+        if resp.headers.get("ETag"):
+            page["etag"] = resp.headers["ETag"]
+        if resp.headers.get("Last-Modified"):
+            page["last_modified"] = resp.headers["Last-Modified"]
+        return page
+
+    def allowed_hits(self, hits: List[SearchHit]) -> List[SearchHit]:
+        return [h for h in hits if self._is_allowed(h.get("url", ""))]
+
+    def prefer_healthy(self, hits: List[SearchHit]) -> List[SearchHit]:
+        """Hits on hosts with an open circuit or recent errors last (stable otherwise)."""
+        return sorted(hits, key=lambda h: self._guard.rank(h.get("url", "")))
 
     # ---- helpers ----
     def _is_allowed(self, url: str) -> bool:
-        if not self._whitelist:
-            return True
-        host = (urlparse(url).hostname or "").lower()
-        return any(host == d or host.endswith("." + d) for d in self._whitelist)
+        return self._matcher.allows(url)
 
     @staticmethod
     def _extract_title(html: str) -> Optional[str]:
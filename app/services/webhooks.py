@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import httpx
+import orjson
+
+from app.core.config import config
+from app.repositories.mongodb.webhook_deliveries import WebhookDeliveriesRepository
+from app.schemas.api import JobStatus as JobStatusDTO
+from app.schemas.jobs import JobDoc
+from app.schemas.webhooks import (
+    WebhookAttempt,
+    WebhookDelivery,
+    WebhookDeliveryStatus,
+    WebhookEventType,
+)
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Agentic-Signature"
+TIMESTAMP_HEADER = "X-Agentic-Timestamp"
+EVENT_HEADER = "X-Agentic-Event"
+DELIVERY_HEADER = "X-Agentic-Delivery"
+
+
+def sign_payload(secret: str, timestamp: str, body: bytes) -> str:
+    """HMAC-SHA256 over "<timestamp>.<body>" -> 'sha256=<hex>'."""
+    mac = hmac.new(secret.encode("utf-8"), timestamp.encode("utf-8") + b"." + body, hashlib.sha256)
+    return f"sha256={mac.hexdigest()}"
+
+
+def verify_signature(secret: str, timestamp: str, body: bytes, signature: str, *, tolerance_s: int = 300) -> bool:
+    """Receiver-side check: valid HMAC and timestamp within tolerance (replay protection)."""
+    try:
+        if abs(time.time() - int(timestamp)) > tolerance_s:
+            return False
+    except (TypeError, ValueError):
+        return False
+    return hmac.compare_digest(sign_payload(secret, timestamp, body), signature or "")
+
+
+class DeliveryOutcome(NamedTuple):
+    delivery: WebhookDelivery
+    retry_in_s: Optional[float]  # schedule the next attempt after this delay; None when the delivery is finished
+
+
+class WebhookDispatcher:
+    """
+    Push job results to the client's webhook_url.
+    - One pooled httpx.AsyncClient per process (keep-alive across deliveries).
+    - HMAC-signed body with WEBHOOK_SECRET (see sign_payload / verify_signature); without a secret nothing is sent.
+    - One attempt per call: on network errors, 429 and 5xx the outcome carries an exponential backoff with full
+      jitter, which the caller schedules (Celery countdown) instead of sleeping; other 4xx are final.
+    - Per-host semaphore so a slow receiver cannot take all connections.
+    - Every delivery (with its attempts) is recorded in Mongo 'webhook_deliveries', rewritten after each attempt.
+    """
+
+    def __init__(
+        self,
+        *,
+        secret: Optional[str] = None,
+        deliveries_repo: Optional[WebhookDeliveriesRepository] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout_s: float = config.WEBHOOK_TIMEOUT_S,
+        max_attempts: int = config.WEBHOOK_MAX_ATTEMPTS,
+        backoff_base_s: float = config.WEBHOOK_BACKOFF_BASE_S,
+        backoff_max_s: float = config.WEBHOOK_BACKOFF_MAX_S,
+        per_host_concurrency: int = config.WEBHOOK_PER_HOST_CONCURRENCY,
+    ) -> None:
+        self._secret = secret or config.WEBHOOK_SECRET
+        self._deliveries = deliveries_repo or WebhookDeliveriesRepository()
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout_s,
+            headers={"User-Agent": "AgenticAPI/Webhooks", "Content-Type": "application/json"},
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        self._max_attempts = max(1, int(max_attempts))
+        self._backoff_base_s = float(backoff_base_s)
+        self._backoff_max_s = float(backoff_max_s)
+        self._per_host_concurrency = max(1, int(per_host_concurrency))
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    # ---- public API ----
+
+    async def dispatch_job(
+        self, job: JobDoc, event: WebhookEventType, *, delivery_id: Optional[str] = None, attempt: int = 1
+    ) -> Optional[DeliveryOutcome]:
+        if not job.webhook_url:
+            return None
+        payload = {"event": event.value, **JobStatusDTO.from_job(job).model_dump(mode="json")}
+        return await self.deliver(
+            str(job.webhook_url),
+            payload,
+            job_id=job.job_id,
+            request_id=job.request_id,
+            event=event,
+            delivery_id=delivery_id,
+            attempt=attempt,
+        )
+
+    async def deliver(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        *,
+        job_id: str,
+        request_id: str,
+        event: WebhookEventType,
+        delivery_id: Optional[str] = None,
+        attempt: int = 1,
+    ) -> Optional[DeliveryOutcome]:
+        """Make attempt number `attempt` of a delivery (a new one when `delivery_id` is None); None when not sent."""
+        if not self._secret:
+            logger.warning("WEBHOOK_SECRET is not set; skipping webhook %s for job %s", event.value, job_id)
+            return None
+
+        delivery = await self._load(delivery_id) if delivery_id else None
+        if delivery is None:
+            delivery = WebhookDelivery(
+                delivery_id=delivery_id or f"wh_{uuid.uuid4().hex}",
+                job_id=job_id,
+                request_id=request_id,
+                event=event,
+                url=url,
+                status=WebhookDeliveryStatus.pending,
+            )
+        body = orjson.dumps(payload, default=str)
+
+        status_code, error, duration_ms = await self._attempt(url, body, delivery.delivery_id, event)
+        delivery.attempts.append(WebhookAttempt(attempt=attempt, status_code=status_code, error=error, duration_ms=duration_ms))
+        retry_in_s = None
+        if status_code is not None and 200 <= status_code < 300:
+            delivery.status = WebhookDeliveryStatus.delivered
+        elif self._is_retryable(status_code) and attempt < self._max_attempts:
+            delivery.status = WebhookDeliveryStatus.pending
+            retry_in_s = self._backoff(attempt)
+        else:
+            delivery.status = WebhookDeliveryStatus.failed
+        if retry_in_s is None:
+            delivery.finished_at = datetime.now(timezone.utc)
+
+        try:
+            await self._deliveries.record(delivery)
+        except Exception as e:
+            # delivery log is best-effort; never fail the caller because of it
+            logger.warning("failed to record webhook delivery %s: %s", delivery.delivery_id, e)
+        return DeliveryOutcome(delivery, retry_in_s)
+
+    # ---- helpers ----
+
+    async def _load(self, delivery_id: str) -> Optional[WebhookDelivery]:
+        try:
+            return await self._deliveries.get(delivery_id)
+        except Exception as e:
+            # previous attempts are lost from the log, the delivery itself goes on
+            logger.warning("failed to load webhook delivery %s: %s", delivery_id, e)
+            return None
+
+    async def _attempt(self, url: str, body: bytes, delivery_id: str, event: WebhookEventType):
+        ts = str(int(time.time()))
+        headers = {
+            EVENT_HEADER: event.value,
+            DELIVERY_HEADER: delivery_id,
+            TIMESTAMP_HEADER: ts,
+            SIGNATURE_HEADER: sign_payload(self._secret, ts, body),
+        }
+        started = time.perf_counter()
+        status_code, error = None, None
+        try:
+            async with self._slot(url):
+                resp = await self._client.post(url, content=body, headers=headers)
+            status_code = resp.status_code
+        except httpx.HTTPError as e:
+            error = f"{type(e).__name__}: {e}"
+        return status_code, error, round((time.perf_counter() - started) * 1000, 2)
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        sem = self._host_slots.get(host)
+        if sem is None:
+            sem = self._host_slots[host] = asyncio.Semaphore(self._per_host_concurrency)
+        return sem
+
+    @staticmethod
+    def _is_retryable(status_code: Optional[int]) -> bool:
+        # network error / timeout, throttled, or server-side failure
+        return status_code is None or status_code == 429 or status_code >= 500
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: U(0, min(max, base * 2^(attempt-1)))
+        cap = min(self._backoff_max_s, self._backoff_base_s * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+
+_DISPATCHER: Optional[WebhookDispatcher] = None
+
+
+def get_webhook_dispatcher() -> WebhookDispatcher:
+    """Process-wide dispatcher so the HTTP connection pool is reused across deliveries."""
+    global _DISPATCHER
+    if _DISPATCHER is None:
+        _DISPATCHER = WebhookDispatcher()
+    return _DISPATCHER
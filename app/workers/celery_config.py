@@ -1,6 +1,27 @@
+import logging
+import os
+
+import orjson
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown, worker_ready
+from kombu.serialization import register
+from prometheus_client import multiprocess, start_http_server
 
 from app.core.config import config
+from app.core.metrics import exposition_registry, is_multiprocess
+from app.core.tracing import setup_tracing, shutdown_tracing
+
+logger = logging.getLogger(__name__)
+
+
+def _orjson_dumps(obj) -> bytes:
+    # task args are plain JSON types; anything else (UUID, Decimal...) is sent as its str()
+    return orjson.dumps(obj, default=str)
+
+
+# orjson task payloads, accepted alongside "json"; producers keep sending json until CELERY_TASK_SERIALIZER=orjson,
+# so a rolling deploy never publishes messages that not-yet-upgraded workers would reject
+register("orjson", _orjson_dumps, orjson.loads, content_type="application/x-orjson", content_encoding="utf-8")
 
 # Initialize Celery
 celery_app = Celery(
@@ -16,9 +37,54 @@ celery_app.conf.update(
     task_ignore_result=False,
     result_extended=True,
     result_serializer="json",
-    task_serializer="json",
-    accept_content=["json"],
+    task_serializer=config.CELERY_TASK_SERIALIZER,
+    accept_content=["orjson", "json"],
     task_routes={
         "run_agent_task": {"queue": f"{config.QUEUE_NAME}"},
+        "deliver_webhook": {"queue": f"{config.QUEUE_NAME}"},
+        "reap_stale_jobs": {"queue": f"{config.QUEUE_NAME}"},
+    },
+    beat_schedule={
+        "reap-stale-jobs": {
+            "task": "reap_stale_jobs",
+            "schedule": float(config.JOB_REAPER_INTERVAL_S),
+            "options": {"expires": float(config.JOB_REAPER_INTERVAL_S)},
+        },
     },
 )
+
+
+# ---- Prometheus exporter (prefork-safe) ----
+
+
+@worker_ready.connect
+def _start_metrics_exporter(**_):
+    """Serve worker metrics from the parent process; children write to PROMETHEUS_MULTIPROC_DIR."""
+    if not config.METRICS_WORKER_PORT:
+        return
+    if not is_multiprocess():
+        logger.warning("PROMETHEUS_MULTIPROC_DIR is not set; prefork child metrics will not be exported")
+    try:
+        start_http_server(int(config.METRICS_WORKER_PORT), registry=exposition_registry())
+    except OSError as e:
+        # another worker on this host already serves the (shared) multiprocess directory
+        logger.warning("metrics exporter not started on port %s: %s", config.METRICS_WORKER_PORT, e)
+
+
+@worker_process_shutdown.connect
+def _mark_metrics_process_dead(pid=None, **_):
+    if is_multiprocess():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+# ---- Tracing (per child process: exporter threads must start after fork) ----
+
+
+@worker_process_init.connect
+def _init_tracing(**_):
+    setup_tracing("agentic-worker")
+
+
+@worker_process_shutdown.connect
+def _flush_tracing(**_):
+    shutdown_tracing()
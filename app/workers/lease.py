@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import os
+import socket
+from typing import Awaitable, Optional, TypeVar
+
+from app.core.config import config
+from app.repositories.mongodb.jobs import JobsRepository
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LeaseLost(Exception):
+    """Raised inside the worker when its job lease was taken over (reaped and requeued, canceled or finished)."""
+
+    code = "lease_lost"
+
+
+def worker_identity() -> str:
+    """Lease owner id: unique per worker process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaseKeeper:
+    """
+    Renews a job lease in the background while the agent runs.
+
+    Usage:
+        async with LeaseKeeper(jobs, job_id, owner=owner) as lease:
+            await lease.guard(agent.run(...))
+
+    If a renewal is refused (job reaped, canceled or finished elsewhere) `lost` is set, the
+    heartbeat stops and the guarded run is cancelled (LeaseLost), so a requeued job never runs
+    on two workers at once; the worker's guarded succeed/fail also refuse to write a stale outcome.
+    """
+
+    def __init__(
+        self,
+        jobs: JobsRepository,
+        job_id: str,
+        *,
+        owner: str,
+        ttl_s: int = config.JOB_LEASE_TTL_S,
+        interval_s: float = config.JOB_LEASE_RENEW_INTERVAL_S,
+    ) -> None:
+        self._jobs = jobs
+        self._job_id = job_id
+        self._owner = owner
+        self._ttl_s = int(ttl_s)
+        self._interval_s = float(interval_s)
+        self._task: Optional[asyncio.Task] = None
+        self._lost = asyncio.Event()
+        self.lost = False
+
+    async def __aenter__(self) -> "LeaseKeeper":
+        self._task = asyncio.create_task(self._beat())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def guard(self, aw: Awaitable[T]) -> T:
+        """Run `aw` until it completes or the lease is lost; then it is cancelled and LeaseLost is raised."""
+        work = asyncio.ensure_future(aw)
+        watcher = asyncio.ensure_future(self._lost.wait())
+        try:
+            done, _ = await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if work in done:
+                return work.result()
+            work.cancel()
+            await asyncio.gather(work, return_exceptions=True)
+            raise LeaseLost(f"lease lost for job {self._job_id} (owner {self._owner})")
+        finally:
+            for task in (watcher, work):
+                if not task.done():
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_s)
+            try:
+                renewed = await self._jobs.renew_lease(self._job_id, owner=self._owner, ttl_s=self._ttl_s)
+            except Exception as e:
+                # transient DB error: keep trying, the lease TTL leaves room for a few misses
+                logger.warning("lease renewal failed for job %s: %s", self._job_id, e)
+                continue
+            if not renewed:
+                self.lost = True
+                self._lost.set()
+                logger.warning("lease lost for job %s (owner %s)", self._job_id, self._owner)
+                return
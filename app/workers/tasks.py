@@ -1,16 +1,32 @@
 import asyncio
-from typing import List
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
 import httpx
 from celery import Task
 
+from app.core.config import config
+from app.core.logging import default_logger, log_execution
+from app.core.metrics import AGENT_RUN_DURATION, JOB_OUTCOMES, JOB_QUEUE_WAIT
+from app.core.timing import JobTimer, timed
+from app.core.tracing import TRACE_HEADERS, inject_headers, span_from_headers
 from app.peer.peer_agent import PeerAgent
 from app.peer.registry import AgentRegistry
 from app.repositories.mongodb.jobs import JobsRepository
 from app.repositories.mongodb.log_events import LogEventsRepository
-from app.schemas.jobs import JobError, JobResult, JobStatusEnum
+from app.schemas.jobs import JobDoc, JobError, JobResult
 from app.schemas.logs import LogEvent, LogType
+from app.schemas.webhooks import WebhookEventType
+from app.services.cancellation import CancellationBus, JobCanceled, run_cancellable
+from app.services.partial_output import PartialOutputBuffer
+from app.services.result_store import ResultStore
+from app.services.webhooks import get_webhook_dispatcher
 from app.workers.celery_config import celery_app
+from app.workers.lease import LeaseKeeper, LeaseLost, worker_identity
+
+logger = logging.getLogger(__name__)
 
 _LOOP = None
 
@@ -23,6 +39,203 @@ def _get_loop():
     return _LOOP
 
 
+def _message_headers(task: Task) -> Dict[str, Any]:
+    """Custom headers of the current Celery message (protocol 2 exposes them as request attributes)."""
+    headers = dict(task.request.headers or {})
+    for key in TRACE_HEADERS:
+        value = task.request.get(key)
+        if value:
+            headers[key] = value
+    return headers
+
+
+def _notify_webhook(job: JobDoc, event: WebhookEventType) -> None:
+    """Publish a webhook delivery for a terminal transition (separate task; never blocks the agent slot)."""
+    if not job.webhook_url:
+        return
+    try:
+        headers = inject_headers({"request_id": job.request_id})
+        deliver_webhook.apply_async(kwargs={"job_id": job.job_id, "event": event.value}, headers=headers)
+    except Exception as e:
+        # best-effort: the result is still available via polling
+        logger.warning("failed to enqueue webhook for job %s: %s", job.job_id, e)
+
+
+async def execute_job(
+    job_id: str,
+    request_id: str,
+    *,
+    jobs: Optional[JobsRepository] = None,
+    logs: Optional[LogEventsRepository] = None,
+    cancel_bus: Optional[CancellationBus] = None,
+    result_store: Optional[ResultStore] = None,
+    owner: Optional[str] = None,
+) -> None:
+    """
+    Async body of run_agent_task, importable so a worker can be driven in-process (benchmarks, tests).
+    Collaborators default to the production ones; pass stand-ins to run without Mongo/Redis.
+    """
+    timer = JobTimer()
+    with timer.bind():
+        await _execute_job(
+            job_id,
+            request_id,
+            timer,
+            jobs=jobs or JobsRepository(),
+            logs=logs or LogEventsRepository(),
+            cancel_bus=cancel_bus or CancellationBus(),
+            result_store=result_store or ResultStore(),
+            owner=owner or worker_identity(),
+        )
+
+
+async def _execute_job(
+    job_id: str,
+    request_id: str,
+    timer: JobTimer,
+    *,
+    jobs: JobsRepository,
+    logs: LogEventsRepository,
+    cancel_bus: CancellationBus,
+    result_store: ResultStore,
+    owner: str,
+) -> None:
+    # 1) claim-and-load: queued -> running, leased to this worker process, attempts += 1 (one round trip)
+    with timed("claim"):
+        job = await jobs.claim(job_id, owner=owner, ttl_s=config.JOB_LEASE_TTL_S)
+    if not job:
+        # State race condition (already transitioned, canceled, leased by a live worker, or gone)
+        await logs.push(
+            LogEvent(
+                job_id=job_id,
+                request_id=request_id,
+                type=LogType.error,
+                payload={"stage": "transition", "msg": "state_not_queued_or_already_taken"},
+            )
+        )
+        return
+
+    task_text: str = job.task
+    created_at = job.created_at if job.created_at.tzinfo else job.created_at.replace(tzinfo=timezone.utc)
+    queue_wait_s = max(0.0, (datetime.now(timezone.utc) - created_at).total_seconds())
+    JOB_QUEUE_WAIT.observe(queue_wait_s)
+    timer.record("queue_wait", queue_wait_s)
+    agent_name = "unrouted"
+
+    # progress tasks to collect and flush before loop ends
+    pending_progress: List[asyncio.Task] = []
+
+    def progress_cb(value: float) -> None:
+        try:
+            t1 = asyncio.create_task(jobs.progress(job_id, float(value)))
+            t2 = asyncio.create_task(
+                logs.push(LogEvent(job_id=job_id, request_id=request_id, type=LogType.tool_call, payload={"progress": float(value)}))
+            )
+            pending_progress.extend([t1, t2])
+        except Exception:
+            # best-effort
+            pass
+
+    try:
+        # 2) routing: decided at submit time; jobs queued without a decision (older submits) are routed here
+        events = [LogEvent(job_id=job_id, request_id=request_id, type=LogType.agent_started, payload={})]
+        writes = []
+        if job.decided_agent:
+            decision = {"agent": job.decided_agent, "reason": job.reason or ""}
+        else:
+            with timed("routing"):
+                decision = PeerAgent.decide(task_text, task_hash=job.task_hash)
+            events.append(LogEvent(job_id=job_id, request_id=request_id, type=LogType.route_decision, payload=decision))
+            writes.append(jobs.set_decision(job_id, agent=decision["agent"], reason=decision.get("reason", "")))
+        agent_name = decision["agent"]
+        events.append(LogEvent(job_id=job_id, request_id=request_id, type=LogType.agent_started, payload={"agent": agent_name}))
+        with timed("db_write", op="set_decision" if writes else "log_events"):
+            # decision on the job and the start events written concurrently (one round trip of latency)
+            await asyncio.gather(logs.push_many(events), *writes)
+
+        # 3) agent run
+        agent = AgentRegistry.get(decision["agent"])
+
+        partial = PartialOutputBuffer(lambda text: jobs.set_partial_output(job_id, text))
+        run_started = time.perf_counter()
+        async with LeaseKeeper(jobs, job_id, owner=owner) as lease:
+            try:
+                # stops on a cancel request (JobCanceled) or when another worker took the job over (LeaseLost)
+                result_obj = await lease.guard(
+                    run_cancellable(
+                        agent.run(
+                            task_text,
+                            job_id=job_id,
+                            request_id=request_id,
+                            progress_cb=progress_cb,
+                            stream_cb=partial.append,
+                        ),
+                        job_id=job_id,
+                        bus=cancel_bus,
+                    )
+                )
+            finally:
+                await partial.aclose()
+                timer.record("agent_run", time.perf_counter() - run_started, agent=agent_name)
+                AGENT_RUN_DURATION.labels(agent=agent_name).observe(time.perf_counter() - run_started)
+
+        job_result = JobResult(agent=decision["agent"], output=result_obj.model_dump(mode="json"))
+
+        # 4) succeed + progress 1.0 in one update (large outputs are offloaded to 'job_results'; the job keeps a reference)
+        inline_result, result_ref = await result_store.offload(job_id, job_result)
+        ok = await jobs.succeed(job_id, inline_result, result_ref=result_ref, lease_owner=owner, metrics=timer.as_dict())
+        if not ok and result_ref:
+            await result_store.discard(result_ref)
+        if ok:
+            await logs.push(
+                LogEvent(job_id=job_id, request_id=request_id, type=LogType.agent_finished, payload={"agent": decision["agent"]})
+            )
+            JOB_OUTCOMES.labels(agent=agent_name, outcome="succeeded").inc()
+            _notify_webhook(job, WebhookEventType.job_succeeded)
+        else:
+            await logs.push(
+                LogEvent(
+                    job_id=job_id, request_id=request_id, type=LogType.error, payload={"stage": "succeed", "msg": "state_not_modified"}
+                )
+            )
+
+        # pending progress/log tasks flush
+        if pending_progress:
+            await asyncio.gather(*pending_progress, return_exceptions=True)
+
+    except JobCanceled:
+        # status already set to canceled by the API; just record where the run stopped
+        await logs.push(LogEvent(job_id=job_id, request_id=request_id, type=LogType.job_canceled, payload={"stage": "agent_run"}))
+        JOB_OUTCOMES.labels(agent=agent_name, outcome="canceled").inc()
+        _notify_webhook(job, WebhookEventType.job_canceled)
+        if pending_progress:
+            await asyncio.gather(*pending_progress, return_exceptions=True)
+
+    except LeaseLost:
+        # the job was requeued (or finished) elsewhere; its outcome belongs to the new owner, nothing to write or retry
+        await logs.push(
+            LogEvent(job_id=job_id, request_id=request_id, type=LogType.error, payload={"stage": "agent_run", "msg": "lease_lost"})
+        )
+        if pending_progress:
+            await asyncio.gather(*pending_progress, return_exceptions=True)
+
+    except Exception as e:
+        err = JobError(
+            code=getattr(e, "code", "agent_run_error"),
+            message=str(e),
+            retryable=isinstance(e, (httpx.HTTPError, TimeoutError)),
+        )
+        failed = await jobs.fail(job_id, err, lease_owner=owner, metrics=timer.as_dict())
+        await logs.push(LogEvent(job_id=job_id, request_id=request_id, type=LogType.error, payload={"stage": "agent_run", "err": str(e)}))
+        if failed:
+            JOB_OUTCOMES.labels(agent=agent_name, outcome="failed").inc()
+            _notify_webhook(job, WebhookEventType.job_failed)
+        # pending progress/log tasks flush (even on error)
+        if pending_progress:
+            await asyncio.gather(*pending_progress, return_exceptions=True)
+        raise
+
+
 @celery_app.task(
     bind=True,
     name="run_agent_task",
@@ -37,117 +250,83 @@ def _get_loop():
 def run_agent_task(self: Task, *, job_id: str, request_id: str) -> None:
     """
     Flow:
-      1) queued -> running
-      2) Peer decision -> set_decision + log
-      3) Agent.run(...) (async) -> JobResult
-      4) succeed | fail (+ progress & logs)
+      1) claim: queued -> running + load the job in one update (expired leases can be taken over after a worker crash)
+      2) routing decision from submit time (PeerAgent.decide only for jobs without one)
+      3) Agent.run(...) (async, cancellable via POST /jobs/{id}/cancel) -> JobResult
+      4) succeed | fail | canceled (+ progress & logs)
+    Stage timings (JobTimer) are persisted on job.metrics together with the final succeed/fail write.
+    A PROFILE_JOB_SAMPLE_RATE fraction of executions runs under the profiler (see app.core.profiling).
     """
 
-    async def _run() -> None:
-        jobs = JobsRepository()
-        logs = LogEventsRepository()
+    @log_execution(default_logger, profile_kind="job", profile_sample_rate=config.PROFILE_JOB_SAMPLE_RATE, profile_target="job_id")
+    async def _run(*, job_id: str) -> None:
+        await execute_job(job_id, request_id)
 
-        # Attempt counter (for retry observation by APM, etc.)
-        await jobs.set_attempts_inc(job_id, by=1)
-
-        # 1) queued -> running (atomic)
-        transitioned = await jobs.transition(
-            job_id,
-            to=JobStatusEnum.running,
-            expected_from=JobStatusEnum.queued,
-        )
-        if not transitioned:
-            # State race condition (already transitioned)
-            await logs.push(
-                LogEvent(
-                    job_id=job_id,
-                    request_id=request_id,
-                    type=LogType.error,
-                    payload={"stage": "transition", "msg": "state_not_queued_or_already_taken"},
-                )
-            )
-            return
+    loop = _get_loop()
+    # continue the API request's trace (W3C context published with the message)
+    with span_from_headers("run_agent_task", _message_headers(self), **{"job.id": job_id, "request.id": request_id}):
+        loop.run_until_complete(_run(job_id=job_id))
 
-        await logs.push(LogEvent(job_id=job_id, request_id=request_id, type=LogType.agent_started, payload={}))
 
-        # Job document from task text
-        job = await jobs.get(job_id)
-        if not job:
-            await jobs.fail(job_id, JobError(code="job_not_found", message="Job not found", retryable=False))
-            await logs.push(
-                LogEvent(job_id=job_id, request_id=request_id, type=LogType.error, payload={"stage": "load_job", "err": "job_not_found"})
-            )
-            return
+@celery_app.task(bind=True, name="deliver_webhook", max_retries=None)
+def deliver_webhook(self: Task, *, job_id: str, event: str, delivery_id: Optional[str] = None, attempt: int = 1) -> None:
+    """
+    Load the final job state and make one attempt to push it to job.webhook_url. A retryable failure is re-published
+    with a countdown (the dispatcher's backoff), so waiting for a slow receiver never holds a worker slot.
+    """
 
-        task_text: str = job.task
+    async def _run():
+        job = await JobsRepository().get(job_id)
+        if not job or not job.webhook_url:
+            return None
+        await ResultStore().hydrate(job)
+        return await get_webhook_dispatcher().dispatch_job(job, WebhookEventType(event), delivery_id=delivery_id, attempt=attempt)
 
-        # progress tasks to collect and flush before loop ends
-        pending_progress: List[asyncio.Task] = []
+    loop = _get_loop()
+    with span_from_headers("deliver_webhook", _message_headers(self), **{"job.id": job_id, "webhook.event": event}):
+        outcome = loop.run_until_complete(_run())
+    if outcome is not None and outcome.retry_in_s is not None:
+        kwargs = {"job_id": job_id, "event": event, "delivery_id": outcome.delivery.delivery_id, "attempt": attempt + 1}
+        raise self.retry(kwargs=kwargs, countdown=outcome.retry_in_s)
 
-        def progress_cb(value: float) -> None:
-            try:
-                t1 = asyncio.create_task(jobs.progress(job_id, float(value)))
-                t2 = asyncio.create_task(
-                    logs.push(LogEvent(job_id=job_id, request_id=request_id, type=LogType.tool_call, payload={"progress": float(value)}))
-                )
-                pending_progress.extend([t1, t2])
-            except Exception:
-                # best-effort
-                pass
 
+async def reap_jobs(*, jobs: JobsRepository, logs: LogEventsRepository, producer: Any) -> None:
+    """
+    Async body of reap_stale_jobs. Requeued jobs are re-published; when that fails they are failed (retryable),
+    as on submit, since nothing would pick up a queued job without a message. Failed jobs get their webhook.
+    """
+    requeued, failed = await jobs.reap_expired(ttl_s=config.JOB_LEASE_TTL_S, max_attempts=config.JOB_MAX_ATTEMPTS)
+    for job in requeued:
         try:
-            # 2) routing
-            decision = PeerAgent.decide(task_text)
-            await jobs.set_decision(job_id, agent=decision["agent"], reason=decision.get("reason", ""))
-            await logs.push(LogEvent(job_id=job_id, request_id=request_id, type=LogType.route_decision, payload=decision))
-
-            # 3) agent run
-            agent = AgentRegistry.get(decision["agent"])
-            await logs.push(
-                LogEvent(job_id=job_id, request_id=request_id, type=LogType.agent_started, payload={"agent": decision["agent"]})
-            )
-
-            result_obj = await agent.run(
-                task_text,
-                job_id=job_id,
-                request_id=request_id,
-                progress_cb=progress_cb,
-            )
+            producer.enqueue_execute(job_id=job.job_id, request_id=job.request_id, owner_user_id=job.owner_user_id, agent=job.decided_agent)
+        except Exception as e:
+            logger.error("failed to re-publish reaped job %s: %s", job.job_id, e)
+            err = JobError(code="queue_unavailable", message="Queue publish failed", retryable=True, detail={"exc": str(e)})
+            if await jobs.fail(job.job_id, err):
+                failed.append(job)
+            continue
+        await logs.push(
+            LogEvent(job_id=job.job_id, request_id=job.request_id, type=LogType.error, payload={"stage": "reaper", "action": "requeued"})
+        )
+    for job in failed:
+        await logs.push(
+            LogEvent(job_id=job.job_id, request_id=job.request_id, type=LogType.error, payload={"stage": "reaper", "action": "failed"})
+        )
+        _notify_webhook(job, WebhookEventType.job_failed)
 
-            job_result = JobResult(agent=decision["agent"], output=result_obj.model_dump(mode="json"))
 
-            # 4) succeed
-            ok = await jobs.succeed(job_id, job_result)
-            if ok:
-                await logs.push(
-                    LogEvent(job_id=job_id, request_id=request_id, type=LogType.agent_finished, payload={"agent": decision["agent"]})
-                )
-                await jobs.progress(job_id, 1.0)
-            else:
-                await logs.push(
-                    LogEvent(
-                        job_id=job_id, request_id=request_id, type=LogType.error, payload={"stage": "succeed", "msg": "state_not_modified"}
-                    )
-                )
+@celery_app.task(bind=True, name="reap_stale_jobs")
+def reap_stale_jobs(self: Task) -> None:
+    """
+    Periodic (celery beat): recover jobs stuck in `running` because their worker died.
+    Expired leases are requeued (and re-published) until JOB_MAX_ATTEMPTS, then failed.
+    """
 
-            # pending progress/log tasks flush
-            if pending_progress:
-                await asyncio.gather(*pending_progress, return_exceptions=True)
+    async def _run() -> None:
+        # lazy import: app.services.queue imports this module
+        from app.services.queue import Producer
 
-        except Exception as e:
-            err = JobError(
-                code=getattr(e, "code", "agent_run_error"),
-                message=str(e),
-                retryable=isinstance(e, (httpx.HTTPError, TimeoutError)),
-            )
-            await jobs.fail(job_id, err)
-            await logs.push(
-                LogEvent(job_id=job_id, request_id=request_id, type=LogType.error, payload={"stage": "agent_run", "err": str(e)})
-            )
-            # pending progress/log tasks flush (even on error)
-            if pending_progress:
-                await asyncio.gather(*pending_progress, return_exceptions=True)
-            raise
+        await reap_jobs(jobs=JobsRepository(), logs=LogEventsRepository(), producer=Producer())
 
     loop = _get_loop()
     loop.run_until_complete(_run())
@@ -0,0 +1,53 @@
+"""Shared helpers for benchmark scripts: timing summaries and JSON result output."""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+def summarize(samples_s: List[float]) -> Dict[str, float]:
+    """Latency summary in microseconds (n, mean, p50, p95, p99, max)."""
+    if not samples_s:
+        return {"n": 0}
+    us = sorted(s * 1e6 for s in samples_s)
+
+    def pct(p: float) -> float:
+        return us[min(len(us) - 1, int(round(p * (len(us) - 1))))]
+
+    return {
+        "n": len(us),
+        "mean_us": round(statistics.fmean(us), 2),
+        "p50_us": round(pct(0.50), 2),
+        "p95_us": round(pct(0.95), 2),
+        "p99_us": round(pct(0.99), 2),
+        "max_us": round(us[-1], 2),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def emit(name: str, results: Dict[str, Any], output: Optional[str] = None) -> Dict[str, Any]:
+    """Print (and optionally write) results with enough metadata to compare runs across commits."""
+    doc = {
+        "benchmark": name,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+    }
+    text = json.dumps(doc, indent=2, default=str)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    sys.stdout.write(text + "\n")
+    return doc
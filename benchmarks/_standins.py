@@ -0,0 +1,160 @@
+"""
+Local stand-ins for the external services used by the end-to-end benchmarks.
+
+- in-memory Mongo (mongomock-motor) installed as the MongoDB client
+- in-process broker: InProcessProducer feeds an asyncio.Queue consumed by execute_job() workers
+- LocalCancellationBus: asyncio.Event based CancellationBus (no Redis)
+- StubWebServer + StubSearchProvider: local HTTP pages for ContentAgent search/fetch
+- fake (streaming) LLMs from tests/unit/fixtures/llm.py installed on the registry agents
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from app.core.config import config
+from app.db.mongodb.mongodb import MongoDB
+from app.peer.registry import AgentRegistry
+from app.services.web import WebClient
+from app.workers.tasks import execute_job
+from tests.unit.fixtures.llm import make_fake_llm, make_fake_streaming_llm
+
+CODE_PAYLOAD = {"language": "Python", "code": "def reverse(head):\n    prev = None\n    return prev", "explanation": "iterative"}
+CODE_TASK = "Write a Python function to reverse a linked list"
+CONTENT_TASK = "Research the history of the quicksort algorithm and summarize it with sources"
+
+
+def install_memory_mongo():
+    """Point MongoDB (and every repository) at an in-memory mongomock-motor client."""
+    from mongomock_motor import AsyncMongoMockClient
+
+    MongoDB.client = AsyncMongoMockClient()
+    return MongoDB.client[config.MONGO_DB]
+
+
+class LocalCancellationBus:
+    """CancellationBus with the same interface, backed by per-job asyncio.Events."""
+
+    def __init__(self) -> None:
+        self._events: Dict[str, asyncio.Event] = defaultdict(asyncio.Event)
+
+    async def request_cancel(self, job_id: str) -> None:
+        self._events[job_id].set()
+
+    async def is_canceled(self, job_id: str) -> bool:
+        return self._events[job_id].is_set()
+
+    async def wait(self, job_id: str) -> None:
+        await self._events[job_id].wait()
+
+
+class InProcessProducer:
+    """Producer stand-in: enqueue_execute puts (job_id, request_id) on an asyncio.Queue."""
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def enqueue_execute(self, *, job_id: str, request_id: str, owner_user_id: Optional[str] = None, agent: Optional[str] = None) -> None:
+        self.queue.put_nowait((job_id, request_id))
+
+    def enqueue_webhook(self, *, job_id: str, request_id: str, event: str) -> None:
+        pass  # benchmark jobs have no webhook_url
+
+
+class InProcessWorkers:
+    """N worker loops running execute_job() like a Celery prefork pool would (one job per worker)."""
+
+    def __init__(self, producer: InProcessProducer, cancel_bus: LocalCancellationBus, concurrency: int) -> None:
+        self._producer = producer
+        self._cancel_bus = cancel_bus
+        self._concurrency = concurrency
+        self._tasks: List[asyncio.Task] = []
+        self.errors = 0
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._loop(i)) for i in range(self._concurrency)]
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self, index: int) -> None:
+        owner = f"bench-worker:{index}"
+        while True:
+            job_id, request_id = await self._producer.queue.get()
+            try:
+                await execute_job(job_id, request_id, cancel_bus=self._cancel_bus, owner=owner)
+            except Exception:
+                # the job is already marked failed; Celery would retry/log here
+                self.errors += 1
+            finally:
+                self._producer.queue.task_done()
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        slug = self.path.strip("/") or "index"
+        body = (
+            f"<html><head><title>Page {slug}</title>"
+            f'<meta name="description" content="Stub page {slug} for benchmarks"></head>'
+            f"<body><p>Content of {slug}.</p></body></html>"
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubWebServer:
+    """Threaded local HTTP server serving small HTML pages (ContentAgent fetch target)."""
+
+    def __init__(self) -> None:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _PageHandler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubWebServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StubSearchProvider:
+    """ISearchProvider returning fixed hits on the stub web server."""
+
+    def __init__(self, base_url: str, n_hits: int = 5) -> None:
+        self._hits = [{"title": f"Page {i}", "url": f"{base_url}/page-{i}"} for i in range(n_hits)]
+
+    async def search(self, query: str, *, limit: int = 5) -> List[Dict[str, str]]:
+        return self._hits[:limit]
+
+
+def install_fake_agents(base_url: str, *, streaming: bool = True, chunk_size: int = 16) -> None:
+    """Create the registry agents once and swap their LLM/web client for the local stand-ins."""
+    content_payload = {
+        "answer": "Quicksort was published by Tony Hoare in 1961.",
+        "sources": [{"title": f"Page {i}", "url": f"{base_url}/page-{i}"} for i in range(2)],
+    }
+    make = (lambda p: make_fake_streaming_llm(p, chunk_size)) if streaming else make_fake_llm
+
+    code = AgentRegistry.get("code")
+    code.llm = make(CODE_PAYLOAD)
+
+    content = AgentRegistry.get("content")
+    content.llm = make(content_payload)
+    content.web = WebClient(search_provider=StubSearchProvider(base_url), timeout_s=config.WEB_TIMEOUT_S)
@@ -0,0 +1,93 @@
+"""
+Per-run LangChain overhead of CodeAgent/ContentAgent with a fake LLM (no network).
+
+Compares:
+  - per_run_build: what run() used to do every call (new PydanticOutputParser, get_format_instructions(),
+    prompt.partial(), prompt | llm | parser, then ainvoke)
+  - prebuilt:      BaseAgent._invoke_chain() with the parser/prompt/chain built once per agent
+
+Usage (env as for the app, e.g. `set -a; . ./.env.example; set +a`):
+    python -m benchmarks.agent_chain_overhead --iterations 2000 --output chain.json
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from langchain_core.output_parsers import PydanticOutputParser
+
+from app.agents.code.agent import CodeAgent
+from app.agents.code.prompts import CODE_PROMPT
+from app.agents.content.agent import ContentAgent
+from app.agents.content.prompts import CONTENT_PROMPT
+from app.schemas.agent_code import CodeOutput
+from app.schemas.agent_content import ContentOutput
+from benchmarks._common import emit, summarize
+from tests.unit.fixtures.llm import make_fake_llm
+
+CODE_PAYLOAD = {"language": "Python", "code": "def f():\n    return 42", "explanation": "simple"}
+CONTENT_PAYLOAD = {
+    "answer": "Quicksort is a divide and conquer sorting algorithm.",
+    "sources": [
+        {"title": "Quicksort", "url": "https://en.wikipedia.org/wiki/Quicksort"},
+        {"title": "Sorting HOWTO", "url": "https://docs.python.org/3/howto/sorting.html"},
+    ],
+}
+
+
+async def _time(fn: Callable[[], Awaitable[object]], iterations: int, warmup: int = 50) -> List[float]:
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+async def _bench_agent(agent, prompt, output_model, inputs, iterations: int) -> Dict[str, Dict[str, float]]:
+    async def per_run_build():
+        parser = PydanticOutputParser(pydantic_object=output_model)
+        p = prompt.partial(schema=parser.get_format_instructions())
+        return await (p | agent.llm | parser).ainvoke(inputs)
+
+    async def prebuilt():
+        return await agent._invoke_chain(inputs)
+
+    return {
+        "per_run_build": summarize(await _time(per_run_build, iterations)),
+        "prebuilt": summarize(await _time(prebuilt, iterations)),
+    }
+
+
+async def main(iterations: int, output: str = None) -> None:
+    code = CodeAgent()
+    code.llm = make_fake_llm(CODE_PAYLOAD)
+    content = ContentAgent()
+    content.llm = make_fake_llm(CONTENT_PAYLOAD)
+
+    results = {
+        "iterations": iterations,
+        "code": await _bench_agent(code, CODE_PROMPT, CodeOutput, {"task": "write a python function"}, iterations),
+        "content": await _bench_agent(
+            content,
+            CONTENT_PROMPT,
+            ContentOutput,
+            {"task": "what is quicksort?", "sources_block": "- Quicksort — https://en.wikipedia.org/wiki/Quicksort"},
+            iterations,
+        ),
+    }
+    for agent in ("code", "content"):
+        r = results[agent]
+        r["saved_per_run_us"] = round(r["per_run_build"]["mean_us"] - r["prebuilt"]["mean_us"], 2)
+    emit("agent_chain_overhead", results, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--output", default=None, help="write JSON results to this file")
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.output))
@@ -0,0 +1,211 @@
+"""
+End-to-end throughput and latency of the API + worker, in one process, with local stand-ins
+(see benchmarks/_standins.py): in-memory Mongo, in-process broker and workers, fake LLM,
+stub search provider and a local HTTP server for fetched pages. No Mongo/RabbitMQ/Redis/OpenAI needed.
+
+Scenarios:
+  submit       POST /agent/execute throughput (workers stopped, so only the API path is measured)
+  status_poll  GET /agent/jobs/{id} throughput on the submitted (queued) jobs
+  e2e          submit -> poll until terminal, with workers running: client-side latency distribution,
+               server-side created->finished latency and the per-stage breakdown from job.metrics
+
+Usage (env as for the app, e.g. `set -a; . ./.env.example; set +a`; needs `pip install -e .[bench]`):
+    python -m benchmarks.e2e --jobs 200 --concurrency 16 --workers 4 --output e2e.json
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+import httpx
+
+from app.api.deps import depends_orchestrator, require_authenticated_user
+from app.main import app
+from app.peer.peer_agent import PeerAgent
+from app.schemas.auth import ActorSchema
+from app.services.jobs_orchestrator import JobsOrchestrator
+from benchmarks._common import emit, summarize
+from benchmarks._standins import (
+    CODE_TASK,
+    CONTENT_TASK,
+    InProcessProducer,
+    InProcessWorkers,
+    LocalCancellationBus,
+    StubWebServer,
+    install_fake_agents,
+    install_memory_mongo,
+)
+
+TERMINAL = {"succeeded", "failed", "canceled"}
+BENCH_USER = ActorSchema(user_id=1, is_active=True)
+
+
+def _tasks(n: int, content_ratio: float) -> List[str]:
+    every = max(1, round(1 / content_ratio)) if content_ratio > 0 else 0
+    return [CONTENT_TASK if every and i % every == 0 else CODE_TASK for i in range(n)]
+
+
+async def _bounded(concurrency: int, items, fn):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(item):
+        async with sem:
+            return await fn(item)
+
+    return await asyncio.gather(*(_one(i) for i in items))
+
+
+async def _submit(client: httpx.AsyncClient, task: str):
+    t0 = time.perf_counter()
+    resp = await client.post("/api/v1/agent/execute", json={"task": task})
+    elapsed = time.perf_counter() - t0
+    resp.raise_for_status()
+    return resp.json()["job_id"], elapsed, t0
+
+
+async def _status(client: httpx.AsyncClient, job_id: str, include_metrics: bool = False):
+    params = {"include_metrics": "true"} if include_metrics else None
+    resp = await client.get(f"/api/v1/agent/jobs/{job_id}", params=params)
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def bench_submit(client, tasks: List[str], concurrency: int) -> Dict:
+    t0 = time.perf_counter()
+    results = await _bounded(concurrency, tasks, lambda t: _submit(client, t))
+    wall = time.perf_counter() - t0
+    return {
+        "job_ids": [r[0] for r in results],
+        "summary": {"rps": round(len(tasks) / wall, 1), "latency": summarize([r[1] for r in results])},
+    }
+
+
+async def bench_status_poll(client, job_ids: List[str], polls: int, concurrency: int) -> Dict:
+    ids = [job_ids[i % len(job_ids)] for i in range(polls)]
+    samples: List[float] = []
+
+    async def _one(job_id):
+        t0 = time.perf_counter()
+        await _status(client, job_id)
+        samples.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await _bounded(concurrency, ids, _one)
+    wall = time.perf_counter() - t0
+    return {"rps": round(polls / wall, 1), "latency": summarize(samples)}
+
+
+async def bench_e2e(client, tasks: List[str], concurrency: int, poll_interval_s: float) -> Dict:
+    async def _one(task):
+        job_id, _, submitted = await _submit(client, task)
+        while True:
+            body = await _status(client, job_id)
+            if body["status"] in TERMINAL:
+                done = time.perf_counter()
+                break
+            await asyncio.sleep(poll_interval_s)
+        final = await _status(client, job_id, include_metrics=True)
+        return done - submitted, final
+
+    t0 = time.perf_counter()
+    results = await _bounded(concurrency, tasks, _one)
+    wall = time.perf_counter() - t0
+
+    statuses: Dict[str, int] = defaultdict(int)
+    server_side: List[float] = []
+    stages: Dict[str, List[float]] = defaultdict(list)
+    for _, final in results:
+        statuses[final["status"]] += 1
+        created, updated = final["created_at"], final["updated_at"]
+        server_side.append(_parse_ts(updated) - _parse_ts(created))
+        for name, agg in ((final.get("metrics") or {}).get("stages") or {}).items():
+            stages[name].append(agg["total_ms"])
+
+    return {
+        "jobs_per_s": round(len(tasks) / wall, 1),
+        "statuses": dict(statuses),
+        "client_latency": summarize([r[0] for r in results]),
+        "server_latency": summarize(server_side),
+        # per-job total time spent in each stage (ms), from job.metrics
+        "stages_ms": {
+            name: {"n": len(v), "mean": round(statistics.fmean(v), 3), "p50": round(statistics.median(v), 3), "max": round(max(v), 3)}
+            for name, v in sorted(stages.items())
+        },
+    }
+
+
+def _parse_ts(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+async def main_async(args) -> Dict:
+    install_memory_mongo()
+    web = StubWebServer().start()
+    install_fake_agents(web.base_url, streaming=not args.no_streaming)
+    assert PeerAgent.decide(CODE_TASK)["agent"] == "code" and PeerAgent.decide(CONTENT_TASK)["agent"] == "content"
+
+    producer = InProcessProducer()
+    cancel_bus = LocalCancellationBus()
+    workers = InProcessWorkers(producer, cancel_bus, args.workers)
+    app.dependency_overrides[require_authenticated_user] = lambda: BENCH_USER
+    app.dependency_overrides[depends_orchestrator] = lambda: JobsOrchestrator(producer=producer, cancel_bus=cancel_bus)
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            tasks = _tasks(args.jobs, args.content_ratio)
+
+            submitted = await bench_submit(client, tasks, args.concurrency)
+            status_poll = await bench_status_poll(client, submitted["job_ids"], args.polls, args.concurrency)
+
+            # drain the submit scenario's backlog before measuring end-to-end latency
+            workers.start()
+            await producer.queue.join()
+            e2e = await bench_e2e(client, tasks, args.concurrency, args.poll_interval_ms / 1000.0)
+    finally:
+        await workers.stop()
+        app.dependency_overrides.clear()
+        web.stop()
+
+    return {
+        "config": {
+            "jobs": args.jobs,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "polls": args.polls,
+            "poll_interval_ms": args.poll_interval_ms,
+            "content_ratio": args.content_ratio,
+            "streaming": not args.no_streaming,
+        },
+        "submit": submitted["summary"],
+        "status_poll": status_poll,
+        "e2e": e2e,
+        "worker_errors": workers.errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent API clients")
+    parser.add_argument("--workers", type=int, default=4, help="in-process worker slots")
+    parser.add_argument("--polls", type=int, default=1000, help="status requests in the status_poll scenario")
+    parser.add_argument("--poll-interval-ms", type=float, default=5.0)
+    parser.add_argument("--content-ratio", type=float, default=0.5, help="fraction of jobs routed to ContentAgent")
+    parser.add_argument("--no-streaming", action="store_true", help="use the non-streaming fake LLM")
+    parser.add_argument("--log-level", default=None, help="app log level (default WARNING)")
+    parser.add_argument("--output", default=None, help="write JSON results to this file")
+    args = parser.parse_args()
+
+    # keep per-request JSON logs off stdout (the results are printed there); pass --log-level INFO to include them
+    logging.getLogger("app").setLevel((args.log_level or "WARNING").upper())
+    emit("e2e", asyncio.run(main_async(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Routing: rules vs the hashed n-gram ML router (needs the "ml" extra).
+
+Measures:
+  - accuracy of rules and ML on a holdout, and how many tasks ML hands back to the rules
+    at ROUTER_ML_MIN_CONFIDENCE
+  - latency per task: rules, ML one task per call, ML in batches of --batch
+
+Without --data a small synthetic Turkish/English set is generated (templates x topics), so the numbers show
+relative cost rather than real-world accuracy; pass a jsonl export from `app.peer.train_router --export` for that.
+
+Usage (env as for the app, e.g. `set -a; . ./.env.example; set +a`):
+    python -m benchmarks.router --n 4000 --batch 64 --output router.json
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List, Tuple
+
+from app.core.config import config
+from app.peer.ml_router import HashedNgramRouter
+from app.peer.peer_agent import PeerAgent
+from app.peer.train_router import evaluate, load_jsonl
+from benchmarks._common import emit, summarize
+
+_CODE = [
+    "write a python function that {t}",
+    "implement {t} in typescript",
+    "fix this bug: def f(x): return x[{n}] raises IndexError when {t}",
+    "bir python fonksiyonu yaz: {t}",
+    "{t} için sql sorgusu yazar mısın",
+    "refactor the class so that it {t}",
+    "```js\nconst x = {n};\n``` why does this fail when {t}",
+    "go ile {t} yapan bir kod örneği",
+]
+_CONTENT = [
+    "write a blog post about {t}",
+    "summarize recent news on {t}",
+    "{t} hakkında bir makale yaz",
+    "explain to a beginner why {t}",
+    "give me a short linkedin post on {t}",
+    "{t} konusunu araştır ve kaynak göster",
+    "what are the pros and cons of {t}",
+    "draft an email to the team about {t}",
+]
+_TOPICS = [
+    "sorts a list of users by signup date",
+    "parses csv files",
+    "retries failed http calls",
+    "caches database queries",
+    "remote work",
+    "electric cars",
+    "the history of istanbul",
+    "climate policy",
+    "yapay zeka etiği",
+    "kahve kültürü",
+    "validates email addresses",
+    "merges two sorted arrays",
+    "renewable energy",
+    "startup fundraising",
+    "deduplicates records",
+]
+
+
+def synthetic(n: int, seed: int) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        agent = rng.choice(("code", "content"))
+        template = rng.choice(_CODE if agent == "code" else _CONTENT)
+        out.append((template.format(t=rng.choice(_TOPICS), n=rng.randint(0, 99)), agent))
+    return out
+
+
+def _time_per_task(fn: Callable[[List[str]], object], tasks: List[str], batch: int) -> List[float]:
+    fn(tasks[:batch])  # warm-up
+    samples = []
+    for start in range(0, len(tasks), batch):
+        chunk = tasks[start : start + batch]
+        t0 = time.perf_counter()
+        fn(chunk)
+        samples.extend([(time.perf_counter() - t0) / len(chunk)] * len(chunk))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", help="jsonl with {task, agent} rows (see app.peer.train_router --export)")
+    parser.add_argument("--n", type=int, default=4000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    examples = load_jsonl(args.data) if args.data else synthetic(args.n, args.seed)
+    random.Random(args.seed).shuffle(examples)
+    n_test = max(1, len(examples) // 5)
+    test, train = examples[:n_test], examples[n_test:]
+    router = HashedNgramRouter().fit([t for t, _ in train], [a for _, a in train], seed=args.seed)
+
+    tasks = [t for t, _ in test]
+    rules_correct = sum(PeerAgent._decide(t)[0]["agent"] == a for t, a in test)
+    results = {
+        "dataset": args.data or f"synthetic:{args.n}",
+        "train": len(train),
+        "min_confidence": config.ROUTER_ML_MIN_CONFIDENCE,
+        "accuracy": {
+            "rules": round(rules_correct / len(test), 4),
+            "ml": evaluate(router, test, config.ROUTER_ML_MIN_CONFIDENCE),
+        },
+        "latency_per_task": {
+            "rules": summarize(_time_per_task(lambda c: [PeerAgent._decide(t) for t in c], tasks, 1)),
+            "ml_single": summarize(_time_per_task(router.predict_proba, tasks, 1)),
+            f"ml_batch_{args.batch}": summarize(_time_per_task(router.predict_proba, tasks, args.batch)),
+        },
+    }
+    emit("router", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
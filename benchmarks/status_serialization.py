@@ -0,0 +1,102 @@
+"""
+Serialization cost of the job status response for large results: stdlib JSONResponse vs ORJSONResponse.
+
+Measures, per result size:
+  - render:    Response.render() of the already jsonable status dict (the part the response class owns)
+  - endpoint:  GET through a FastAPI app with response_model=JobStatus (validation + serialization + render),
+               once with default_response_class=JSONResponse and once with ORJSONResponse
+
+Usage (env as for the app, e.g. `set -a; . ./.env.example; set +a`):
+    python -m benchmarks.status_serialization --sizes 1000,100000,1000000 --iterations 200 --output status.json
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.schemas.api import JobStatus
+from app.schemas.jobs import JobStatusEnum
+from benchmarks._common import emit, summarize
+
+RESPONSE_CLASSES = {"stdlib": JSONResponse, "orjson": ORJSONResponse}
+
+
+def make_status(result_chars: int) -> JobStatus:
+    now = datetime.now(timezone.utc)
+    line = "    total = sum(x * x for x in range(n))  # ünïcode ✓\n"
+    code = (line * (result_chars // len(line) + 1))[:result_chars]
+    return JobStatus(
+        job_id="j_bench",
+        status=JobStatusEnum.succeeded,
+        decided_agent="code",
+        result={"agent": "code", "output": {"language": "Python", "code": code, "explanation": "generated"}},
+        progress=1.0,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _time_sync(fn: Callable[[], object], iterations: int) -> List[float]:
+    for _ in range(min(20, iterations)):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+async def _time_endpoint(response_class, status: JobStatus, iterations: int) -> List[float]:
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/jobs/{job_id}", response_model=JobStatus)
+    async def get_status(job_id: str):
+        return status
+
+    samples = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for i in range(iterations + min(20, iterations)):
+            t0 = time.perf_counter()
+            resp = await client.get("/jobs/j_bench")
+            elapsed = time.perf_counter() - t0
+            resp.raise_for_status()
+            if i >= min(20, iterations):
+                samples.append(elapsed)
+    return samples
+
+
+async def run(sizes: List[int], iterations: int) -> Dict:
+    results: Dict[str, Dict] = {}
+    for size in sizes:
+        status = make_status(size)
+        content = status.model_dump(mode="json")
+        per_size: Dict[str, Dict] = {"body_bytes": len(ORJSONResponse(content).body)}
+        for name, cls in RESPONSE_CLASSES.items():
+            per_size[name] = {
+                "render": summarize(_time_sync(lambda: cls(content), iterations)),
+                "endpoint": summarize(await _time_endpoint(cls, status, iterations)),
+            }
+        results[f"{size}_chars"] = per_size
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="comma separated result sizes (characters)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", default=None, help="write JSON results to this file")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    emit("status_serialization", asyncio.run(run(sizes, args.iterations)), args.output)
+
+
+if __name__ == "__main__":
+    main()
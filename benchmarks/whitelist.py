@@ -0,0 +1,95 @@
+"""
+Whitelist lookup cost: the previous linear scan (`host == d or host.endswith("." + d)` over every entry)
+vs the compiled DomainMatcher (label walk over suffix tables).
+
+Measures, per allowlist size:
+  - build:  compiling the rule list (once per process with compile_rules)
+  - lookup: one allows(url) call, over a mix of allowed subdomains, allowed apexes and unknown hosts
+
+Usage:
+    python -m benchmarks.whitelist --sizes 100,1000,10000 --lookups 20000 --output whitelist.json
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+from urllib.parse import urlparse
+
+from app.services.domain_matcher import DomainMatcher
+from benchmarks._common import emit, summarize
+
+
+def make_domains(n: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    tlds = ["com", "org", "net", "io", "dev", "com.tr", "co.uk"]
+    return [f"site{i}-{rng.randrange(10**6)}.{rng.choice(tlds)}" for i in range(n)]
+
+
+def make_urls(domains: List[str], n: int, seed: int) -> List[str]:
+    rng = random.Random(seed + 1)
+    urls = []
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            urls.append(f"https://docs.{rng.choice(domains)}/page/{i}")
+        elif kind == 1:
+            urls.append(f"https://{rng.choice(domains)}/")
+        else:
+            urls.append(f"https://unknown{i}.example.com/x")
+    return urls
+
+
+def legacy_allowed(whitelist: List[str]) -> Callable[[str], bool]:
+    wl = [d.strip().lower() for d in whitelist if d.strip()]
+
+    def allowed(url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == d or host.endswith("." + d) for d in wl)
+
+    return allowed
+
+
+def _time(fn: Callable[[str], bool], urls: List[str]) -> List[float]:
+    for u in urls[:200]:
+        fn(u)
+    samples = []
+    for u in urls:
+        t0 = time.perf_counter()
+        fn(u)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = {}
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        domains = make_domains(size, args.seed)
+        urls = make_urls(domains, args.lookups, args.seed)
+
+        t0 = time.perf_counter()
+        matcher = DomainMatcher(domains)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        legacy = legacy_allowed(domains)
+        # same answers, or the comparison is meaningless
+        assert all(legacy(u) == matcher.allows(u) for u in urls[:2000])
+
+        lookups = args.lookups if size <= 1000 else min(args.lookups, 2000)  # the linear scan is slow at 10k
+        results[str(size)] = {
+            "build_ms": round(build_ms, 3),
+            "legacy_scan": summarize(_time(legacy, urls[:lookups])),
+            "domain_matcher": summarize(_time(matcher.allows, urls)),
+        }
+    emit("whitelist", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
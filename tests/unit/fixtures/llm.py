@@ -13,3 +13,18 @@ def make_fake_llm(payload: dict):
         return json.dumps(payload)
 
     return RunnableLambda(_fn)
+
+
+def make_fake_streaming_llm(payload: dict, chunk_size: int = 8):
+    """Streaming LLM stub: yields the JSON payload in `chunk_size` pieces (astream) like token deltas."""
+    from langchain_core.runnables import RunnableGenerator
+
+    text = json.dumps(payload)
+
+    async def _agen(_inputs):
+        async for _ in _inputs:
+            pass
+        for i in range(0, len(text), chunk_size):
+            yield text[i : i + chunk_size]
+
+    return RunnableGenerator(_agen)
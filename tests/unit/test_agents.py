@@ -1,8 +1,11 @@
 # tests/unit/test_agents.py
+import json
+
 import pytest
 
 from app.agents.code.agent import CodeAgent
-from tests.unit.fixtures.llm import make_fake_llm
+from app.services.partial_output import PartialOutputBuffer
+from tests.unit.fixtures.llm import make_fake_llm, make_fake_streaming_llm
 
 
 @pytest.mark.asyncio
@@ -21,3 +24,44 @@ async def test_code_agent_happy():
     assert out.language == "Python"
     assert "return 42" in out.code
     assert out.explanation == "simple"
+
+
+@pytest.mark.asyncio
+async def test_code_agent_streams_partial_output():
+    agent = CodeAgent()
+    fake_payload = {"language": "Python", "code": "def f():\n    return 42", "explanation": "simple"}
+    agent.llm = make_fake_streaming_llm(fake_payload, chunk_size=5)
+
+    chunks = []
+    out = await agent.run("Basit bir Python fonksiyonu yaz", job_id="j1", request_id="r1", stream_cb=chunks.append)
+
+    assert len(chunks) > 1
+    assert json.loads("".join(chunks)) == fake_payload
+    assert "return 42" in out.code
+
+
+@pytest.mark.asyncio
+async def test_partial_output_buffer_throttles_and_flushes_last_text():
+    writes = []
+
+    async def _flush(text):
+        writes.append(text)
+
+    buf = PartialOutputBuffer(_flush, interval_s=60, max_chars=10)
+    for piece in ["abc", "def", "ghi", "jkl"]:
+        buf.append(piece)
+    await buf.aclose()
+
+    # one write within the interval, carrying the latest (capped) text
+    assert writes == ["abcdefghij"]
+
+
+def test_code_agent_chain_is_prebuilt_and_follows_llm_swap():
+    agent = CodeAgent()
+    agent.llm = make_fake_llm({"language": "Python", "code": "pass", "explanation": None})
+
+    first = agent._chain()
+    assert agent._chain() is first
+
+    agent.llm = make_fake_llm({"language": "Go", "code": "func f() {}", "explanation": None})
+    assert agent._chain() is not first
@@ -1,6 +1,7 @@
+import httpx
 import pytest
 
-from app.agents.content.agent import ContentAgent
+from app.agents.content.agent import ContentAgent, SourcesUnavailable
 from app.schemas.agent_content import Source
 from tests.unit.fixtures.llm import make_fake_llm
 
@@ -49,3 +50,25 @@ async def test_content_agent_insufficient_sources(monkeypatch):
 
     # Hata mesajı makul bir şey söylüyor mu?
     assert "insufficient" in str(ei.value).lower() or "yetersiz" in str(ei.value).lower()
+
+
+@pytest.mark.asyncio
+async def test_content_agent_fetch_failures_fail_without_retry(monkeypatch):
+    hits = [{"title": f"t{i}", "url": f"https://site{i}.example/p"} for i in range(3)]
+
+    async def _search(query, *, limit=5):
+        return hits
+
+    async def _fetch(url):
+        raise httpx.ConnectError("down")
+
+    agent = ContentAgent()
+    monkeypatch.setattr(agent.web, "search", _search)
+    monkeypatch.setattr(agent.web, "fetch", _fetch)
+
+    with pytest.raises(SourcesUnavailable) as ei:
+        await agent.run("Kaynaklı yazı", job_id="jC3", request_id="rC3")
+
+    # an httpx error would be autoretried by Celery after the job was already failed
+    assert not isinstance(ei.value, httpx.HTTPError)
+    assert ei.value.code == "sources_unavailable"
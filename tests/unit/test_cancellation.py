@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.services.cancellation import JobCanceled, run_cancellable
+
+
+class _FakeBus:
+    """In-memory stand-in for the Redis cancel channel."""
+
+    def __init__(self):
+        self.event = asyncio.Event()
+
+    async def wait(self, job_id: str) -> None:
+        await self.event.wait()
+
+
+class _BrokenBus:
+    async def wait(self, job_id: str) -> None:
+        raise ConnectionError("redis down")
+
+
+@pytest.mark.asyncio
+async def test_run_cancellable_returns_result():
+    async def _work():
+        return 42
+
+    assert await run_cancellable(_work(), job_id="j1", bus=_FakeBus()) == 42
+
+
+@pytest.mark.asyncio
+async def test_run_cancellable_cancels_in_flight_work():
+    bus = _FakeBus()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def _slow_agent():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def _cancel_later():
+        await started.wait()
+        bus.event.set()
+
+    asyncio.ensure_future(_cancel_later())
+    with pytest.raises(JobCanceled):
+        await run_cancellable(_slow_agent(), job_id="j1", bus=bus)
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_run_cancellable_survives_broken_signal_channel():
+    async def _work():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    assert await run_cancellable(_work(), job_id="j1", bus=_BrokenBus()) == "done"
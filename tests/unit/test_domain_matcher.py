@@ -0,0 +1,45 @@
+from app.services.domain_matcher import DomainMatcher, compile_rules
+from app.services.web import WebClient
+
+
+def test_domain_rule_covers_subdomains_and_wildcard_only_subdomains():
+    m = DomainMatcher(["wikipedia.org", "*.mozilla.org"])
+
+    assert m.allows("https://wikipedia.org/x")
+    assert m.allows("https://en.wikipedia.org/wiki/Quicksort")
+    assert m.allows("https://developer.mozilla.org/")
+    assert not m.allows("https://mozilla.org/")
+    assert not m.allows("https://notwikipedia.org/")
+    assert not m.allows("https://example.com/")
+
+
+def test_most_specific_rule_wins_and_deny_beats_allow_on_same_domain():
+    m = DomainMatcher(["example.com", "!ads.example.com", "!*.cdn.example.com", "static.cdn.example.com", "x.org", "!x.org"])
+
+    assert m.allows("https://www.example.com/")
+    assert not m.allows("https://ads.example.com/")
+    assert not m.allows("https://tracker.ads.example.com/")
+    assert not m.allows("https://img.cdn.example.com/")
+    assert m.allows("https://static.cdn.example.com/")
+    assert not m.allows("https://x.org/")
+
+
+def test_deny_only_rules_allow_everything_else():
+    m = DomainMatcher(["!spam.example"])
+    assert m.allows("https://wikipedia.org/")
+    assert not m.allows("https://a.spam.example/")
+
+
+def test_normalization_and_empty_rules():
+    m = DomainMatcher([" Wikipedia.ORG. ", "", "  "])
+    assert len(m) == 1
+    assert m.allows("https://EN.wikipedia.org./x")
+    assert DomainMatcher([]).allows("https://anything.example/")
+
+
+def test_compile_rules_is_cached_and_filters_hits():
+    assert compile_rules("wikipedia.org, mdn.mozilla.org") is compile_rules("wikipedia.org, mdn.mozilla.org")
+
+    web = WebClient(matcher=compile_rules("wikipedia.org"))
+    hits = [{"title": "a", "url": "https://en.wikipedia.org/a"}, {"title": "b", "url": "https://evil.example/b"}]
+    assert web.allowed_hits(hits) == hits[:1]
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.core.health import HealthProber
+
+
+def _counting(calls, *, fail=False, hang=False):
+    async def probe():
+        calls.append(1)
+        if hang:
+            await asyncio.sleep(3600)
+        if fail:
+            raise ConnectionError("refused")
+
+    return probe
+
+
+@pytest.mark.asyncio
+async def test_prober_caches_results_and_reports_failures():
+    calls = []
+    prober = HealthProber({"mongodb": _counting(calls), "redis": _counting(calls, fail=True)}, timeout_s=1)
+
+    await prober.run_once()
+
+    redis = prober.status("redis")
+    assert prober.status("mongodb")["ok"] is True
+    assert redis["ok"] is False and redis["error"] == "refused"
+    assert not prober.healthy()
+    assert set(prober.snapshot()) == {"mongodb", "redis"}
+    # reads never probe
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_hanging_probe_is_not_restarted_until_it_finishes():
+    calls = []
+    prober = HealthProber({"broker": _counting(calls, hang=True)}, timeout_s=0.01)
+
+    await prober.run_once()
+    await prober.run_once()
+
+    assert len(calls) == 1
+    assert prober.status("broker")["error"] == "previous probe still running"
+    await prober.stop()
+
+
+@pytest.mark.asyncio
+async def test_stale_results_count_as_down():
+    prober = HealthProber({"postgres": _counting([])}, stale_s=0)
+
+    await prober.run_once()
+    await asyncio.sleep(0.01)
+
+    assert not prober.healthy()
@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.agents.content.agent import ContentAgent
+from app.services.host_guard import CircuitBreaker, HostGuard, HostUnavailable
+from app.services.web import WebClient
+
+
+async def _fail(guard, url, exc):
+    with pytest.raises(type(exc)):
+        async with guard.slot(url):
+            raise exc
+
+
+def _status_error(code):
+    request = httpx.Request("GET", "https://bad.example/")
+    return httpx.HTTPStatusError("boom", request=request, response=httpx.Response(code, request=request))
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_consecutive_failures_and_probes_after_cooloff(monkeypatch):
+    guard = HostGuard(failure_threshold=2, cooloff_s=30)
+    for _ in range(2):
+        await _fail(guard, "https://bad.example/a", httpx.ConnectError("refused"))
+
+    with pytest.raises(HostUnavailable):
+        async with guard.slot("https://bad.example/b"):
+            pass
+    assert not guard.is_healthy("https://bad.example/c")
+    assert guard.is_healthy("https://good.example/")
+
+    # cool-off over: one probe goes through and closes the circuit
+    breaker = guard._hosts["bad.example"].breaker
+    breaker.opened_at -= 31
+    async with guard.slot("https://bad.example/b"):
+        pass
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_a_single_probe_and_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, cooloff_s=0)
+    assert breaker.record_failure()
+    assert breaker.allow() and not breaker.allow()
+    assert breaker.record_failure()  # probe failed: open again
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_count_as_host_failures():
+    guard = HostGuard(failure_threshold=1)
+    await _fail(guard, "https://ok.example/missing", _status_error(404))
+    await _fail(guard, "https://ok.example/x", ValueError("parse"))
+    assert guard.is_healthy("https://ok.example/")
+
+    await _fail(guard, "https://ok.example/x", _status_error(503))
+    assert not guard.is_healthy("https://ok.example/")
+
+
+@pytest.mark.asyncio
+async def test_per_host_concurrency_is_bounded():
+    guard = HostGuard(concurrency=2)
+    active, peak = 0, 0
+
+    async def call(url):
+        nonlocal active, peak
+        async with guard.slot(url):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(call("https://one.example/") for _ in range(6)))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_gather_sources_prefers_healthy_hosts_and_skips_failures(monkeypatch):
+    guard = HostGuard(failure_threshold=1)
+    await _fail(guard, "https://down.example/", httpx.ConnectTimeout("slow"))
+
+    class Provider:
+        async def search(self, query, *, limit=5):
+            return [
+                {"title": "down", "url": "https://down.example/a"},
+                {"title": "flaky", "url": "https://flaky.example/a"},
+                {"title": "one", "url": "https://one.example/a"},
+                {"title": "two", "url": "https://two.example/a"},
+            ]
+
+    fetched = []
+
+    async def fake_download(self, url, cached):
+        fetched.append(url)
+        async with self._guard.slot(url):
+            if "flaky" in url:
+                raise httpx.ReadTimeout("slow")
+            return {"title": url, "url": url, "snippet": ""}
+
+    monkeypatch.setattr(WebClient, "_download", fake_download)
+    agent = ContentAgent.__new__(ContentAgent)
+    agent.web = WebClient(search_provider=Provider(), guard=guard)
+
+    sources = await agent._gather_sources("q", min_sources=2)
+
+    assert [str(s.url) for s in sources] == ["https://one.example/a", "https://two.example/a"]
+    assert "https://down.example/a" not in fetched
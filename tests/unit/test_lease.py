@@ -0,0 +1,61 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.workers.lease import LeaseKeeper, LeaseLost
+
+
+@pytest.mark.asyncio
+async def test_lease_keeper_renews_while_running():
+    jobs = MagicMock()
+    jobs.renew_lease = AsyncMock(return_value=True)
+
+    async with LeaseKeeper(jobs, "j1", owner="w1", ttl_s=3, interval_s=0.01) as lease:
+        await asyncio.sleep(0.05)
+
+    assert jobs.renew_lease.await_count >= 2
+    jobs.renew_lease.assert_awaited_with("j1", owner="w1", ttl_s=3)
+    assert lease.lost is False
+
+
+@pytest.mark.asyncio
+async def test_lease_keeper_flags_lost_lease():
+    jobs = MagicMock()
+    jobs.renew_lease = AsyncMock(side_effect=[ConnectionError("blip"), False])
+
+    async with LeaseKeeper(jobs, "j1", owner="w1", ttl_s=3, interval_s=0.01) as lease:
+        await asyncio.sleep(0.05)
+
+    # transient error is tolerated, the refused renewal stops the heartbeat
+    assert jobs.renew_lease.await_count == 2
+    assert lease.lost is True
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_cancels_the_guarded_run():
+    jobs = MagicMock()
+    jobs.renew_lease = AsyncMock(return_value=False)
+    run = {"cancelled": False}
+
+    async def agent_run():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            run["cancelled"] = True
+            raise
+
+    with pytest.raises(LeaseLost):
+        async with LeaseKeeper(jobs, "j1", owner="w1", ttl_s=3, interval_s=0.01) as lease:
+            await asyncio.wait_for(lease.guard(agent_run()), timeout=1)
+
+    assert run["cancelled"] is True
+
+
+@pytest.mark.asyncio
+async def test_guard_returns_the_result_while_the_lease_holds():
+    jobs = MagicMock()
+    jobs.renew_lease = AsyncMock(return_value=True)
+
+    async with LeaseKeeper(jobs, "j1", owner="w1", ttl_s=3, interval_s=0.01) as lease:
+        assert await lease.guard(asyncio.sleep(0.02, result="done")) == "done"
@@ -0,0 +1,60 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.health import router as health_router
+from app.core import lifecycle
+from app.core.health import HealthProber
+
+
+@pytest.fixture
+def fresh_readiness(monkeypatch):
+    state = lifecycle.Readiness()
+    monkeypatch.setattr(lifecycle, "prober", HealthProber(probes={}))
+    monkeypatch.setattr(lifecycle, "readiness", state)
+    monkeypatch.setattr("app.api.health.readiness", state)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_startup_marks_ready_only_when_every_step_succeeds(monkeypatch, fresh_readiness):
+    async def ok():
+        pass
+
+    async def down():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(lifecycle, "STARTUP_STEPS", {"mongodb": ok, "redis": down})
+    with pytest.raises(ConnectionError):
+        await lifecycle.startup()
+    assert not fresh_readiness.ready
+    assert fresh_readiness.checks["mongodb"]["ok"] and fresh_readiness.checks["redis"]["error"] == "redis down"
+
+    monkeypatch.setattr(lifecycle, "STARTUP_STEPS", {"mongodb": ok, "redis": ok})
+    await lifecycle.startup()
+    assert fresh_readiness.is_ready()
+    await lifecycle.prober.stop()
+
+
+def test_ready_probe_reflects_startup_state(fresh_readiness):
+    app = FastAPI()
+    app.include_router(health_router)
+    client = TestClient(app)
+
+    assert client.get("/health/ready").status_code == 503
+    fresh_readiness.ready = True
+    resp = client.get("/health/ready")
+    assert resp.status_code == 200 and resp.json()["status"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_covers_every_collection():
+    db = MagicMock()
+    db.get_collection.side_effect = lambda name: AsyncMock(name=name)
+
+    await lifecycle.ensure_indexes(db)
+
+    names = {c.args[0] for c in db.get_collection.call_args_list}
+    assert names == {"jobs", "log_events", "webhook_deliveries", "job_results", "profiles"}
@@ -0,0 +1,192 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.runnables import RunnableGenerator, RunnableLambda
+
+from app.agents.code.agent import CodeAgent
+from app.services.llm_coalescing import CoalescingLLM, ModelLimits
+from tests.unit.fixtures.llm import make_fake_llm, make_fake_streaming_llm
+
+PAYLOAD = {"language": "Python", "code": "def f():\n    return 42", "explanation": "simple"}
+
+
+def _slow_counting(fake, calls, delay_s=0.05, active=None):
+    async def _call(prompt):
+        calls.append(prompt)
+        if active is not None:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(delay_s)
+        if active is not None:
+            active["now"] -= 1
+        return await fake.ainvoke(prompt)
+
+    return RunnableLambda(lambda p: fake.invoke(p), afunc=_call)
+
+
+def _wrap(inner, **kw):
+    kw.setdefault("limits", ModelLimits(8))
+    kw.setdefault("batch_window_s", 0)
+    return CoalescingLLM(inner, model="fake", temperature=0.2, **kw)
+
+
+@pytest.mark.asyncio
+async def test_identical_inflight_prompts_share_one_call():
+    calls = []
+    llm = _wrap(_slow_counting(make_fake_llm(PAYLOAD), calls))
+
+    same = await asyncio.gather(*(llm.ainvoke("write quicksort") for _ in range(5)))
+    await llm.ainvoke("write mergesort")
+
+    assert calls == ["write quicksort", "write mergesort"]
+    assert all(json.loads(r) == PAYLOAD for r in same)
+
+
+@pytest.mark.asyncio
+async def test_joining_a_streamed_call_gets_the_full_completion():
+    llm = _wrap(make_fake_streaming_llm(PAYLOAD, chunk_size=5))
+
+    async def stream():
+        return [chunk async for chunk in llm.astream("p")]
+
+    leader = asyncio.create_task(stream())
+    await asyncio.sleep(0)
+    joined = await llm.ainvoke("p")
+    chunks = await leader
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == joined == json.dumps(PAYLOAD)
+
+
+@pytest.mark.asyncio
+async def test_per_model_concurrency_limit():
+    calls, active = [], {"now": 0, "peak": 0}
+    llm = _wrap(_slow_counting(make_fake_llm(PAYLOAD), calls, delay_s=0.02, active=active), limits=ModelLimits(2))
+
+    await asyncio.gather(*(llm.ainvoke(f"prompt {i}") for i in range(6)))
+
+    assert len(calls) == 6
+    assert active["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_micro_batching_sends_one_abatch():
+    fake = make_fake_llm(PAYLOAD)
+    batches = []
+
+    class BatchRecorder(RunnableLambda):
+        async def abatch(self, inputs, config=None, *, return_exceptions=False, **kwargs):
+            batches.append(list(inputs))
+            return await super().abatch(inputs, config, return_exceptions=return_exceptions, **kwargs)
+
+    llm = _wrap(BatchRecorder(lambda p: fake.invoke(p)), batch_window_s=0.02, batch_max_size=8)
+
+    results = await asyncio.gather(*(llm.ainvoke(f"p{i}") for i in range(3)))
+
+    assert batches == [["p0", "p1", "p2"]]
+    assert all(json.loads(r) == PAYLOAD for r in results)
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_joined_caller():
+    async def _boom(_):
+        await asyncio.sleep(0.01)
+        raise TimeoutError("upstream")
+
+    llm = _wrap(RunnableLambda(lambda p: p, afunc=_boom))
+    results = await asyncio.gather(*(llm.ainvoke("p") for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, TimeoutError) for r in results)
+
+
+def _tracked(state, delay_s=10.0):
+    async def _call(_):
+        state["started"] += 1
+        try:
+            await asyncio.sleep(delay_s)
+        except asyncio.CancelledError:
+            state["cancelled"] += 1
+            raise
+        state["finished"] += 1
+        return "done"
+
+    return RunnableLambda(lambda p: p, afunc=_call)
+
+
+@pytest.mark.asyncio
+async def test_canceled_lone_caller_cancels_the_upstream_call():
+    state = {"started": 0, "finished": 0, "cancelled": 0}
+    llm = _wrap(_tracked(state))
+
+    caller = asyncio.create_task(llm.ainvoke("p"))
+    while not state["started"]:
+        await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.gather(caller, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert state == {"started": 1, "finished": 0, "cancelled": 1}
+    assert len(llm._flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_upstream_call_survives_while_a_joiner_waits():
+    state = {"started": 0, "finished": 0, "cancelled": 0}
+    llm = _wrap(_tracked(state, delay_s=0.05))
+
+    first = asyncio.create_task(llm.ainvoke("p"))
+    second = asyncio.create_task(llm.ainvoke("p"))
+    while not state["started"]:
+        await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+    assert state == {"started": 1, "finished": 1, "cancelled": 0}
+
+
+@pytest.mark.asyncio
+async def test_canceled_stream_leader_without_joiners_stops_the_stream():
+    state = {"chunks": 0, "cancelled": 0}
+
+    async def _agen(_inputs):
+        async for _ in _inputs:
+            pass
+        try:
+            while True:
+                state["chunks"] += 1
+                yield "x"
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            state["cancelled"] += 1
+            raise
+
+    llm = _wrap(RunnableGenerator(_agen))
+
+    async def consume():
+        async for _ in llm.astream("p"):
+            pass
+
+    leader = asyncio.create_task(consume())
+    while not state["chunks"]:
+        await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.gather(leader, return_exceptions=True)
+    await asyncio.sleep(0.05)
+
+    assert state["cancelled"] == 1
+    assert state["chunks"] < 5
+    assert len(llm._flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_runs_through_the_wrapper():
+    agent = CodeAgent()
+    agent.llm = _wrap(make_fake_llm(PAYLOAD))
+
+    first, second = await asyncio.gather(
+        agent.run("Basit bir Python fonksiyonu yaz", job_id="j1", request_id="r1"),
+        agent.run("Basit bir Python fonksiyonu yaz", job_id="j2", request_id="r2", stream_cb=lambda _: None),
+    )
+
+    assert first.code == second.code == PAYLOAD["code"]
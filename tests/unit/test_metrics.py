@@ -0,0 +1,40 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from app.api.metrics import router as metrics_router
+from app.middleware.metrics import MetricsMiddleware
+from app.peer.peer_agent import PeerAgent
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_routing_decisions_are_counted():
+    before = _sample("agentic_routing_decisions_total", agent="code", rule="rules")
+    PeerAgent.decide("Python kodu yaz: quicksort ve 3 test")
+    assert _sample("agentic_routing_decisions_total", agent="code", rule="rules") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_http_latency_is_labelled_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+    @app.get("/items/{item_id}")
+    async def _item(item_id: str):
+        return {"id": item_id}
+
+    labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+    before = _sample("agentic_http_request_duration_seconds_count", **labels)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        scrape = await client.get("/metrics")
+
+    assert _sample("agentic_http_request_duration_seconds_count", **labels) == before + 2
+    assert "agentic_http_request_duration_seconds" in scrape.text
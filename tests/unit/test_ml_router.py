@@ -0,0 +1,78 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.peer import peer_agent  # noqa: E402
+from app.peer.ml_router import HashedNgramRouter  # noqa: E402
+from app.peer.peer_agent import PeerAgent  # noqa: E402
+from app.peer.train_router import is_training_label  # noqa: E402
+
+TRAIN = [
+    ("Python kodu yaz: quicksort", "code"),
+    ("write a python function that parses csv", "code"),
+    ("JS ile debounce fonksiyonu", "code"),
+    ("implement a binary search in go", "code"),
+    ("fix this bug in my sql query", "code"),
+    ("Blog yaz: yapay zeka etiği", "content"),
+    ("write a blog post about remote work", "content"),
+    ("Makale yaz: kahve kültürü, kaynak ver", "content"),
+    ("summarize recent news on electric cars", "content"),
+    ("explain the history of istanbul", "content"),
+]
+
+
+def _router() -> HashedNgramRouter:
+    return HashedNgramRouter(dim=1 << 12).fit([t for t, _ in TRAIN], [a for _, a in TRAIN], epochs=50)
+
+
+def test_fit_separates_training_set_and_batch_matches_single():
+    router = _router()
+    texts = [t for t, _ in TRAIN]
+    batch = router.predict_proba(texts)
+
+    assert [("code" if p >= 0.5 else "content") for p in batch] == [a for _, a in TRAIN]
+    single = np.array([router.predict_proba([t])[0] for t in texts])
+    assert np.allclose(batch, single)
+
+
+def test_save_load_roundtrip(tmp_path):
+    router = _router()
+    path = str(tmp_path / "router.npz")
+    router.save(path)
+
+    loaded = HashedNgramRouter.load(path)
+    assert loaded.dim == router.dim
+    assert np.allclose(loaded.predict_proba(["Python kodu yaz"]), router.predict_proba(["Python kodu yaz"]))
+
+
+def test_peer_agent_uses_ml_when_confident_and_rules_otherwise(monkeypatch):
+    class FixedRouter:
+        def predict_proba(self, texts):
+            return np.array([0.99 if "quicksort" in t else 0.6 for t in texts])
+
+    monkeypatch.setattr(peer_agent, "load_router", lambda: FixedRouter())
+    monkeypatch.setattr(peer_agent, "_DECISIONS", peer_agent.TTLCache(10, 60))
+
+    confident, unsure = PeerAgent.decide_many(["Blog yaz: quicksort", "Makale yaz: LLM nedir?"])
+
+    assert confident["agent"] == "code" and confident["reason"].startswith("ml:")
+    assert unsure["agent"] == "content" and unsure["reason"].startswith("rules:")
+
+
+def test_load_router_falls_back_to_rules_without_model(monkeypatch, tmp_path):
+    monkeypatch.setattr(peer_agent.config, "ROUTER_BACKEND", "ml")
+    monkeypatch.setattr(peer_agent.config, "ROUTER_MODEL_PATH", str(tmp_path / "missing.npz"))
+    monkeypatch.setattr(peer_agent, "_ROUTER", None)
+    monkeypatch.setattr(peer_agent, "_ROUTER_LOADED", False)
+
+    assert peer_agent.load_router() is None
+    assert PeerAgent.decide("Python kodu yaz: quicksort ve 3 test")["agent"] == "code"
+
+
+def test_training_uses_rule_decisions_only_by_default():
+    assert is_training_label("rules: code_signals={'python': 2}")
+    assert not is_training_label("fallback_content: signals={}")
+    assert not is_training_label("ml: p_code=0.912")
+
+    assert is_training_label("fallback_content: signals={}", include_fallback=True)
+    assert is_training_label("ml: p_code=0.912", include_model=True)
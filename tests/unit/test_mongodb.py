@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from pymongo import ReadPreference, WriteConcern
+
+from app.core.config import config
+from app.core.metrics import MONGO_POOL_CHECKED_OUT, MONGO_POOL_CHECKOUT_WAIT
+from app.db.mongodb.mongodb import (
+    PoolMetricsListener,
+    client_options,
+    read_preference,
+    write_concern,
+)
+
+
+def test_write_concern_profiles(monkeypatch):
+    monkeypatch.setattr(config, "MONGO_WRITE_CONCERN_STATE", "majority")
+    monkeypatch.setattr(config, "MONGO_WRITE_CONCERN_EVENTS", "1")
+
+    assert write_concern("state") == WriteConcern(w="majority", wtimeout=config.MONGO_WRITE_TIMEOUT_MS)
+    assert write_concern("events") == WriteConcern(w=1)
+
+
+def test_status_read_preference_and_client_options(monkeypatch):
+    monkeypatch.setattr(config, "MONGO_READ_PREFERENCE_STATUS", "secondaryPreferred")
+    monkeypatch.setattr(config, "MONGO_COMPRESSORS", "zstd, zlib")
+
+    assert read_preference("status") == ReadPreference.SECONDARY_PREFERRED
+    assert read_preference("primary") == ReadPreference.PRIMARY
+
+    options = client_options()
+    assert options["maxPoolSize"] == config.MONGO_MAX_POOL_SIZE
+    assert options["compressors"] == ["zstd", "zlib"]
+    assert "socketTimeoutMS" not in options
+
+
+def test_pool_listener_tracks_checked_out_connections():
+    listener = PoolMetricsListener()
+    before = MONGO_POOL_CHECKED_OUT._value.get()
+    waits = MONGO_POOL_CHECKOUT_WAIT._sum.get()
+
+    listener.connection_checked_out(SimpleNamespace(duration=0.25))
+    assert MONGO_POOL_CHECKED_OUT._value.get() == before + 1
+    assert MONGO_POOL_CHECKOUT_WAIT._sum.get() == waits + 0.25
+
+    listener.connection_checked_in(SimpleNamespace())
+    assert MONGO_POOL_CHECKED_OUT._value.get() == before
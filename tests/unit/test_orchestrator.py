@@ -1,10 +1,15 @@
+from datetime import datetime, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.cache.memory import TTLCache
+from app.core.error_codes import ErrorCode
+from app.core.exceptions import ExceptionBase
 from app.schemas.api import ExecuteRequest
 from app.schemas.auth import ActorSchema
+from app.schemas.jobs import JobDoc, JobStatusEnum
 from app.services.jobs_orchestrator import JobsOrchestrator
 
 
@@ -15,9 +20,9 @@ async def test_orchestrator_idempotency_short_circuit():
     producer = MagicMock()
 
     # idempotent: eski job bulundu → kısa devre
-    jobs.get_by_idempotency = AsyncMock(return_value=SimpleNamespace(job_id="j_old", request_id="r_old"))
+    jobs.create_or_get_by_idempotency = AsyncMock(return_value=(SimpleNamespace(job_id="j_old", request_id="r_old"), False))
 
-    orch = JobsOrchestrator(jobs_repo=jobs, logs_repo=logs, producer=producer)
+    orch = JobsOrchestrator(jobs_repo=jobs, logs_repo=logs, producer=producer, idempotency_cache=TTLCache(10, 60))
     payload = ExecuteRequest(task="abc", mode="async", webhook_url=None)
     actor = ActorSchema(user_id=1, email="u@e", is_active=True)
 
@@ -27,6 +32,11 @@ async def test_orchestrator_idempotency_short_circuit():
     jobs.create_job.assert_not_called()
     producer.enqueue_execute.assert_not_called()
 
+    # retry with the same key is answered from the in-process cache
+    again, _ = await orch.create_and_enqueue(payload, actor, http_request_id="rid2", idempotency_key="idem1")
+    assert again.job_id == "j_old" and again.request_id == "r_old"
+    jobs.create_or_get_by_idempotency.assert_awaited_once()
+
 
 @pytest.mark.asyncio
 async def test_orchestrator_new_job_enqueues():
@@ -34,14 +44,13 @@ async def test_orchestrator_new_job_enqueues():
     logs = MagicMock()
     producer = MagicMock()
 
-    jobs.get_by_idempotency = AsyncMock(return_value=None)
-    jobs.create_job = AsyncMock()
-    logs.push = AsyncMock()
+    jobs.create_or_get_by_idempotency = AsyncMock(side_effect=lambda job: (job, True))
+    logs.push_many = AsyncMock()
 
     # enqueue_execute SENKRON -> MagicMock kullan
     producer.enqueue_execute = MagicMock()
 
-    orch = JobsOrchestrator(jobs_repo=jobs, logs_repo=logs, producer=producer)
+    orch = JobsOrchestrator(jobs_repo=jobs, logs_repo=logs, producer=producer, idempotency_cache=TTLCache(10, 60))
     payload = ExecuteRequest(task="do something", mode="async", webhook_url=None)
     actor = ActorSchema(user_id=123, email="u@e", is_active=True)
 
@@ -51,12 +60,116 @@ async def test_orchestrator_new_job_enqueues():
     assert accepted.status == "queued"
     assert "/api/v1/jobs/" in location
 
-    jobs.create_job.assert_awaited_once()
-    logs.push.assert_awaited()  # en az bir kere
+    jobs.create_or_get_by_idempotency.assert_awaited_once()
+    jobs.create_job.assert_not_called()
+    logs.push_many.assert_awaited_once()
     producer.enqueue_execute.assert_called_once()
 
+    # routed at submit time: stored on the job and used to pick the queue
+    stored = jobs.create_or_get_by_idempotency.await_args.args[0]
+    assert stored.decided_agent in ("code", "content")
+
     # Argümanları da doğrulayalım:
     _, kwargs = producer.enqueue_execute.call_args
     assert kwargs["job_id"] == accepted.job_id
     assert kwargs["request_id"] == accepted.request_id
     assert kwargs["owner_user_id"] == str(actor.user_id)
+    assert kwargs["agent"] == stored.decided_agent
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_without_idempotency_key_inserts():
+    jobs = MagicMock()
+    logs = MagicMock()
+    jobs.create_job = AsyncMock()
+    logs.push_many = AsyncMock()
+
+    orch = JobsOrchestrator(jobs_repo=jobs, logs_repo=logs, producer=MagicMock(), idempotency_cache=TTLCache(10, 60))
+    payload = ExecuteRequest(task="do something", mode="async", webhook_url=None)
+
+    await orch.create_and_enqueue(payload, ActorSchema(user_id=1, is_active=True), http_request_id="rid", idempotency_key=None)
+
+    jobs.create_job.assert_awaited_once()
+    jobs.create_or_get_by_idempotency.assert_not_called()
+
+
+def _job_doc(status, **kw):
+    now = datetime.now(timezone.utc)
+    return JobDoc(
+        job_id="j1",
+        request_id="r1",
+        owner_user_id="7",
+        task="do something",
+        task_hash="h",
+        status=status,
+        created_at=now,
+        updated_at=now,
+        **kw,
+    )
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_cancel_running_signals_worker():
+    jobs = MagicMock()
+    logs = MagicMock()
+    bus = MagicMock()
+
+    jobs.get_light = AsyncMock(return_value=_job_doc(JobStatusEnum.running))
+    jobs.cancel = AsyncMock(return_value=JobStatusEnum.running)
+    logs.push = AsyncMock()
+    bus.request_cancel = AsyncMock()
+
+    orch = JobsOrchestrator(jobs_repo=jobs, logs_repo=logs, producer=MagicMock(), cancel_bus=bus)
+    dto = await orch.cancel_owner_guard("j1", ActorSchema(user_id=7, is_active=True))
+
+    assert dto.status == JobStatusEnum.canceled
+    bus.request_cancel.assert_awaited_once_with("j1")
+    logs.push.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_cancel_queued_does_not_signal():
+    jobs = MagicMock()
+    logs = MagicMock()
+    bus = MagicMock()
+
+    jobs.get_light = AsyncMock(return_value=_job_doc(JobStatusEnum.queued))
+    jobs.cancel = AsyncMock(return_value=JobStatusEnum.queued)
+    logs.push = AsyncMock()
+    bus.request_cancel = AsyncMock()
+
+    producer = MagicMock()
+    orch = JobsOrchestrator(jobs_repo=jobs, logs_repo=logs, producer=producer, cancel_bus=bus)
+    dto = await orch.cancel_owner_guard("j1", ActorSchema(user_id=7, is_active=True))
+
+    assert dto.status == JobStatusEnum.canceled
+    bus.request_cancel.assert_not_called()
+    producer.enqueue_webhook.assert_not_called()  # no webhook_url
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_cancel_queued_publishes_the_webhook():
+    jobs = MagicMock()
+    logs = MagicMock()
+    producer = MagicMock()
+
+    jobs.get_light = AsyncMock(return_value=_job_doc(JobStatusEnum.queued, webhook_url="https://hooks.example.com/cb"))
+    jobs.cancel = AsyncMock(return_value=JobStatusEnum.queued)
+    logs.push = AsyncMock()
+
+    orch = JobsOrchestrator(jobs_repo=jobs, logs_repo=logs, producer=producer, cancel_bus=MagicMock())
+    await orch.cancel_owner_guard("j1", ActorSchema(user_id=7, is_active=True))
+
+    producer.enqueue_webhook.assert_called_once_with(job_id="j1", request_id="r1", event="job.canceled")
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_cancel_terminal_job_conflict():
+    jobs = MagicMock()
+    jobs.get_light = AsyncMock(return_value=_job_doc(JobStatusEnum.succeeded))
+    jobs.cancel = AsyncMock(return_value=None)
+
+    orch = JobsOrchestrator(jobs_repo=jobs, logs_repo=MagicMock(), producer=MagicMock(), cancel_bus=MagicMock())
+    with pytest.raises(ExceptionBase) as ei:
+        await orch.cancel_owner_guard("j1", ActorSchema(user_id=7, is_active=True))
+    assert ei.value.code == ErrorCode.JOB_NOT_CANCELABLE.code
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services import web as web_module
+from app.services.page_cache import PageCache
+from app.services.web import WebClient
+
+HTML = "<html><head><title>Quicksort - Wikipedia</title></head><body><p>Quicksort is a sorting algorithm.</p></body></html>"
+
+
+def _client_with(monkeypatch, handler):
+    real = httpx.AsyncClient
+    monkeypatch.setattr(web_module.httpx, "AsyncClient", lambda **kw: real(transport=httpx.MockTransport(handler), **kw))
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_without_request(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=HTML, headers={"ETag": '"v1"'})
+
+    _client_with(monkeypatch, handler)
+    web = WebClient(page_cache=PageCache(fresh_s=60, redis=None))
+
+    first = await web.fetch("https://en.wikipedia.org/wiki/Quicksort")
+    second = await web.fetch("https://en.wikipedia.org/wiki/Quicksort")
+
+    assert first == second
+    assert second == {
+        "title": "Quicksort - Wikipedia",
+        "url": "https://en.wikipedia.org/wiki/Quicksort",
+        "snippet": "Quicksort is a sorting algorithm.",
+    }
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_revalidated_with_etag(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text=HTML, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    _client_with(monkeypatch, handler)
+    cache = PageCache(fresh_s=0, redis=None)
+    web = WebClient(page_cache=cache)
+
+    await web.fetch("https://en.wikipedia.org/wiki/Quicksort")
+    page = await web.fetch("https://en.wikipedia.org/wiki/Quicksort")
+
+    assert page["title"] == "Quicksort - Wikipedia"
+    assert [r.headers.get("If-None-Match") for r in requests] == [None, '"v1"']
+    assert requests[1].headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_of_one_url_share_a_request():
+    calls = []
+
+    async def fetch(url, cached):
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        return {"title": "t", "url": url, "snippet": "s", "fetched_at": time.time()}
+
+    cache = PageCache(redis=None)
+    pages = await asyncio.gather(*(cache.get("https://developer.mozilla.org/x", fetch) for _ in range(5)))
+
+    assert calls == ["https://developer.mozilla.org/x"]
+    assert all(p["title"] == "t" for p in pages)
+
+
+@pytest.mark.asyncio
+async def test_no_store_responses_are_not_cached(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=HTML, headers={"Cache-Control": "no-store"})
+
+    _client_with(monkeypatch, handler)
+    web = WebClient(page_cache=PageCache(redis=None))
+
+    await web.fetch("https://example.com/a")
+    await web.fetch("https://example.com/a")
+
+    assert len(requests) == 2
@@ -24,3 +24,19 @@ def test_peer_agent_routing_rules_sad():
         d = PeerAgent.decide(task)
         assert d.get("agent") == expected, f"{task} -> {d}"
         assert isinstance(d.get("reason"), str) and d["reason"]
+
+
+def test_peer_agent_memoizes_by_task_hash(monkeypatch):
+    from app.peer import peer_agent
+
+    calls = []
+    original = PeerAgent._decide
+    monkeypatch.setattr(PeerAgent, "_decide", staticmethod(lambda task: calls.append(task) or original(task)))
+    monkeypatch.setattr(peer_agent, "_DECISIONS", peer_agent.TTLCache(10, 60))
+
+    first = PeerAgent.decide("Python kodu yaz: quicksort", task_hash="h1")
+    first["agent"] = "mutated"
+    second = PeerAgent.decide("Python kodu yaz: quicksort", task_hash="h1")
+
+    assert second["agent"] == "code"
+    assert len(calls) == 1
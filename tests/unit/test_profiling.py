@@ -0,0 +1,70 @@
+import marshal
+import pstats
+import zlib
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core import profiling
+from app.core.logging import log_execution
+from app.core.profiling import ProfileCapture, load_stats, profiled
+from app.repositories.mongodb.profiles import ProfilesRepository
+from app.schemas.profiles import ProfileKind
+
+
+def _busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def test_cprofile_capture_produces_loadable_pstats():
+    capture = ProfileCapture(engine="cprofile")
+    capture.start()
+    _busy(10_000)
+    raw, summary = capture.stop()
+
+    stats = pstats.Stats()
+    stats.stats = marshal.loads(raw)
+    assert any(func[2] == "_busy" for func in stats.stats)
+    assert "_busy" in summary
+    assert capture.duration_ms > 0
+
+
+@pytest.mark.asyncio
+async def test_profiled_stores_capture():
+    with patch.object(ProfilesRepository, "record", new=AsyncMock(return_value="p1")) as record:
+        async with profiled(ProfileKind.job, "job_1", profile_id="p1") as handle:
+            _busy(1_000)
+
+    assert handle.profile_id == "p1"
+    stored = record.await_args.args[0]
+    assert stored.kind is ProfileKind.job and stored.target == "job_1"
+    assert stored.size_bytes == len(stored.pstats)
+    assert marshal.loads(load_stats(stored)) == marshal.loads(zlib.decompress(stored.pstats))
+
+
+@pytest.mark.asyncio
+async def test_profiled_skips_when_another_capture_is_running():
+    with patch.object(ProfilesRepository, "record", new=AsyncMock()) as record:
+        assert profiling._CAPTURE_LOCK.acquire(blocking=False)
+        try:
+            async with profiled(ProfileKind.request, "GET /x") as handle:
+                pass
+        finally:
+            profiling._CAPTURE_LOCK.release()
+
+    assert handle.profile_id is None
+    record.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_log_execution_profiles_sampled_calls():
+    logger = type("L", (), {"info": lambda *a, **k: None, "error": lambda *a, **k: None})()
+
+    @log_execution(logger, profile_kind="job", profile_sample_rate=1.0, profile_target="job_id")
+    async def work(*, job_id: str) -> str:
+        return job_id
+
+    with patch.object(ProfilesRepository, "record", new=AsyncMock()) as record:
+        assert await work(job_id="job_9") == "job_9"
+
+    assert record.await_args.args[0].target == "job_9"
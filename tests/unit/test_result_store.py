@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.schemas.jobs import JobResult
+from app.services.result_store import ResultStore
+
+
+def _result(chars: int) -> JobResult:
+    return JobResult(agent="code", output={"language": "Python", "code": "x = 1\n" * (chars // 6), "explanation": "ok"})
+
+
+def _repo():
+    blobs = {}
+    repo = AsyncMock()
+    repo.put.side_effect = lambda blob: blobs.setdefault(blob.blob_id, blob).blob_id
+    repo.get_blob.side_effect = lambda blob_id: blobs.get(blob_id)
+    repo.delete.side_effect = lambda blob_id: blobs.pop(blob_id, None) is not None
+    return repo, blobs
+
+
+@pytest.mark.asyncio
+async def test_small_result_stays_inline():
+    repo, blobs = _repo()
+    store = ResultStore(repo, inline_max_bytes=1024)
+
+    inline, ref = await store.offload("j_1", _result(100))
+
+    assert inline is not None and ref is None
+    assert not blobs
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", ["zstd", "gzip"])
+async def test_large_result_is_offloaded_compressed_and_hydrated(codec):
+    repo, blobs = _repo()
+    store = ResultStore(repo, inline_max_bytes=1024, codec=codec)
+    result = _result(200_000)
+
+    inline, ref = await store.offload("j_1", result)
+
+    assert inline is None
+    assert ref.codec == codec and ref.stored_bytes < ref.size_bytes
+    assert blobs[ref.blob_id].job_id == "j_1"
+
+    job = SimpleNamespace(result=None, result_ref=ref)
+    assert (await store.hydrate(job)).result == result
+
+    await store.discard(ref)
+    assert not blobs
@@ -0,0 +1,171 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.cache.singleflight import SingleFlight
+from app.services.search_cache import (
+    CachedSearchProvider,
+    SearchUnavailable,
+    normalize_query,
+)
+
+
+class StubProvider:
+    def __init__(self, *, delay_s: float = 0.0, fail: bool = False):
+        self.calls = []
+        self.delay_s = delay_s
+        self.fail = fail
+
+    async def search(self, query, *, limit=5):
+        self.calls.append((query, limit))
+        await asyncio.sleep(self.delay_s)
+        if self.fail:
+            raise httpx.ConnectError("upstream down")
+        return [{"title": f"{query} {i}", "url": f"https://example.com/{i}"} for i in range(limit)]
+
+
+class DictRedis:
+    """Just the commands the search cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.decode() if isinstance(value, bytes) else value
+        return True
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    async def eval(self, script, numkeys, key, token):
+        # the compare-and-delete unlock script
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+def _cache(provider, redis=None, **kw):
+    async def _client():
+        return redis
+
+    return CachedSearchProvider(provider, namespace="stub", redis=_client if redis is not None else None, **kw)
+
+
+def test_normalize_query():
+    assert normalize_query("  Quicksort   NEDİR ") == normalize_query("quicksort nedi̇r")
+    assert normalize_query("Ａｂｃ") == "abc"
+
+
+@pytest.mark.asyncio
+async def test_memory_hit_skips_provider_and_key_includes_limit():
+    provider = StubProvider()
+    cache = _cache(provider)
+
+    first = await cache.search("Quicksort nedir?", limit=3)
+    first.append({"title": "mutated", "url": "x"})
+    second = await cache.search("  quicksort   NEDIR? ", limit=3)
+    await cache.search("quicksort nedir?", limit=5)
+
+    assert len(second) == 3
+    assert provider.calls == [("Quicksort nedir?", 3), ("quicksort nedir?", 5)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_call():
+    provider = StubProvider(delay_s=0.05)
+    cache = _cache(provider)
+
+    results = await asyncio.gather(*(cache.search("llm nedir", limit=2) for _ in range(10)))
+
+    assert len(provider.calls) == 1
+    assert all(r == results[0] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_errors_are_negatively_cached():
+    provider = StubProvider(fail=True)
+    cache = _cache(provider, negative_ttl_s=60)
+
+    with pytest.raises(httpx.ConnectError):
+        await cache.search("q", limit=2)
+    with pytest.raises(SearchUnavailable):
+        await cache.search("q", limit=2)
+    assert len(provider.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_between_instances():
+    redis = DictRedis()
+    provider = StubProvider()
+
+    await _cache(provider, redis).search("shared query", limit=2)
+    hits = await _cache(provider, redis).search("Shared Query", limit=2)  # fresh in-process tier
+
+    assert len(provider.calls) == 1
+    assert hits[0]["url"] == "https://example.com/0"
+    assert not any(k.endswith(":lock") for k in redis.data)
+
+
+@pytest.mark.asyncio
+async def test_waits_for_lock_holder_in_another_process():
+    redis = DictRedis()
+    provider = StubProvider()
+    cache = _cache(provider, redis, lock_ttl_s=2)
+    other = _cache(StubProvider(), redis)
+    key = cache.key("q", 2)
+    redis.data[f"{key}:lock"] = "1"  # another process is fetching
+
+    async def _other_finishes():
+        await asyncio.sleep(0.1)
+        await other._redis_set(redis, key, {"hits": [{"title": "t", "url": "u"}]}, 60)
+        await redis.delete(f"{key}:lock")
+
+    hits, _ = await asyncio.gather(cache.search("q", limit=2), _other_finishes())
+
+    assert hits == [{"title": "t", "url": "u"}]
+    assert provider.calls == []
+
+
+@pytest.mark.asyncio
+async def test_slow_holder_does_not_release_a_lock_taken_over_by_another_process():
+    redis = DictRedis()
+    cache = _cache(StubProvider(delay_s=0.05), redis, lock_ttl_s=0.01)
+    lock_key = f"{cache.key('q', 2)}:lock"
+
+    async def _lock_expires_and_is_retaken():
+        await asyncio.sleep(0.02)
+        redis.data[lock_key] = "other-process"
+
+    await asyncio.gather(cache.search("q", limit=2), _lock_expires_and_is_retaken())
+
+    assert redis.data[lock_key] == "other-process"
+
+
+@pytest.mark.asyncio
+async def test_singleflight_survives_one_caller_canceled():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def _slow():
+        started.set()
+        await asyncio.sleep(0.05)
+        return 42
+
+    first = asyncio.create_task(flight.do("k", _slow))
+    await started.wait()
+    second = asyncio.create_task(flight.do("k", _slow))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == 42
+    assert len(flight) == 0
@@ -0,0 +1,163 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import search_factory
+from app.services.duckduckgo import DuckDuckGoProvider
+from app.services.search_cache import CachedSearchProvider
+from app.services.search_hedged import HedgedSearchProvider
+
+
+class StubProvider:
+    def __init__(self, name, *, delay_s=0.0, fail=False, hits=None):
+        self.name = name
+        self.delay_s = delay_s
+        self.fail = fail
+        self.hits = hits
+        self.calls = 0
+        self.canceled = False
+
+    async def search(self, query, *, limit=5):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.canceled = True
+            raise
+        if self.fail:
+            raise httpx.ConnectError(f"{self.name} down")
+        if self.hits is not None:
+            return self.hits
+        return [{"title": f"{self.name} {i}", "url": f"https://{self.name}.example/{i}"} for i in range(limit)]
+
+
+def _hedged(*providers, **kw):
+    kw.setdefault("hedge_default_s", 0.05)
+    return HedgedSearchProvider({p.name: p for p in providers}, **kw)
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_answers_alone():
+    a, b = StubProvider("a"), StubProvider("b")
+    hits = await _hedged(a, b).search("q", limit=2)
+
+    assert [h["title"] for h in hits] == ["a 0", "a 1"]
+    assert b.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_canceled():
+    a, b = StubProvider("a", delay_s=1.0), StubProvider("b")
+    hits = await _hedged(a, b).search("q", limit=2)
+    await asyncio.sleep(0)
+
+    assert hits[0]["title"] == "b 0"
+    assert a.canceled
+
+
+@pytest.mark.asyncio
+async def test_hedge_answering_within_the_grace_is_merged():
+    a = StubProvider("a", delay_s=0.1, hits=[{"title": "a 0", "url": "https://b.example/1"}])
+    b = StubProvider("b")
+    hits = await _hedged(a, b, merge_grace_s=1.0).search("q", limit=3)
+
+    # a answered after b but within the grace: its hits rank first, the duplicate URL is kept once
+    assert [h["title"] for h in hits] == ["a 0", "b 0", "b 2"]
+    assert not a.canceled and b.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_missing_the_grace_is_canceled():
+    a, b = StubProvider("a", delay_s=1.0), StubProvider("b")
+    hits = await asyncio.wait_for(_hedged(a, b, merge_grace_s=0.05).search("q", limit=2), timeout=0.5)
+    await asyncio.sleep(0)
+
+    assert [h["title"] for h in hits] == ["b 0", "b 1"]
+    assert a.canceled
+
+
+@pytest.mark.asyncio
+async def test_error_and_empty_answers_fall_back_immediately():
+    a, b, c = StubProvider("a", fail=True), StubProvider("b", hits=[]), StubProvider("c")
+    hedged = _hedged(a, b, c, hedge_default_s=10)
+
+    hits = await asyncio.wait_for(hedged.search("q", limit=1), timeout=1)
+
+    assert hits == [{"title": "c 0", "url": "https://c.example/0"}]
+    assert hedged.stats["a"].error_rate() == 1.0 and hedged.stats["b"].error_rate() == 1.0
+
+
+@pytest.mark.asyncio
+async def test_all_failing_raises_last_error():
+    with pytest.raises(httpx.ConnectError):
+        await _hedged(StubProvider("a", fail=True), StubProvider("b", fail=True)).search("q")
+
+
+def test_merge_dedupes_by_url_in_rank_order():
+    merged = HedgedSearchProvider._merge(
+        [
+            [{"title": "A", "url": "https://Example.com/x/"}, {"title": "B", "url": "https://example.com/y"}],
+            [{"title": "A again", "url": "https://example.com/x#top"}, {"title": "C", "url": "https://example.com/z"}],
+        ],
+        limit=5,
+    )
+    assert [h["title"] for h in merged] == ["A", "B", "C"]
+
+
+@pytest.mark.asyncio
+async def test_order_adapts_to_errors():
+    a, b = StubProvider("a", fail=True), StubProvider("b")
+    hedged = _hedged(a, b)
+    assert hedged.order() == ["a", "b"]
+
+    for _ in range(3):
+        await hedged.search("q")
+
+    assert hedged.order() == ["b", "a"]
+    assert a.calls == 1  # demoted after the first failure, b answered the rest
+
+
+def test_factory_builds_cached_composite(monkeypatch):
+    monkeypatch.setattr(search_factory.config, "WEB_SEARCH_PROVIDERS", "bing, ddg, serpapi")
+    monkeypatch.setattr(search_factory.config, "BING_API_KEY", "k")
+    monkeypatch.setattr(search_factory.config, "SERPAPI_API_KEY", "")
+    monkeypatch.setattr(search_factory.config, "SEARCH_CACHE_ENABLED", True)
+
+    provider = search_factory.make_search_provider()
+
+    assert isinstance(provider, CachedSearchProvider)
+    assert isinstance(provider._provider, HedgedSearchProvider)
+    assert provider._provider.order() == ["bing", "ddg"]
+
+    monkeypatch.setattr(search_factory.config, "WEB_SEARCH_PROVIDERS", "ddg")
+    monkeypatch.setattr(search_factory.config, "SEARCH_CACHE_ENABLED", False)
+    assert isinstance(search_factory.make_search_provider(), DuckDuckGoProvider)
+
+
+@pytest.mark.asyncio
+async def test_ddg_keeps_abstract_and_results_but_not_related_topics(monkeypatch):
+    payload = {
+        "Heading": "Python (programming language)",
+        "AbstractURL": "https://en.wikipedia.org/wiki/Python_(programming_language)",
+        "AbstractSource": "Wikipedia",
+        "Results": [{"FirstURL": "https://www.python.org/", "Text": "Official site", "Result": "<a href=...>Official site</a>"}],
+        "RelatedTopics": [
+            {"FirstURL": "https://duckduckgo.com/Guido_van_Rossum", "Text": "Guido van Rossum - Dutch programmer."},
+            {
+                "Name": "See also",
+                "Topics": [{"FirstURL": "https://duckduckgo.com/c/Python_software", "Text": "Python software"}],
+            },
+        ],
+        "Type": "A",
+    }
+    real = httpx.AsyncClient
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=payload))
+    monkeypatch.setattr("app.services.duckduckgo.httpx.AsyncClient", lambda **kw: real(transport=transport, **kw))
+
+    hits = await DuckDuckGoProvider().search("python", limit=5)
+
+    assert [h["url"] for h in hits] == [
+        "https://en.wikipedia.org/wiki/Python_(programming_language)",
+        "https://www.python.org/",
+    ]
@@ -0,0 +1,31 @@
+import json
+from datetime import datetime, timezone
+
+from kombu.serialization import dumps, loads, prepare_accept_content
+
+from app.core.logging import default_logger
+from app.schemas.jobs import JobStatusEnum
+from app.workers.celery_config import celery_app
+
+
+def test_structured_log_serializes_datetimes_enums_and_unknown_types():
+    ts = datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+    line = default_logger._format_log("INFO", "job", status=JobStatusEnum.running, at=ts, obj=object, headers={"X-API-Key": "k"})
+
+    data = json.loads(line)
+    assert data["status"] == "running"
+    assert data["at"] == "2024-01-15T10:30:00+00:00"
+    assert data["obj"] == "<class 'object'>"
+    assert data["headers"]["X-API-Key"] == "********"
+
+
+def test_celery_orjson_task_payload_roundtrip():
+    # json on the wire until CELERY_TASK_SERIALIZER is switched; workers already decode both
+    assert celery_app.conf.task_serializer == "json"
+    assert {"json", "orjson"} <= set(celery_app.conf.accept_content)
+    body = [[], {"job_id": "j_1", "request_id": "req_ü"}, {"callbacks": None, "errbacks": None}]
+
+    content_type, encoding, payload = dumps(body, serializer="orjson")
+
+    assert content_type == "application/x-orjson"
+    assert loads(payload, content_type, encoding, accept=prepare_accept_content(celery_app.conf.accept_content)) == body
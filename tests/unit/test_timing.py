@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from app.core.timing import JobTimer, current_timer, record, timed
+
+
+def test_timed_is_noop_without_bound_timer():
+    assert current_timer() is None
+    with timed("llm"):
+        pass
+    record("queue_wait", 1.0)
+
+
+@pytest.mark.asyncio
+async def test_job_timer_aggregates_stages_and_spans():
+    timer = JobTimer()
+    with timer.bind():
+        with timed("db_write", op="set_decision"):
+            await asyncio.sleep(0)
+        with timed("db_write", op="progress"):
+            pass
+        record("queue_wait", 0.25)
+    assert current_timer() is None
+
+    metrics = timer.as_dict()
+    assert metrics["stages"]["db_write"]["count"] == 2
+    assert metrics["stages"]["queue_wait"]["total_ms"] == 250.0
+    assert [s["stage"] for s in metrics["spans"]] == ["db_write", "db_write", "queue_wait"]
+    assert metrics["spans"][0]["op"] == "set_decision"
+    assert "start_ms" not in metrics["spans"][2]
+
+
+def test_job_timer_caps_spans():
+    timer = JobTimer()
+    for _ in range(JobTimer.MAX_SPANS + 10):
+        timer.record("fetch", 0.001)
+    metrics = timer.as_dict()
+    assert len(metrics["spans"]) == JobTimer.MAX_SPANS
+    assert metrics["stages"]["fetch"]["count"] == JobTimer.MAX_SPANS + 10
@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+from app.core.config import config  # noqa: E402
+from app.core.timing import timed  # noqa: E402
+from app.core.tracing import inject_headers, span, span_from_headers  # noqa: E402
+from app.services.queue import Producer  # noqa: E402
+
+_EXPORTER = InMemorySpanExporter()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _provider():
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(_EXPORTER))
+    trace.set_tracer_provider(provider)
+    yield
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    monkeypatch.setattr(config, "OTEL_ENABLED", True)
+    _EXPORTER.clear()
+    return _EXPORTER
+
+
+def test_enqueue_carries_trace_context_to_worker_span(exporter):
+    with patch("app.services.queue.run_agent_task.apply_async") as apply_async:
+        with span("POST /api/v1/agent/execute", kind="server"):
+            Producer(queue_name="q").enqueue_execute(job_id="j1", request_id="r1")
+
+    headers = apply_async.call_args.kwargs["headers"]
+    assert headers["job_id"] == "j1" and headers["traceparent"].startswith("00-")
+
+    # worker side: a new process only has the message headers
+    with span_from_headers("run_agent_task", headers, **{"job.id": "j1"}):
+        with timed("routing"):
+            pass
+
+    spans = {s.name: s for s in exporter.get_finished_spans()}
+    server, publish, worker, routing = (spans[n] for n in ("POST /api/v1/agent/execute", "queue.publish", "run_agent_task", "routing"))
+    assert len({s.context.trace_id for s in (server, publish, worker, routing)}) == 1
+    assert publish.parent.span_id == server.context.span_id
+    assert worker.parent.span_id == publish.context.span_id
+    assert routing.parent.span_id == worker.context.span_id
+    assert worker.kind == trace.SpanKind.CONSUMER and worker.attributes["job.id"] == "j1"
+
+
+def test_span_records_errors(exporter):
+    with pytest.raises(ValueError):
+        with span("llm", model="m"):
+            raise ValueError("boom")
+
+    (s,) = exporter.get_finished_spans()
+    assert s.status.status_code == trace.StatusCode.ERROR
+    assert s.events[0].name == "exception"
+
+
+def test_disabled_tracing_is_a_noop(monkeypatch):
+    monkeypatch.setattr(config, "OTEL_ENABLED", False)
+    _EXPORTER.clear()
+
+    with span("anything"):
+        pass
+    assert inject_headers({"request_id": "r1"}) == {"request_id": "r1"}
+    assert _EXPORTER.get_finished_spans() == ()
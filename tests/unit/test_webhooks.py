@@ -0,0 +1,124 @@
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from app.schemas.webhooks import WebhookDeliveryStatus, WebhookEventType
+from app.services.webhooks import (
+    SIGNATURE_HEADER,
+    TIMESTAMP_HEADER,
+    WebhookDispatcher,
+    sign_payload,
+    verify_signature,
+)
+
+SECRET = "test-secret"
+
+
+class _StubReceiver:
+    """Local webhook receiver: verifies signatures and answers with the scripted status codes."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.received = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = request.content
+        assert verify_signature(SECRET, request.headers[TIMESTAMP_HEADER], body, request.headers[SIGNATURE_HEADER])
+        self.received.append(json.loads(body))
+        return httpx.Response(self.statuses.pop(0) if self.statuses else 200)
+
+
+class _StubDeliveries:
+    """In-memory stand-in for WebhookDeliveriesRepository (get/record by delivery_id)."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def get(self, delivery_id):
+        doc = self.docs.get(delivery_id)
+        return doc.model_copy(deep=True) if doc else None
+
+    async def record(self, delivery):
+        self.docs[delivery.delivery_id] = delivery.model_copy(deep=True)
+        return delivery.delivery_id
+
+
+def _dispatcher(receiver, repo, secret=SECRET, **kw):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(receiver))
+    return WebhookDispatcher(secret=secret, deliveries_repo=repo, client=client, **kw)
+
+
+async def _deliver(d, **kw):
+    return await d.deliver("https://hooks.example.com/cb", {"job_id": "j1"}, job_id="j1", request_id="r1", **kw)
+
+
+@pytest.mark.asyncio
+async def test_webhook_retries_until_delivered():
+    receiver = _StubReceiver([500, 503, 200])
+    repo = _StubDeliveries()
+    d = _dispatcher(receiver, repo, max_attempts=5)
+
+    # what deliver_webhook does: one attempt per task run, the next one scheduled with the returned countdown
+    outcome, attempt, delays = await _deliver(d, event=WebhookEventType.job_succeeded), 1, []
+    while outcome.retry_in_s is not None:
+        delays.append(outcome.retry_in_s)
+        attempt += 1
+        outcome = await _deliver(d, event=WebhookEventType.job_succeeded, delivery_id=outcome.delivery.delivery_id, attempt=attempt)
+
+    assert len(receiver.received) == 3
+    assert len(delays) == 2 and all(delay >= 0 for delay in delays)
+    delivery = repo.docs[outcome.delivery.delivery_id]
+    assert len(repo.docs) == 1
+    assert delivery.status == WebhookDeliveryStatus.delivered
+    assert [a.status_code for a in delivery.attempts] == [500, 503, 200]
+    assert delivery.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_webhook_gives_up_after_max_attempts():
+    repo = _StubDeliveries()
+    d = _dispatcher(_StubReceiver([500, 500]), repo, max_attempts=2)
+
+    first = await _deliver(d, event=WebhookEventType.job_failed)
+    assert first.retry_in_s is not None and first.delivery.status == WebhookDeliveryStatus.pending
+
+    last = await _deliver(d, event=WebhookEventType.job_failed, delivery_id=first.delivery.delivery_id, attempt=2)
+    assert last.retry_in_s is None
+    assert repo.docs[first.delivery.delivery_id].status == WebhookDeliveryStatus.failed
+
+
+@pytest.mark.asyncio
+async def test_webhook_client_error_is_final():
+    receiver = _StubReceiver([404])
+    repo = MagicMock()
+    repo.record = AsyncMock()
+    d = _dispatcher(receiver, repo, max_attempts=5)
+
+    outcome = await _deliver(d, event=WebhookEventType.job_failed)
+
+    assert outcome.retry_in_s is None
+    assert len(receiver.received) == 1
+    assert repo.record.await_args.args[0].status == WebhookDeliveryStatus.failed
+
+
+@pytest.mark.asyncio
+async def test_webhook_is_not_sent_without_a_secret(monkeypatch):
+    monkeypatch.setattr("app.services.webhooks.config.WEBHOOK_SECRET", None)
+    receiver = _StubReceiver([])
+    repo = MagicMock()
+    repo.record = AsyncMock()
+    d = _dispatcher(receiver, repo, secret=None)
+
+    assert await _deliver(d, event=WebhookEventType.job_succeeded) is None
+    assert receiver.received == []
+    repo.record.assert_not_awaited()
+
+
+def test_verify_signature_rejects_tampered_body():
+    ts = str(int(time.time()))
+    sig = sign_payload(SECRET, ts, b'{"a":1}')
+    assert verify_signature(SECRET, ts, b'{"a":1}', sig)
+    assert not verify_signature(SECRET, ts, b'{"a":2}', sig)
@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import BaseModel
+
+from app.schemas.jobs import JobDoc, JobStatusEnum
+from app.workers import tasks
+
+
+class _Output(BaseModel):
+    code: str
+
+
+class _FakeAgent:
+    async def run(self, task, **_):
+        return _Output(code="print(1)")
+
+
+async def _never_canceled(job_id):
+    await asyncio.Event().wait()
+
+
+def _claimed_job():
+    now = datetime.now(timezone.utc)
+    return JobDoc(
+        job_id="j1",
+        request_id="r1",
+        owner_user_id="7",
+        task="Write a Python function to reverse a list",
+        task_hash="h",
+        status=JobStatusEnum.running,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.mark.asyncio
+async def test_execute_job_claims_and_finishes_in_few_round_trips(monkeypatch):
+    monkeypatch.setattr(tasks.AgentRegistry, "get", lambda name: _FakeAgent())
+    jobs = AsyncMock()
+    jobs.claim.return_value = _claimed_job()
+    jobs.succeed.return_value = True
+    logs = AsyncMock()
+    results = AsyncMock()
+    results.offload.side_effect = lambda job_id, result: (result, None)
+    cancel_bus = AsyncMock()
+    cancel_bus.wait.side_effect = _never_canceled
+
+    await tasks.execute_job("j1", "r1", jobs=jobs, logs=logs, cancel_bus=cancel_bus, result_store=results, owner="w1")
+
+    jobs.claim.assert_awaited_once()
+    assert not jobs.get.called and not jobs.progress.called
+    jobs.set_decision.assert_awaited_once()
+    logs.push_many.assert_awaited_once()
+    jobs.succeed.assert_awaited_once()
+    assert jobs.succeed.await_args.kwargs["lease_owner"] == "w1"
+
+
+@pytest.mark.asyncio
+async def test_execute_job_stops_when_claim_is_refused():
+    jobs = AsyncMock()
+    jobs.claim.return_value = None
+    logs = AsyncMock()
+
+    await tasks.execute_job("j1", "r1", jobs=jobs, logs=logs, cancel_bus=MagicMock(), result_store=MagicMock(), owner="w1")
+
+    assert not jobs.set_decision.called and not jobs.succeed.called
+    assert logs.push.await_args.args[0].payload["msg"] == "state_not_queued_or_already_taken"
+
+
+@pytest.mark.asyncio
+async def test_execute_job_uses_the_submit_time_decision(monkeypatch):
+    monkeypatch.setattr(tasks.AgentRegistry, "get", lambda name: _FakeAgent())
+    monkeypatch.setattr(tasks.PeerAgent, "decide", MagicMock(side_effect=AssertionError("routed again")))
+    job = _claimed_job()
+    job.decided_agent, job.reason = "code", "rules"
+    jobs = AsyncMock()
+    jobs.claim.return_value = job
+    results = AsyncMock()
+    results.offload.side_effect = lambda job_id, result: (result, None)
+    cancel_bus = AsyncMock()
+    cancel_bus.wait.side_effect = _never_canceled
+
+    await tasks.execute_job("j1", "r1", jobs=jobs, logs=AsyncMock(), cancel_bus=cancel_bus, result_store=results, owner="w1")
+
+    assert not jobs.set_decision.called
+    assert jobs.succeed.await_args.args[1].agent == "code"
+
+
+@pytest.mark.asyncio
+async def test_reaper_fails_jobs_it_cannot_republish_and_sends_their_webhooks(monkeypatch):
+    stuck = _claimed_job().model_copy(update={"job_id": "j_requeued", "webhook_url": "https://hooks.example.com/cb"})
+    exhausted = _claimed_job().model_copy(update={"job_id": "j_failed", "webhook_url": "https://hooks.example.com/cb"})
+    jobs = MagicMock()
+    jobs.reap_expired = AsyncMock(return_value=([stuck], [exhausted]))
+    jobs.fail = AsyncMock(return_value=True)
+    producer = MagicMock()
+    producer.enqueue_execute.side_effect = ConnectionError("broker down")
+    notified = []
+    monkeypatch.setattr(tasks, "_notify_webhook", lambda job, event: notified.append((job.job_id, event.value)))
+
+    await tasks.reap_jobs(jobs=jobs, logs=AsyncMock(), producer=producer)
+
+    assert jobs.fail.await_args.args[0] == "j_requeued"
+    err = jobs.fail.await_args.args[1]
+    assert err.code == "queue_unavailable" and err.retryable is True
+    assert notified == [("j_failed", "job.failed"), ("j_requeued", "job.failed")]
+
+
+@pytest.mark.asyncio
+async def test_reaper_republishes_requeued_jobs(monkeypatch):
+    jobs = MagicMock()
+    jobs.reap_expired = AsyncMock(return_value=([_claimed_job()], []))
+    jobs.fail = AsyncMock()
+    producer = MagicMock()
+    monkeypatch.setattr(tasks, "_notify_webhook", MagicMock())
+
+    await tasks.reap_jobs(jobs=jobs, logs=AsyncMock(), producer=producer)
+
+    producer.enqueue_execute.assert_called_once_with(job_id="j1", request_id="r1", owner_user_id="7", agent=None)
+    jobs.fail.assert_not_awaited()
+    tasks._notify_webhook.assert_not_called()